@@ -0,0 +1 @@
+""" Benchmark suite of the conversion pipeline of mplppt (see suite and corpus) """
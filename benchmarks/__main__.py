@@ -0,0 +1,52 @@
+""" Command line interface of the benchmark suite
+
+usage:
+    python -m benchmarks run [-k PATTERN] [-r REPEAT] [-o RESULTS]
+    python -m benchmarks baseline [-k PATTERN] [-r REPEAT]
+    python -m benchmarks compare [RESULTS] [-b BASELINE] [-k PATTERN] [-r REPEAT]
+
+`compare` runs the benchmarks (unless stored results are given) and compares them
+with the stored baseline. It exits with status 1 if any measurement regressed.
+"""
+
+import sys
+import argparse
+
+from . import suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("command", choices=("run", "baseline", "compare"))
+    parser.add_argument("results", nargs="?", help="stored results to compare")
+    parser.add_argument(
+        "-k", "--pattern", default="", help="only run matching benchmarks"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="number of repeats")
+    parser.add_argument("-o", "--output", help="file to store the results in")
+    parser.add_argument(
+        "-b", "--baseline", default=suite.BASELINE, help="baseline file"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "compare" and args.results is not None:
+        results = suite.load(args.results)
+    else:
+        results = suite.run(pattern=args.pattern, repeat=args.repeat)
+
+    if args.command == "baseline":
+        suite.save(results, args.baseline)
+    elif args.output is not None:
+        suite.save(results, args.output)
+
+    if args.command == "compare":
+        print()
+        regressions = suite.compare(suite.load(args.baseline), results)
+        if regressions:
+            print("\n%i regression(s)" % len(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
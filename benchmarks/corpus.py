@@ -0,0 +1,151 @@
+""" Generated corpus of matplotlib figures for the benchmarks
+
+All figures are generated deterministically (with a fixed seed) and without pyplot,
+such that every run of the benchmarks converts exactly the same figures.
+"""
+
+
+#############
+## Imports ##
+#############
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+###############
+## Constants ##
+###############
+
+SEED = 0
+FIGSIZE = (6, 4)
+
+
+###############
+## Functions ##
+###############
+
+
+def figure():
+    """ Create an empty figure with a single axes (attached to an Agg canvas)
+
+    Returns:
+        fig: the matplotlib figure
+        ax: the matplotlib axes of the figure
+    """
+    fig = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    return fig, ax
+
+
+def lines(num_lines=1, num_points=1000):
+    """ A figure with random walks as lines
+
+    Args:
+        num_lines=1: the number of lines in the figure
+        num_points=1000: the number of points of each line
+
+    Returns:
+        fig: the matplotlib figure
+    """
+    rng = np.random.RandomState(SEED)
+    fig, ax = figure()
+    x = np.arange(num_points)
+    for _ in range(num_lines):
+        ax.plot(x, np.cumsum(rng.randn(num_points)))
+    return fig
+
+
+def bars(num_bars=100):
+    """ A figure with a bar chart
+
+    Args:
+        num_bars=100: the number of bars in the figure
+
+    Returns:
+        fig: the matplotlib figure
+    """
+    rng = np.random.RandomState(SEED)
+    fig, ax = figure()
+    ax.bar(np.arange(num_bars), rng.rand(num_bars), edgecolor="black")
+    return fig
+
+
+def texts(num_texts=100):
+    """ A figure with text annotations in the plotting area
+
+    Args:
+        num_texts=100: the number of texts in the figure
+
+    Returns:
+        fig: the matplotlib figure
+    """
+    rng = np.random.RandomState(SEED)
+    fig, ax = figure()
+    for i, (x, y) in enumerate(rng.rand(num_texts, 2)):
+        ax.text(x, y, "label %i" % i, fontsize=8)
+    return fig
+
+
+def mesh(size=100):
+    """ A figure with a (uniform) pcolormesh
+
+    Args:
+        size=100: the number of cells of the mesh in both directions
+
+    Returns:
+        fig: the matplotlib figure
+    """
+    rng = np.random.RandomState(SEED)
+    fig, ax = figure()
+    ax.pcolormesh(rng.rand(size, size))
+    return fig
+
+
+def markers(num_markers=1000):
+    """ A figure with a scatter plot
+
+    Args:
+        num_markers=1000: the number of markers in the figure
+
+    Returns:
+        fig: the matplotlib figure
+    """
+    rng = np.random.RandomState(SEED)
+    fig, ax = figure()
+    ax.scatter(rng.rand(num_markers), rng.rand(num_markers), c=rng.rand(num_markers))
+    return fig
+
+
+def mixed():
+    """ A figure with a bit of everything (lines, bars, markers, text and a mesh)
+
+    Returns:
+        fig: the matplotlib figure
+    """
+    rng = np.random.RandomState(SEED)
+    fig, ax = figure()
+    ax.pcolormesh(np.linspace(0, 10, 21), np.linspace(-2, 2, 11), rng.rand(10, 20))
+    ax.bar(np.arange(10) + 0.5, rng.rand(10))
+    x = np.linspace(0, 10, 2000)
+    ax.plot(x, np.sin(x), label="sin")
+    ax.plot(x, np.cos(x), label="cos")
+    ax.scatter(rng.rand(200) * 10, rng.randn(200), s=5)
+    ax.set_title("mixed")
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    return fig
+
+
+def slides(num_slides=10):
+    """ A list of (mixed) figures to put in a presentation
+
+    Args:
+        num_slides=10: the number of figures
+
+    Returns:
+        figs: list: the matplotlib figures
+    """
+    return [mixed() for _ in range(num_slides)]
@@ -0,0 +1,301 @@
+""" Benchmarks of the conversion pipeline
+
+Each benchmark converts figures of the generated corpus (see corpus) and measures:
+
+    time: the wall time of the conversion (median and minimum over the repeats)
+    memory: the peak memory allocated during the conversion (measured with tracemalloc
+        in a separate run, as tracing slows down the conversion)
+    size: the size of the output (in bytes)
+
+The figures are created before each repeat, such that their creation is not measured.
+"""
+
+
+#############
+## Imports ##
+#############
+
+import io
+import os
+import re
+import sys
+import json
+import shutil
+import time
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+import numpy as np
+import matplotlib
+
+import mplppt
+from mplppt.convert import dir2pptx
+from mplppt.convert import pptx2dir
+from mplppt.utils.mpl import get_plotting_area
+
+from . import corpus
+
+
+###############
+## Constants ##
+###############
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# relative increase above which a measurement counts as a regression (see compare)
+THRESHOLDS = {"time": 0.2, "memory": 0.1, "size": 0.01}
+
+# the temporary folders created by the benchmarks, removed after running them
+_tempdirs = []
+
+
+################
+## Benchmarks ##
+################
+
+
+def _savefig(fig, **kwargs):
+    """ export a figure into memory and return the size of the pptx file """
+    buffer = io.BytesIO()
+    mplppt.savefig(buffer, fig=fig, **kwargs)
+    return buffer.tell()
+
+
+def _exported(fig):
+    """ export a figure once with a fresh shape cache (for a cached re-export) """
+    cache = mplppt.ShapeCache()
+    _savefig(fig, cache=cache)
+    return fig, cache
+
+
+def _reexport(args):
+    """ re-export an unchanged figure with the shapes cached in an earlier export """
+    fig, cache = args
+    return _savefig(fig, cache=cache)
+
+
+def _presentation(figs):
+    """ export figures as slides of a presentation into memory and return its size """
+    buffer = io.BytesIO()
+    presentation = mplppt.Presentation()
+    for fig in figs:
+        presentation.add_slide(fig)
+    presentation.save(buffer)
+    return buffer.tell()
+
+
+def _dir2pptx(dirname):
+    """ zip an unpacked pptx file and return the size of the pptx file """
+    target = dirname + ".pptx"
+    dir2pptx(dirname, target)
+    return os.path.getsize(target)
+
+
+def _unpacked(fig):
+    """ export a figure and unpack it into a temporary folder (for _dir2pptx) """
+    tempdir = tempfile.mkdtemp(prefix="mplppt_bench_")
+    _tempdirs.append(tempdir)
+    dirname = os.path.join(tempdir, "slide")
+    mplppt.savefig(dirname + ".pptx", fig=fig)
+    pptx2dir(dirname + ".pptx")
+    return dirname
+
+
+def _area(fig):
+    """ lay out a figure to find its plotting area """
+    get_plotting_area(fig)
+    return 0
+
+
+class Benchmark(object):
+    """ A benchmark: a setup creating the input and the conversion to measure """
+
+    def __init__(self, name, setup, run):
+        """ Create a benchmark
+
+        Args:
+            name: str: the name of the benchmark
+            setup: function without arguments creating the input of the benchmark
+            run: function converting the input and returning the size of the output
+        """
+        self.name = name
+        self.setup = setup
+        self.run = run
+
+    def measure(self, repeat=5):
+        """ Measure the benchmark
+
+        Args:
+            repeat=5: the number of times to time the conversion
+
+        Returns:
+            result: dict: the median and minimum time (in seconds), the peak memory
+                (in bytes) and the size of the output (in bytes)
+        """
+        times = []
+        for _ in range(repeat):
+            args = self.setup()
+            start = time.perf_counter()
+            size = self.run(args)
+            times.append(time.perf_counter() - start)
+
+        args = self.setup()
+        tracemalloc.start()
+        try:
+            self.run(args)
+            _, memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "time": statistics.median(times),
+            "time_min": min(times),
+            "memory": memory,
+            "size": size,
+        }
+
+
+BENCHMARKS = [
+    Benchmark("savefig.line_length[1000]", lambda: corpus.lines(1, 1000), _savefig),
+    Benchmark("savefig.line_length[100000]", lambda: corpus.lines(1, 100000), _savefig),
+    Benchmark("savefig.lines[10]", lambda: corpus.lines(10, 1000), _savefig),
+    Benchmark("savefig.lines[100]", lambda: corpus.lines(100, 1000), _savefig),
+    Benchmark("savefig.bars[100]", lambda: corpus.bars(100), _savefig),
+    Benchmark("savefig.bars[2000]", lambda: corpus.bars(2000), _savefig),
+    Benchmark("savefig.texts[50]", lambda: corpus.texts(50), _savefig),
+    Benchmark("savefig.texts[500]", lambda: corpus.texts(500), _savefig),
+    Benchmark("savefig.mesh[100]", lambda: corpus.mesh(100), _savefig),
+    Benchmark("savefig.mesh[1000]", lambda: corpus.mesh(1000), _savefig),
+    Benchmark("savefig.markers[1000]", lambda: corpus.markers(1000), _savefig),
+    Benchmark("savefig.markers[20000]", lambda: corpus.markers(20000), _savefig),
+    Benchmark("savefig.mixed", corpus.mixed, _savefig),
+    Benchmark("savefig.mixed[cached]", lambda: _exported(corpus.mixed()), _reexport),
+    Benchmark("presentation.slides[1]", lambda: corpus.slides(1), _presentation),
+    Benchmark("presentation.slides[10]", lambda: corpus.slides(10), _presentation),
+    Benchmark("layout.get_plotting_area", corpus.mixed, _area),
+    Benchmark("convert.dir2pptx", lambda: _unpacked(corpus.mixed()), _dir2pptx),
+]
+
+
+#############
+## Running ##
+#############
+
+
+def machine():
+    """ Describe the machine and the versions the benchmarks run with
+
+    Returns:
+        machine: dict: the description of the machine
+    """
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "mplppt": mplppt.__version__,
+    }
+
+
+def run(pattern="", repeat=5, file=sys.stdout):
+    """ Run the benchmarks
+
+    Args:
+        pattern="": only run the benchmarks with a name matching this regular expression
+        repeat=5: the number of times to time each benchmark
+        file=sys.stdout: the file to report the progress to
+
+    Returns:
+        results: dict: the description of the machine and the results per benchmark
+    """
+    results = {}
+    try:
+        for benchmark in BENCHMARKS:
+            if not re.search(pattern, benchmark.name):
+                continue
+            result = results[benchmark.name] = benchmark.measure(repeat=repeat)
+            print(
+                "%-30s %10.4fs %10.1fMB %12i B"
+                % (
+                    benchmark.name,
+                    result["time"],
+                    result["memory"] / 1e6,
+                    result["size"],
+                ),
+                file=file,
+            )
+    finally:
+        while _tempdirs:
+            shutil.rmtree(_tempdirs.pop(), ignore_errors=True)
+    return {"machine": machine(), "results": results}
+
+
+def save(results, filename=BASELINE):
+    """ Store benchmark results (as a baseline)
+
+    Args:
+        results: dict: the results of the benchmarks (see run)
+        filename=BASELINE: the json file to store the results in
+    """
+    with open(filename, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load(filename=BASELINE):
+    """ Load stored benchmark results
+
+    Args:
+        filename=BASELINE: the json file with the results
+
+    Returns:
+        results: dict: the results of the benchmarks (see run)
+    """
+    with open(filename, "r") as file:
+        return json.load(file)
+
+
+def compare(baseline, current, thresholds=None, file=sys.stdout):
+    """ Compare benchmark results with a baseline
+
+    Args:
+        baseline: dict: the baseline results (see run)
+        current: dict: the current results (see run)
+        thresholds=None: the relative increase above which a measurement counts as a
+            regression, per measurement. If None, THRESHOLDS is used.
+        file=sys.stdout: the file to report the comparison to
+
+    Returns:
+        regressions: list: the (benchmark, measurement, ratio) of the regressions
+    """
+    thresholds = dict(THRESHOLDS, **(thresholds or {}))
+    if baseline["machine"] != current["machine"]:
+        print(
+            "NOTE: the baseline was measured on another machine or with other versions",
+            file=file,
+        )
+    regressions = []
+    print("%-30s %16s %16s %16s" % ("benchmark", "time", "memory", "size"), file=file)
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print("%-30s %16s" % (name, "(new)"), file=file)
+            continue
+        columns = []
+        for measurement in ("time", "memory", "size"):
+            ratio = (
+                result[measurement] / base[measurement] if base[measurement] else 1.0
+            )
+            flag = " "
+            if ratio > 1 + thresholds[measurement]:
+                flag = "!"
+                regressions.append((name, measurement, ratio))
+            elif ratio < 1 - thresholds[measurement]:
+                flag = "+"
+            columns.append("%14.2fx%s" % (ratio, flag))
+        print("%-30s %s" % (name, " ".join(columns)), file=file)
+    return regressions
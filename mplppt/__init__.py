@@ -5,50 +5,75 @@ presentation with a single slide containing the figure. """
 __author__ = "Floris Laporte"
 __version__ = "0.0.5"
 
-##################
-## Unicode Hack ##
-## For Python 2 ##
-##################
+from importlib import import_module
 
-try:  # Python 2
-    import sys
 
-    reload(sys)
-    sys.setdefaultencoding("utf8")
-except NameError:  # Python 3
-    pass
+####################
+## New powerpoint ##
+####################
 
-################
-## Submodules ##
-################
+# imported eagerly, as the function would otherwise be shadowed by the submodule with
+# the same name as soon as the submodule is imported (the package is lightweight).
+from .new import new
 
-from . import shapes
-from . import convert
-from . import templates
-from . import utils
 
+##################################
+## Lazily Imported Public Names ##
+##################################
 
-############
-## Shapes ##
-############
+# mapping of the public names of mplppt to the submodule they live in. The
+# submodules (and hence matplotlib) are only imported when one of their names is
+# accessed (PEP 562), such that the command line file conversions stay cheap.
+_LAZY = {
+    ## Submodules ##
+    "shapes": None,
+    "convert": None,
+    "templates": None,
+    "utils": None,
+    ## Shapes ##
+    "Group": "shapes",
+    "Line": "shapes",
+    "Text": "shapes",
+    "Canvas": "shapes",
+    "Polygon": "shapes",
+    "Rectangle": "shapes",
+    "Raw": "shapes",
+    ## The Magic Function ##
+    "savefig": "save",
+    "fig2group": "save",
+    "savefigs": "parallel",
+    "savefig_async": "aio",
+    ## New powerpoint ##
+    "Package": "package",
+    "Presentation": "presentation",
+    ## Instrumentation ##
+    "Stats": "stats",
+    ## Incremental re-exports ##
+    "ShapeCache": "cache",
+}
 
-from .shapes import Group
-from .shapes import Line
-from .shapes import Text
-from .shapes import Canvas
-from .shapes import Polygon
-from .shapes import Rectangle
+__all__ = ["new"] + list(_LAZY)
 
 
-########################
-## The Magic Function ##
-########################
+def __getattr__(name):
+    """ Import the submodule containing a public name of mplppt on first access
 
-from .save import savefig
+    Args:
+        name: str: the public name to get
 
+    Returns:
+        value: the submodule or the object with that name
+    """
+    if name not in _LAZY:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    submodule = _LAZY[name]
+    if submodule is None:
+        value = import_module("." + name, __name__)
+    else:
+        value = getattr(import_module("." + submodule, __name__), name)
+    globals()[name] = value
+    return value
 
-####################
-## New powerpoint ##
-####################
 
-from .new import new
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
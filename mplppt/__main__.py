@@ -4,13 +4,17 @@ if __name__ == "__main__":
     import os
     import sys
 
+    # compression preset ("stored", "fast" or "small") or deflate level (0-9)
+    c = "fast" if "-c" not in sys.argv else sys.argv[sys.argv.index("-c") + 1]
+    c = int(c) if c.isdigit() else c
+
     if sys.argv[1] == "new":
         from .new import new
 
         fn = "new.pptx" if len(sys.argv) < 3 else sys.argv[2]
         w = 13.333 if "-w" not in sys.argv else sys.argv[sys.argv.index("-w") + 1]
         h = 7.5 if "-h" not in sys.argv else sys.argv[sys.argv.index("-h") + 1]
-        new(fn, slidesize=(w, h))
+        new(fn, slidesize=(w, h), compression=c)
 
     if sys.argv[1] == "convert" or sys.argv[1] == "c":
         from .convert import dir2pptx, dir2zip, pptx2dir, zip2dir, zip2pptx, pptx2zip
@@ -47,6 +51,6 @@ if __name__ == "__main__":
         }[frm + to]
 
         if frm == "dir":
-            func(fn)
+            func(fn, compression=c)
         else:
             func(fn + "." + frm)
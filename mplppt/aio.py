@@ -0,0 +1,257 @@
+""" Asyncio-friendly export of matplotlib figures """
+
+
+#############
+## Imports ##
+#############
+
+import os
+import asyncio
+import inspect
+import weakref
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .save import savefig
+from .utils.compression import BUFFERSIZE
+
+
+###############
+## Constants ##
+###############
+
+# number of threads of the default executor, which is also the maximum number of
+# exports running at once per event loop (the other exports wait for a free slot).
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# maximum number of buffered chunks (of BUFFERSIZE bytes) when streaming a pptx file
+# to an async writer. A slow writer pauses the export until the queue has room.
+QUEUESIZE = 16
+
+# the default executor, created on first use
+_executor = None
+_executor_lock = threading.Lock()
+
+# the semaphores bounding the number of running exports, per event loop
+_limits = weakref.WeakKeyDictionary()
+
+
+###############
+## Executors ##
+###############
+
+
+def get_executor():
+    """ Get the default (bounded) executor the exports run on
+
+    Returns:
+        executor: ThreadPoolExecutor: the executor with MAX_WORKERS threads
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="mplppt"
+            )
+        return _executor
+
+
+def _limit(loop):
+    """ the semaphore bounding the number of running exports on an event loop """
+    semaphore = _limits.get(loop)
+    if semaphore is None:
+        semaphore = _limits[loop] = asyncio.Semaphore(MAX_WORKERS)
+    return semaphore
+
+
+async def run_in_executor(func, *args, executor=None, **kwargs):
+    """ Run a blocking function on the executor without blocking the event loop
+
+    At most MAX_WORKERS functions are submitted to the executor at once. The other
+    calls wait (asynchronously) for a free slot, which gives backpressure when many
+    figures are queued, instead of piling them up in the queue of the executor.
+
+    Args:
+        func: the function to run
+        *args: the positional arguments of the function
+        executor=None: the executor to run the function on. If None, the default
+            executor is used (see get_executor).
+        **kwargs: the keyword arguments of the function
+
+    Returns:
+        result: the result of the function
+    """
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        executor = get_executor()
+    async with _limit(loop):
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+
+
+###############
+## Streaming ##
+###############
+
+
+class _QueueFile(object):
+    """ A write-only file that hands its content over to an event loop in chunks
+
+    The file is written by a worker thread. Full chunks of BUFFERSIZE bytes are put in
+    a bounded asyncio queue, which blocks the worker thread while the queue is full.
+    """
+
+    def __init__(self, loop, queue):
+        self.loop = loop
+        self.queue = queue
+        self.buffer = bytearray()
+        self.cancelled = False
+
+    def _put(self, chunk):
+        """ put a chunk in the queue, waiting while the queue is full """
+        if self.cancelled:
+            raise BrokenPipeError("the async writer stopped consuming the pptx file")
+        asyncio.run_coroutine_threadsafe(self.queue.put(chunk), self.loop).result()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= BUFFERSIZE:
+            self._put(bytes(self.buffer))
+            self.buffer.clear()
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """ put the remaining content in the queue """
+        if self.buffer:
+            self._put(bytes(self.buffer))
+            self.buffer.clear()
+
+
+async def _write(writer, chunk):
+    """ write a chunk to an async writer and wait until it's ready for more """
+    result = writer.write(chunk)
+    if inspect.isawaitable(result):
+        await result
+    drain = getattr(writer, "drain", None)
+    if drain is not None:
+        await drain()
+
+
+def is_async_writer(target):
+    """ Check if an export target is an async writer
+
+    Args:
+        target: the export target
+
+    Returns:
+        is_async: bool: True if the target has a coroutine write method (like an
+            aiofiles file) or a drain method (like an asyncio.StreamWriter)
+    """
+    write = getattr(target, "write", None)
+    return write is not None and (
+        hasattr(target, "drain") or inspect.iscoroutinefunction(write)
+    )
+
+
+async def stream_async(save, writer, executor=None):
+    """ Stream a pptx file to an async writer while it's being written
+
+    Args:
+        save: the function writing the pptx file into the writable file-like object it
+            gets as argument (it's run on the executor).
+        writer: the async writer (see is_async_writer)
+        executor=None: the executor to write the pptx file on (see run_in_executor)
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=QUEUESIZE)
+    file = _QueueFile(loop, queue)
+
+    def produce():
+        save(file)
+        file.close()
+
+    # all chunks are in the queue once the export is done (the puts are blocking)
+    future = asyncio.ensure_future(run_in_executor(produce, executor=executor))
+    try:
+        while not future.done() or not queue.empty():
+            if queue.empty():
+                get = asyncio.ensure_future(queue.get())
+                await asyncio.wait((get, future), return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    get.cancel()  # the item (if any) stays in the queue
+                    continue
+                chunk = get.result()
+            else:
+                chunk = queue.get_nowait()
+            await _write(writer, chunk)
+    except BaseException:
+        # stop the export: its next write will fail, empty the queue until it does.
+        file.cancelled = True
+        while not future.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.sleep(0.01)
+        if not future.cancelled():
+            future.exception()  # the exception of the export is superseded
+        raise
+    await future
+
+
+async def write_async(save, target, executor=None):
+    """ Write a pptx file without blocking the event loop
+
+    Args:
+        save: the function writing the pptx file to the target it gets as argument
+        target: str|file|writer: the filename of the pptx file, a writable file-like
+            object or an async writer (like an asyncio.StreamWriter) to stream the
+            pptx file to.
+        executor=None: the executor to write the pptx file on (see run_in_executor)
+    """
+    if is_async_writer(target):
+        await stream_async(save, target, executor=executor)
+    else:
+        await run_in_executor(save, target, executor=executor)
+
+
+########################
+## The Magic Function ##
+########################
+
+
+async def savefig_async(filename, fig=None, executor=None, **kwargs):
+    """ Export a matplotlib figure to a pptx file without blocking the event loop
+
+    The conversion and the compression run on a bounded executor. When many figures
+    are exported at once, at most MAX_WORKERS of them are converted at the same time,
+    the others wait for a free slot.
+
+    Args:
+        filename: str|file|writer: the filename of the pptx file, a writable file-like
+            object or an async writer (like an asyncio.StreamWriter) to stream the pptx
+            file to while it's being written.
+        fig: the figure to convert to a pptx slide. The figure should not be changed
+            while it's being exported.
+        executor=None: the executor to export the figure on. If None, a default
+            thread pool with MAX_WORKERS threads is used.
+        **kwargs: the keyword arguments of the export (see savefig)
+
+    Returns:
+        group: the mplppt group containing all the objects that were converted from
+            the matplotlib figure.
+    """
+    if fig is None:
+        from matplotlib.pyplot import gcf
+
+        fig = gcf()  # get the figure now, the current figure might change while waiting
+    groups = []
+
+    def save(target):
+        groups.append(savefig(target, fig=fig, **kwargs))
+
+    await write_async(save, filename, executor=executor)
+    return groups[0]
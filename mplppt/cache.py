@@ -0,0 +1,362 @@
+""" Cache of the shapes converted from matplotlib artists, for incremental re-exports """
+
+
+#############
+## Imports ##
+#############
+
+import weakref
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import matplotlib as mpl
+
+from .shapes.base import Cached
+
+
+###############
+## Constants ##
+###############
+
+# default maximum number of cached shapes
+MAXSIZE = 1024
+
+# a few points in data coordinates to probe the (possibly non-affine) data transform with
+_PROBE = np.array([[0.0, 0.0], [1.0, 1.0], [2.0, 3.0]])
+
+# marker for a shape that is not in the cache (None is a valid conversion result)
+_MISSING = object()
+
+
+##################
+## Fingerprints ##
+##################
+
+
+def digest(*arrays):
+    """ Fingerprint of the content of arrays
+
+    Args:
+        *arrays: the arrays (or array-likes) to fingerprint. The mask of masked
+            arrays is part of the fingerprint.
+
+    Returns:
+        digest: bytes: a 16 byte digest of the shape, type and content of the arrays
+    """
+    hash = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        if np.ma.isMaskedArray(array):
+            hash.update(np.ma.getmaskarray(array).tobytes())
+            array = array.data
+        array = np.ascontiguousarray(array, dtype=float)
+        hash.update(str(array.shape).encode())
+        hash.update(array.tobytes())
+    return hash.digest()
+
+
+def _matrix(transform):
+    """ the affine part of a matplotlib transform as bytes """
+    return transform.get_affine().get_matrix().tobytes()
+
+
+def _rgba(color):
+    """ a matplotlib color as (hashable) rgba tuple """
+    return mpl.colors.to_rgba(color)
+
+
+def context_key(context):
+    """ The part of a conversion context the conversion of an artist depends on
+
+    Args:
+        context: the conversion context of the axes (see ConversionContext)
+
+    Returns:
+        key: tuple: the slide size, the plotting area, the axes limits and the data
+            transform of the context
+    """
+    slidesize, area, xlim, ylim, transdata = context
+    return (
+        tuple(slidesize),
+        tuple(float(a) for a in area),
+        tuple(float(a) for a in xlim),
+        tuple(float(a) for a in ylim),
+        digest(transdata.transform(_PROBE), transdata.get_affine().get_matrix()),
+    )
+
+
+def fingerprint(artist, context, vertices=None):
+    """ Fingerprint of the data and the style of a matplotlib artist in a conversion context
+
+    The fingerprint contains everything the conversion of the artist depends on: two
+    artists with the same fingerprint are converted into the same shape.
+
+    Args:
+        artist: the matplotlib artist (or the list of rectangles of a bar chart)
+        context: the conversion context of the axes of the artist (see ConversionContext)
+        vertices=None: the (x, y) slide coordinates of the artist, if they were already
+            transformed (see ConversionContext.transform_artists). They replace the data
+            and the transform of the artist in the fingerprint.
+
+    Returns:
+        fingerprint: tuple|None: the fingerprint, or None if the artist can not be cached.
+    """
+    if isinstance(artist, list):  # the rectangles of a bar chart
+        transdata = artist[0].axes.transData
+        if any(rect.get_data_transform() is not transdata for rect in artist):
+            return None
+        data = digest(
+            [
+                (rect.get_x(), rect.get_y(), rect.get_width(), rect.get_height())
+                for rect in artist
+            ],
+            [(rect._linewidth, rect.get_visible()) for rect in artist],
+            [rect._edgecolor for rect in artist],
+            [rect._facecolor for rect in artist],
+        )
+        style = ()
+    elif vertices is not None:
+        data = digest(*vertices)
+        if isinstance(artist, mpl.lines.Line2D):
+            style = (
+                artist._linewidth,
+                _rgba(artist.get_color()),
+                artist.get_path().should_simplify,
+            )
+        elif isinstance(artist, mpl.patches.Polygon):
+            style = (
+                artist._linewidth,
+                artist._edgecolor,
+                artist._facecolor,
+                artist.fill,
+            )
+        elif isinstance(artist, mpl.patches.Rectangle):
+            style = (artist._linewidth, artist._edgecolor, artist._facecolor)
+        else:
+            return None
+    elif isinstance(artist, mpl.text.Text):
+        data = (artist._text, artist._x, artist._y)
+        style = (
+            hash(artist.get_fontproperties()),
+            _rgba(artist.get_color()),
+            artist._horizontalalignment,
+            artist._verticalalignment,
+            artist.get_rotation(),
+            artist.figure.dpi,
+            _matrix(artist.get_transform()),
+        )
+    elif isinstance(artist, mpl.collections.PathCollection):
+        paths = artist.get_paths()
+        data = digest(
+            artist.get_offsets(),
+            artist.get_transforms(),
+            np.asarray(artist.get_linewidth(), dtype=float),
+            np.asarray(artist.get_edgecolor(), dtype=float),
+            np.asarray(artist.get_facecolor(), dtype=float),
+            *[path.vertices for path in paths],
+            *[[] if path.codes is None else path.codes for path in paths],
+        )
+        style = (
+            _matrix(artist.get_offset_transform()),
+            _matrix(artist.get_transform()),
+        )
+    elif isinstance(artist, mpl.collections.QuadMesh):
+        norm = artist.norm
+        data = digest(
+            artist.get_coordinates(),
+            np.ma.asarray(artist.get_array(), dtype=float),
+            np.asarray(artist.get_alpha(), dtype=float),
+        )
+        style = (
+            artist.get_cmap().name,
+            type(norm).__name__,
+            norm.vmin,
+            norm.vmax,
+            getattr(artist, "_shading", "flat"),
+            _matrix(artist.get_transform()),
+        )
+    else:
+        return None
+    return (data, style, context_key(context))
+
+
+#################
+## Shape Cache ##
+#################
+
+
+class ShapeCache(object):
+    """ Bounded LRU cache of the shapes converted from matplotlib artists
+
+    The shapes are cached per artist (by identity) together with the fingerprint of the
+    data, the style and the axes transform of the artist (see fingerprint). A cached
+    shape is only reused as long as the fingerprint of its artist did not change, such
+    that re-exporting a figure only converts the artists that changed. The cached
+    shapes memoize their xml, which is rendered only once per output mode (see Cached).
+
+    Besides the fingerprint check, a cached shape is dropped as soon as:
+        - a property of its artist is changed (see Artist.add_callback)
+        - its artist is stale when the figure is exported again (see invalidate_stale)
+        - its artist is garbage collected
+        - it's the least recently used shape in a full cache
+
+    NOTE: the cached shapes are shared between the exports (and the groups returned by
+    them) and should not be modified.
+    """
+
+    def __init__(self, maxsize=MAXSIZE):
+        """ Create a shape cache
+
+        Args:
+            maxsize=MAXSIZE: the maximum number of cached shapes
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # id(artist) -> (weak reference, callback id, fingerprint, shape)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, artist, fingerprint):
+        """ Get the cached shape of an artist
+
+        Args:
+            artist: the matplotlib artist
+            fingerprint: the current fingerprint of the artist
+
+        Returns:
+            shape: Cached|None: the cached shape (which is None if the artist was not
+                converted into a shape) or _MISSING if the artist is not in the cache
+                or the artist changed since its shape was cached.
+        """
+        with self._lock:
+            entry = self._entries.get(id(artist))
+            if entry is None or entry[0]() is not artist or entry[2] != fingerprint:
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(id(artist))
+            self.hits += 1
+            return entry[3]
+
+    def put(self, artist, fingerprint, shape):
+        """ Cache the shape of an artist
+
+        Args:
+            artist: the matplotlib artist
+            fingerprint: the fingerprint of the artist the shape was converted from
+            shape: Cached|None: the shape to cache
+        """
+        key = id(artist)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[0]() is artist:
+                ref, cid = entry[0], entry[1]
+            else:
+                ref = weakref.ref(artist, lambda ref: self._forget(key, ref))
+                cid = artist.add_callback(self.invalidate)
+            self._entries[key] = (ref, cid, fingerprint, shape)
+            while len(self._entries) > self.maxsize:
+                self._remove(self._entries.popitem(last=False)[1])
+
+    def _remove(self, entry):
+        """ disconnect an entry that is removed from the cache from its artist """
+        artist = entry[0]()
+        if artist is not None:
+            artist.remove_callback(entry[1])
+
+    def _forget(self, key, ref):
+        """ drop the entry of a garbage collected artist """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del self._entries[key]
+
+    def invalidate(self, artist):
+        """ Drop the cached shape of an artist
+
+        Args:
+            artist: the matplotlib artist
+        """
+        with self._lock:
+            entry = self._entries.get(id(artist))
+            if entry is not None and entry[0]() is artist:
+                del self._entries[id(artist)]
+                self._remove(entry)
+
+    def invalidate_stale(self, fig):
+        """ Drop the cached shapes of the data artists of a figure that are stale
+
+        Matplotlib marks an artist as stale when it's changed after it was drawn. This
+        should be called before the figure is laid out again, which clears the marks.
+        The tick labels are not checked: they are updated (and hence marked as stale)
+        by matplotlib at every draw. They are only checked by their fingerprint.
+
+        Args:
+            fig: the matplotlib figure
+        """
+        for ax in fig.axes:
+            for artists in (ax.lines, ax.patches, ax.collections, ax.texts):
+                for artist in artists:
+                    if artist.stale:
+                        self.invalidate(artist)
+
+    def clear(self):
+        """ Drop all cached shapes """
+        with self._lock:
+            while self._entries:
+                self._remove(self._entries.popitem()[1])
+
+    def convert(self, function, artist, key=(), **kwargs):
+        """ Convert a matplotlib artist, reusing its cached shape if it did not change
+
+        Args:
+            function: the function converting the artist (like Line.from_mpl)
+            artist: the matplotlib artist to convert (or the list of rectangles of a
+                bar chart, which are cached by their first rectangle)
+            key=(): the other arguments the conversion depends on (like the
+                decimation mode), which become part of the fingerprint
+            **kwargs: the keyword arguments of the conversion function, which should
+                contain the conversion context (and can contain the vertices) of the
+                artist (see fingerprint)
+
+        Returns:
+            shape: Cached|None: the converted shape or None if the artist was not
+                converted into a shape.
+        """
+        current = fingerprint(artist, kwargs["context"], kwargs.get("vertices"))
+        if current is None:
+            shape = function(artist, **kwargs)
+            return None if shape is None else Cached(shape)
+        current = (key, current)
+        owner = artist[0] if isinstance(artist, list) else artist
+        shape = self.get(owner, current)
+        if shape is _MISSING:
+            shape = function(artist, **kwargs)
+            shape = None if shape is None else Cached(shape)
+            self.put(owner, current, shape)
+        return shape
+
+
+# the cache used by the exports with `cache=True`
+CACHE = ShapeCache()
+
+
+def get_cache(cache):
+    """ Get the shape cache to use for an export
+
+    Args:
+        cache: None|bool|ShapeCache: no cache (None or False), the default cache (True)
+            or the cache to use.
+
+    Returns:
+        cache: ShapeCache|None: the shape cache to use
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return CACHE
+    return cache
@@ -11,7 +11,8 @@ import shutil
 import zipfile
 
 from .utils.strings import parse_xml
-from .utils.contextmanagers import chdir
+from .utils.compression import write_parts
+from .utils.compression import compression_level
 
 
 #################
@@ -19,12 +20,36 @@ from .utils.contextmanagers import chdir
 #################
 
 
-def dir2pptx(dirname, target=None):
+def _parts(dirname):
+    """ Iterate over the files in a folder as parts of a zip archive
+
+    Args:
+        dirname: str: name of the directory to iterate over
+
+    Yields:
+        name: str: the name of the part in the archive (relative to the folder)
+        content: bytes: the content of the file
+    """
+    for dir, subdirs, files in os.walk(dirname):
+        subdirs.sort()
+        for file in sorted(files):
+            path = os.path.join(dir, file)
+            with open(path, "rb") as f:
+                content = f.read()
+            yield os.path.relpath(path, dirname).replace(os.sep, "/"), content
+
+
+def dir2pptx(dirname, target=None, compression="fast", max_workers=None):
     """ Create ppt file from folder with right ppt structure 
     
     Args:
         dirname: str: name of the directory to convert to a powerpoint file
         target=None: the filename of the resulting pptx file
+        compression="fast": the compression policy of the pptx file: a preset ("stored",
+            "fast" or "small"), a deflate level between 0 and 9 or None.
+            Media files that are already compressed are stored as is.
+        max_workers=None: the number of compression threads. If None, the number of
+            processors on the machine is used.
     """
     # check target
     if target is None:
@@ -32,22 +57,24 @@ def dir2pptx(dirname, target=None):
     elif not target.endswith(".pptx"):
         target = target + ".pptx"
     # create zip (pptx) file
+    level = compression_level(compression)
     with zipfile.ZipFile(target, "w") as zf:
-        # go to folder where zip (pptx) file needs to be created
-        with chdir(dirname):
-            # add content of folder to zip (pptx) file
-            for dir, subdirs, files in os.walk("."):
-                zf.write(dir)
-                for file in files:
-                    zf.write(os.path.join(dir, file))
+        # add content of folder to zip (pptx) file, compressed in parallel
+        for info in write_parts(zf, _parts(dirname), level, max_workers):
+            pass
 
 
-def dir2zip(dirname, target=None):
+def dir2zip(dirname, target=None, compression="fast", max_workers=None):
     """ Create zip file from folder 
     
     Args:
         dirname: str: name of the directory to convert to a zip file
         target=None: the filename of the resulting zip file.
+        compression="fast": the compression policy of the zip file: a preset ("stored",
+            "fast" or "small"), a deflate level between 0 and 9 or None.
+            Files that are already compressed are stored as is.
+        max_workers=None: the number of compression threads. If None, the number of
+            processors on the machine is used.
     """
     # check target
     if target is None:
@@ -55,14 +82,11 @@ def dir2zip(dirname, target=None):
     elif not target.endswith(".zip"):
         target = target + ".zip"
     # create zip file
+    level = compression_level(compression)
     with zipfile.ZipFile(target, "w") as zf:
-        # go to folder where zip file needs to be created
-        with chdir(dirname):
-            # add content of folder to zip file
-            for dir, subdirs, files in os.walk("."):
-                zf.write(dir)
-                for file in files:
-                    zf.write(os.path.join(dir, file))
+        # add content of folder to zip file, compressed in parallel
+        for info in write_parts(zf, _parts(dirname), level, max_workers):
+            pass
 
 
 def pptx2dir(filename, target=None):
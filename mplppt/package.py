@@ -0,0 +1,275 @@
+""" In-memory representation of a pptx package """
+
+
+#############
+## Imports ##
+#############
+
+import os
+import time
+import threading
+import zipfile
+
+from .templates import PPTX
+from .templates import iterresources
+from .utils.images import encode_image
+from .utils.compression import write_parts
+from .utils.compression import part_compression
+from .utils.compression import compression_level
+from .utils.constants import PIXELSPERINCH
+from .stats import NOSTATS
+
+
+###############
+## Constants ##
+###############
+
+SLIDE = "ppt/slides/slide{n}.xml"
+SLIDE_RELS = "ppt/slides/_rels/slide{n}.xml.rels"
+SLIDE_CONTENT_TYPE = (
+    '<Override PartName="/ppt/slides/slide{n}.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.presentationml.slide+xml"/>'
+)
+SLIDE_RELATIONSHIP = (
+    '<Relationship Id="{id}" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/slide" Target="slides/slide{n}.xml"/>'
+)
+SLIDE_ID = '<p:sldId id="{n}" r:id="{id}"/>'
+
+
+###############
+## Templates ##
+###############
+
+# the template parts are read from disk only once and then kept in memory as bytes.
+_template_parts = None
+_template_parts_lock = threading.Lock()
+
+
+def template_parts():
+    """ Get the parts of the pptx template
+
+    Returns:
+        parts: dict: mapping of the part names in the pptx archive to their content (bytes)
+    """
+    global _template_parts
+    with _template_parts_lock:
+        if _template_parts is None:
+            parts = {}
+            for name, content in iterresources(PPTX):
+                if name == "ppt/media/.media":
+                    continue  # placeholder to keep the media folder in the template
+                parts[name] = content
+            _template_parts = parts
+        return _template_parts
+
+
+def slide_relationship_id(n):
+    """ The relationship id of the n-th slide (1-based) in the presentation
+
+    The first slide keeps the relationship id of the template, the other slides
+    get relationship ids following the ones already used by the template.
+    """
+    return "rId2" if n == 1 else "rId%i" % (n + 6)
+
+
+#############
+## Package ##
+#############
+
+
+class Package(object):
+    """ A pptx package, held completely in memory
+
+    The master, layouts, theme and other template parts are shared by all slides.
+    """
+
+    def __init__(self, slidesize=(6, 4)):
+        """ Create a new pptx package without slides
+
+        Args:
+            slidesize: the slidesize of the slides in the pptx file
+        """
+        self.slidesize = slidesize
+        self.slides = []
+
+    def add_slide(self, xml="", rels=None):
+        """ Add a slide to the package
+
+        Args:
+            xml: str|iterable: the xml to insert into the slide. This can also be an
+                iterable of xml chunks, which will be streamed into the slide when
+                the package is saved.
+            rels: list: the relationships to insert into the slide (for images)
+        """
+        self.slides.append((xml, [] if rels is None else rels))
+
+    def parts(self, stats=None):
+        """ Iterate over all the parts of the pptx package
+
+        Args:
+            stats=None: a Stats object to time the generation of the slide xml
+                ("xml" stage) and the encoding of media arrays in (see Stats).
+
+        Yields:
+            name: str: the name of the part in the pptx archive
+            content: bytes|iterable: the content of the part. The content of the slides
+                is an iterable of bytes chunks to keep the memory footprint bounded.
+        """
+        stats = NOSTATS if stats is None else stats
+        with stats.stage("template"):
+            template = template_parts()
+        numbers = range(1, len(self.slides) + 1)
+        for name, content in template.items():
+            if name == "[Content_Types].xml":
+                content = self._replace(
+                    content,
+                    SLIDE_CONTENT_TYPE.format(n=1),
+                    "\n".join(SLIDE_CONTENT_TYPE.format(n=n) for n in numbers),
+                )
+            elif name == "docProps/app.xml":
+                content = self._replace(
+                    content,
+                    "<Slides>1</Slides>",
+                    "<Slides>%i</Slides>" % len(self.slides),
+                )
+            elif name == "ppt/_rels/presentation.xml.rels":
+                content = self._replace(
+                    content,
+                    SLIDE_RELATIONSHIP.format(id=slide_relationship_id(1), n=1),
+                    "".join(
+                        SLIDE_RELATIONSHIP.format(id=slide_relationship_id(n), n=n)
+                        for n in numbers
+                    ),
+                )
+            elif name == "ppt/presentation.xml":
+                content = self._replace(
+                    content,
+                    SLIDE_ID.format(n=256, id=slide_relationship_id(1)),
+                    "\n".join(
+                        SLIDE_ID.format(n=255 + n, id=slide_relationship_id(n))
+                        for n in numbers
+                    ),
+                )
+                content = (
+                    content.decode("utf-8")
+                    .format(
+                        cx=int(self.slidesize[0] * PIXELSPERINCH),
+                        cy=int(self.slidesize[1] * PIXELSPERINCH),
+                    )
+                    .encode("utf-8")
+                )
+            elif name in (SLIDE.format(n=1), SLIDE_RELS.format(n=1)):
+                continue  # slides are added below
+            yield name, content
+
+        # media parts with the same target are only written once
+        media = {}
+        for n, (xml, rels) in zip(numbers, self.slides):
+            yield SLIDE.format(n=n), stats.timed(self.slide(xml), "xml")
+            yield SLIDE_RELS.format(n=n), self.slide_rels(rels)
+            for rel, data, target in rels:
+                media.setdefault(target, data)
+        for target, data in media.items():
+            if not isinstance(data, bytes):
+                with stats.stage("media"):
+                    start = time.perf_counter()
+                    data = self.encode_media(data, target)
+                    stats.media[target] = time.perf_counter() - start
+            yield "ppt/media/" + target, data
+
+    @staticmethod
+    def _replace(content, old, new):
+        """ replace a string in the content of a part """
+        return content.decode("utf-8").replace(old, new).encode("utf-8")
+
+    @staticmethod
+    def slide(xml):
+        """ Iterate over the content of a slide part
+
+        Args:
+            xml: str|iterable: the xml (or xml chunks) to insert into the slide
+
+        Yields:
+            content: bytes: consecutive chunks of the content of the slide part
+        """
+        content = template_parts()[SLIDE.format(n=1)].decode("utf-8")
+        head, tail = content.split("{objects}")
+        yield head.encode("utf-8")
+        if isinstance(xml, str):
+            xml = (xml,)
+        for chunk in xml:
+            yield chunk.encode("utf-8")
+        yield tail.encode("utf-8")
+
+    @staticmethod
+    def slide_rels(rels):
+        """ Get the content of the relationships part of a slide
+
+        Args:
+            rels: list: the relationships to insert into the slide (for images)
+
+        Returns:
+            content: bytes: the content of the relationships part of the slide
+        """
+        content = template_parts()[SLIDE_RELS.format(n=1)]
+        relationships = "".join(rel for rel, data, target in rels)
+        return (
+            content.decode("utf-8").format(relationships=relationships).encode("utf-8")
+        )
+
+    @staticmethod
+    def encode_media(data, target):
+        """ Get the content of a media part
+
+        Args:
+            data: bytes|array: the encoded image or an image array to encode into the
+                format given by the extension of its target
+            target: str: the filename of the image inside the package
+
+        Returns:
+            content: bytes: the encoded image
+        """
+        if isinstance(data, bytes):
+            return data
+        return encode_image(data, format=os.path.splitext(target)[-1][1:])
+
+    def save(self, target, compression="fast", max_workers=None, stats=None):
+        """ Write the pptx package in a single zip pass
+
+        The template and media parts are compressed in parallel on a pool of threads
+        and appended to the archive in a deterministic order (see write_parts). Only a
+        few parts per thread are held in memory at once. The slides are streamed into
+        the archive while they are generated, such that the memory footprint stays
+        bounded, no matter how big the slides are.
+
+        Args:
+            target: str|file: the filename of the pptx file or a writable file-like object
+                (like a BytesIO buffer or an open socket) to write the pptx file to.
+            compression="fast": the compression policy: a preset ("stored", "fast" or
+                "small"), a deflate level between 0 and 9 or None. The xml parts are
+                deflated, the media parts are stored as is (see part_compression).
+            max_workers=None: the number of compression threads. If None, the number of
+                processors on the machine is used. If 1, the parts are compressed in
+                the current thread.
+            stats=None: a Stats object to fill with the duration of writing the package
+                ("package" stage, which includes the "xml" stage) and the size of each
+                part (see Stats).
+        """
+        stats = NOSTATS if stats is None else stats
+        with stats.stage("package"):
+            self._save(target, compression, max_workers, stats)
+
+    def _save(self, target, compression, max_workers, stats):
+        """ Write the pptx package (see save) """
+        if isinstance(target, (str, os.PathLike)):
+            target = os.fspath(target)
+            if not target.endswith(".pptx"):
+                target = target + ".pptx"
+        level = compression_level(compression)
+        compress_type, compresslevel = part_compression(".xml", level)
+        with zipfile.ZipFile(
+            target, "w", compression=compress_type, compresslevel=compresslevel
+        ) as zf:
+            for info in write_parts(zf, self.parts(stats), level, max_workers):
+                stats.part(info.filename, info.file_size, info.compress_size)
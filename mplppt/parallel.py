@@ -0,0 +1,103 @@
+""" Parallel conversion of many matplotlib figures """
+
+
+#############
+## Imports ##
+#############
+
+import os
+import matplotlib as mpl
+from concurrent.futures import ProcessPoolExecutor
+
+from .shapes import Raw
+from .save import fig2group
+from .save import loadpicklefig
+from .presentation import Presentation
+
+
+###############
+## Functions ##
+###############
+
+
+def _convert(item, kwargs, compact=False):
+    """ Convert a figure into a raw slide (runs in a worker process)
+
+    Args:
+        item: a matplotlib figure, the filename of a pickled figure (see picklefig)
+            or a (picklable) function without arguments returning a figure.
+        kwargs: dict: keyword arguments for fig2group
+        compact=False: the compact output mode of the slide xml (see Object.xml)
+
+    Returns:
+        raw: Raw: the converted slide containing its xml and its media
+    """
+    if isinstance(item, mpl.figure.Figure):
+        fig = item
+    elif isinstance(item, (str, os.PathLike)):
+        fig = loadpicklefig(item)
+    else:
+        fig = item()
+    if not hasattr(fig.canvas, "get_renderer"):
+        # unpickled figures might not have a canvas that can render text
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        FigureCanvasAgg(fig)
+    return Raw.from_object(fig2group(fig=fig, **kwargs), compact=compact)
+
+
+def convert_figures(figures, max_workers=None, compact=False, **kwargs):
+    """ Convert many matplotlib figures into slides in a pool of worker processes
+
+    Args:
+        figures: iterable of matplotlib figures, filenames of pickled figures
+            (see picklefig) or (picklable) functions without arguments returning a figure.
+        max_workers=None: the number of worker processes. If None, the number
+            of processors on the machine is used. If 1, the figures are converted
+            in the current process.
+        compact=False: the compact output mode of the slide xml (see Object.xml)
+        **kwargs: keyword arguments for the conversion of the figures (see fig2group)
+
+    Returns:
+        slides: list: the converted slides (in the order of the given figures)
+    """
+    figures = list(figures)
+    if max_workers == 1:
+        return [_convert(item, kwargs, compact) for item in figures]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                _convert, figures, [kwargs] * len(figures), [compact] * len(figures)
+            )
+        )
+
+
+def savefigs(
+    filename, figures, max_workers=None, compression="fast", compact=False, **kwargs
+):
+    """ Export many matplotlib figures into a single pptx file with one slide per figure
+
+    The figures are converted in parallel by a pool of worker processes, after which
+    the presentation is assembled in the order of the given figures.
+
+    Args:
+        filename: str|file: the filename of the pptx file or a writable file-like object
+        figures: iterable of matplotlib figures, filenames of pickled figures
+            (see picklefig) or (picklable) functions without arguments returning a figure.
+        max_workers=None: the number of worker processes. If None, the number
+            of processors on the machine is used.
+        compression="fast": the compression policy of the pptx file (see Package.save)
+        compact=False: the compact output mode of the slide xml (see Object.xml)
+        **kwargs: keyword arguments for the conversion of the figures (see fig2group)
+
+    Returns:
+        presentation: the presentation containing all converted slides
+    """
+    presentation = Presentation()
+    slides = convert_figures(
+        figures, max_workers=max_workers, compact=compact, **kwargs
+    )
+    for slide in slides:
+        presentation.add_slide(slide)
+    presentation.save(filename, compression=compression)
+    return presentation
@@ -0,0 +1,127 @@
+""" Powerpoint presentations with multiple slides """
+
+
+#############
+## Imports ##
+#############
+
+import functools
+import matplotlib as mpl
+
+from .aio import write_async
+from .save import fig2group
+from .package import Package
+
+
+##################
+## Presentation ##
+##################
+
+
+class Presentation(object):
+    """ A powerpoint presentation consisting of multiple slides
+
+    All slides share the same slide master, layouts, theme and media folder.
+    The presentation is only written (in a single zip pass) when it is saved.
+    """
+
+    def __init__(self, slidesize=None):
+        """ Create a new presentation without slides
+
+        Args:
+            slidesize=None: the size of the slides in the presentation. If None,
+                the slidesize of the first slide added to the presentation will be used.
+        """
+        self.slidesize = slidesize
+        self.slides = []
+
+    def add_slide(self, obj, **kwargs):
+        """ Add a slide to the presentation
+
+        Args:
+            obj: the mplppt object (or group) or matplotlib figure to add as a new slide.
+            **kwargs: keyword arguments for the conversion of a matplotlib figure
+                (see fig2group)
+
+        Returns:
+            obj: the mplppt object that was added as a new slide
+
+        Note:
+            all slides in a presentation have the same size: adding an object with
+            another slidesize than the presentation raises a ValueError.
+        """
+        if isinstance(obj, mpl.figure.Figure):
+            obj = fig2group(fig=obj, **kwargs)
+        if self.slidesize is None:
+            self.slidesize = obj.slidesize
+        if tuple(obj.slidesize) != tuple(self.slidesize):
+            raise ValueError(
+                "slidesize %s does not match the slidesize %s of the presentation"
+                % (tuple(obj.slidesize), tuple(self.slidesize))
+            )
+        self.slides.append(obj)
+        return obj
+
+    def __len__(self):
+        return len(self.slides)
+
+    def package(self, compact=False):
+        """ Get the pptx package of the presentation
+
+        Args:
+            compact=False: the compact output mode of the slide xml (see Object.xml)
+
+        Returns:
+            package: the in-memory pptx package containing all the slides
+        """
+        slidesize = (6, 4) if self.slidesize is None else self.slidesize
+        package = Package(slidesize=slidesize)
+        for obj in self.slides:
+            package.add_slide(xml=obj.iterxml(compact=compact), rels=obj.rels())
+        return package
+
+    def save(
+        self, filename, compression="fast", max_workers=None, compact=False, stats=None
+    ):
+        """ Save the presentation
+
+        Args:
+            filename: str|file: the filename to save the presentation under or a writable
+                file-like object (like a BytesIO buffer) to write the presentation to.
+            compression="fast": the compression policy of the pptx file (see Package.save)
+            max_workers=None: the number of compression threads (see Package.save)
+            compact=False: the compact output mode of the slide xml (see Object.xml)
+            stats=None: a Stats object to fill with the timings and part sizes of
+                writing the pptx file (see Stats)
+        """
+        self.package(compact=compact).save(
+            filename, compression=compression, max_workers=max_workers, stats=stats
+        )
+
+    async def save_async(
+        self,
+        filename,
+        compression="fast",
+        max_workers=None,
+        compact=False,
+        executor=None,
+    ):
+        """ Save the presentation without blocking the event loop
+
+        Args:
+            filename: str|file|writer: the filename to save the presentation under, a
+                writable file-like object or an async writer (like an asyncio.StreamWriter)
+                to stream the presentation to while it's being written.
+            compression="fast": the compression policy of the pptx file (see Package.save)
+            max_workers=None: the number of compression threads (see Package.save)
+            compact=False: the compact output mode of the slide xml (see Object.xml)
+            executor=None: the executor to save the presentation on. If None, the
+                default bounded executor is used (see aio.run_in_executor).
+
+        Note:
+            the presentation should not be changed while it's being saved.
+        """
+        save = functools.partial(
+            self.save, compression=compression, max_workers=max_workers, compact=compact
+        )
+        await write_async(save, filename, executor=executor)
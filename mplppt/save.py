@@ -4,18 +4,24 @@
 
 import os
 import matplotlib as mpl
-from matplotlib.pyplot import gcf
-from matplotlib.pyplot import findobj
 
 from .shapes import Line
 from .shapes import Text
 from .shapes import Mesh
+from .shapes import Image
 from .shapes import Spine
 from .shapes import Group
 from .shapes import Canvas
 from .shapes import Polygon
 from .shapes import Rectangle
+from .shapes import MarkerCollection
+from .shapes import RectangleCollection
 from .utils.strings import random_name
+from .utils.mpl import ConversionContext
+from .utils.mpl import select_rasterized
+from .utils.mpl import get_plotting_area
+from .stats import NOSTATS
+from .cache import get_cache
 
 
 ########################
@@ -24,51 +30,265 @@ from .utils.strings import random_name
 
 # This is the function this repository is all about
 
-def savefig(filename, fig=None, axis=True):
+
+def savefig(
+    filename,
+    fig=None,
+    axis=True,
+    decimation=None,
+    max_markers=None,
+    rasterized=None,
+    dpi=None,
+    compression="fast",
+    compact=False,
+    stats=None,
+    cache=None,
+):
     """ Export a matplotlib figure to a pptx file 
     
     Args:
-        filename: str: the filename of the pptx file to save the matplotlib figure as
+        filename: str|file: the filename of the pptx file to save the matplotlib figure as
+            or a writable file-like object (like a BytesIO buffer) to write the pptx file to.
         fig: the figure to convert to a pptx slide. If None, plt.gcf() will be used to get the most recent figure.
         axis=True: wether to show the axis ticks and labels or not.
+        decimation=None: the decimation mode for lines (None, "lossless", "minmax" or "rdp").
+            The number of vertices dropped for each line is stored in its `dropped` attribute.
+        max_markers=None: scatter plots with more markers than this are embedded as an image.
+        rasterized=None: hybrid vector/raster mode. The selected artists are rendered
+            into a single image over the plotting area per axes, while text, ticks and
+            the canvas stay vector shapes. True selects the artists with
+            `artist.get_rasterized()`, an int gives a budget for the total number of
+            vertices of the vector shapes and a list gives the artists to rasterize
+            explicitly (see select_rasterized).
+        dpi=None: the resolution of the rasterized artists. If None, the resolution of
+            the figure is used.
+        compression="fast": the compression policy of the pptx file: a preset ("stored",
+            "fast" or "small"), a deflate level between 0 and 9 or None (see Package.save).
+        compact=False: the compact output mode of the slide xml: False for pretty printed
+            xml, True for minified xml (without template whitespace, comments and
+            redundant empty elements) or an int to also round the path coordinates to a
+            grid of that many EMU, which gives shorter numbers (see utils.paths.grid_size).
+        stats=None: a Stats object to fill with the duration of each stage of the
+            export, the shape and vertex counts, the size of each package part and the
+            media encode times (see Stats).
+        cache=None: a ShapeCache (or True for the default cache) to reuse the shapes
+            converted in earlier exports for the artists that did not change since
+            (see ShapeCache). This speeds up re-exporting a figure of which only a few
+            artists changed.
     
     Returns:
         group: the mplppt group containing all the objects that were converted from the matplotlib figure.
     """
-    # Get figure to save
+    # Convert figure
+    p = fig2group(
+        fig=fig,
+        axis=axis,
+        decimation=decimation,
+        max_markers=max_markers,
+        rasterized=rasterized,
+        dpi=dpi,
+        stats=stats,
+        cache=cache,
+    )
+
+    # save powerpoint group
+    p.save(filename, compression=compression, compact=compact, stats=stats)
+
+    # return powerpoint group
+    return p
+
+
+def fig2group(
+    fig=None,
+    axis=True,
+    decimation=None,
+    max_markers=None,
+    rasterized=None,
+    dpi=None,
+    stats=None,
+    cache=None,
+):
+    """ Convert a matplotlib figure to a group of powerpoint objects
+
+    Args:
+        fig: the figure to convert. If None, plt.gcf() will be used to get the most recent figure.
+        axis=True: wether to show the axis ticks and labels or not.
+        decimation=None: the decimation mode for lines (None, "lossless", "minmax" or "rdp").
+        max_markers=None: scatter plots with more markers than this are embedded as an image.
+        rasterized=None: the artists to rasterize in hybrid vector/raster mode
+            (see savefig and select_rasterized).
+        dpi=None: the resolution of the rasterized artists. If None, the resolution of
+            the figure is used.
+        stats=None: a Stats object to fill with the duration of each conversion stage
+            and the shape and vertex counts (see Stats).
+        cache=None: a ShapeCache (or True for the default cache) to reuse the shapes
+            converted in earlier exports for the artists that did not change since
+            (see ShapeCache). The rasterized artists are always rendered again.
+
+    Returns:
+        group: the mplppt group containing all the objects that were converted from the matplotlib figure.
+    """
+    stats = NOSTATS if stats is None else stats
+
+    # Get figure to save (only the default figure depends on the global state of pyplot)
     if fig is None:
+        from matplotlib.pyplot import gcf
+
         fig = gcf()
 
     # Create ppt group
     p = Group(objects=[])
 
+    # The shapes of the artists that changed since they were cached are converted again.
+    # The artists are checked before the layout, which clears their stale marks.
+    cache = get_cache(cache)
+    if cache is not None:
+        cache.invalidate_stale(fig)
+
+    def convert(function, obj, key=(), **kwargs):
+        if cache is None:
+            return function(obj, **kwargs)
+        return cache.convert(function, obj, key=key, **kwargs)
+
+    # Lay out the figure (only once, see get_plotting_area)
+    with stats.stage("layout"):
+        get_plotting_area(fig)
+
+    # The conversion context is computed only once for each axes
+    contexts = {}
+
+    def get_context(ax):
+        if ax not in contexts:
+            contexts[ax] = ConversionContext.from_axes(ax)
+        return contexts[ax]
+
+    # Only keep objects that have an axis (the axes background patch is hidden by the canvas)
+    with stats.stage("findobj"):
+        objs = [
+            obj
+            for obj in fig.findobj()
+            if isinstance(obj, mpl.artist.Artist)
+            and isinstance(obj.axes, mpl.axes.Axes)
+            and obj is not obj.axes.patch
+        ]
+
+    # The rasterized artists are rendered into a single image per axes (hybrid
+    # vector/raster mode). Each image takes the place of the first rasterized artist
+    # of its axes, the others are skipped.
+    raster = select_rasterized(fig, rasterized)
+    if raster:
+        invalid = raster.difference(objs)
+        if invalid:
+            raise ValueError(
+                "can only rasterize the artists of the axes of the figure, got %s"
+                % ", ".join(map(repr, invalid))
+            )
+        with stats.stage("rasterize"):
+            layers = {}
+            for obj in objs:
+                if obj in raster:
+                    layers.setdefault(obj.axes, []).append(obj)
+            raster = dict.fromkeys(raster, None)
+            for ax, artists in layers.items():
+                raster[artists[0]] = Image.from_artists(
+                    artists, context=get_context(ax), dpi=dpi
+                )
+
+    # The bars of bar charts and histograms are converted per container in a single batch.
+    # The collection takes the place of the first bar, the other bars are skipped.
+    bars = {}
+    for ax in fig.axes:
+        for container in ax.containers:
+            if not isinstance(container, mpl.container.BarContainer):
+                continue
+            patches = [patch for patch in container.patches if patch not in raster]
+            if patches:
+                with stats.stage("bars"):
+                    bars.update((patch, None) for patch in patches)
+                    bars[patches[0]] = convert(
+                        RectangleCollection.from_mpl, patches, context=get_context(ax)
+                    )
+
+    # Transform the vertices of all lines, polygons and rectangles of an axes at once
+    with stats.stage("transform"):
+        shapes = {}
+        for obj in objs:
+            if obj in bars or obj in raster:
+                continue
+            if isinstance(
+                obj, (mpl.lines.Line2D, mpl.patches.Polygon, mpl.patches.Rectangle)
+            ):
+                shapes.setdefault(obj.axes, []).append(obj)
+        vertices = {}
+        for ax, artists in shapes.items():
+            vertices.update(get_context(ax).transform_artists(artists))
+
+    # The conversion options the lines depend on
+    simplify = (mpl.rcParams["path.simplify"], mpl.rcParams["path.simplify_threshold"])
+
     # Parse mpl objects:
-    for obj in findobj(fig):
-        # only keep objects that have an axis:
-        if obj.axes is not None:
-            # convert lines:
-            if isinstance(obj, mpl.lines.Line2D):
-                p += Line.from_mpl(obj)
-            # convert rectangles:
-            if isinstance(obj, mpl.patches.Rectangle):
-                p += Rectangle.from_mpl(obj)
-            # convert polygons
-            if isinstance(obj, mpl.patches.Polygon):
-                p += Polygon.from_mpl(obj)
-            # convert text
-            if isinstance(obj, mpl.text.Text):
-                p += Text.from_mpl(obj)
-            # convert pcolormesh
-            if isinstance(obj, mpl.collections.QuadMesh):
-                p += Mesh.from_mpl(obj)
+    for obj in objs:
+        # embed rasterized artists:
+        if obj in raster:
+            p += raster[obj]
+            continue
+        # convert bars:
+        if obj in bars:
+            p += bars[obj]
+            continue
+        context = get_context(obj.axes)
+        # convert lines:
+        if isinstance(obj, mpl.lines.Line2D):
+            with stats.stage("lines"):
+                p += convert(
+                    Line.from_mpl,
+                    obj,
+                    key=(decimation, simplify),
+                    decimation=decimation,
+                    context=context,
+                    vertices=vertices[obj],
+                )
+        # convert rectangles:
+        if isinstance(obj, mpl.patches.Rectangle):
+            with stats.stage("rectangles"):
+                p += convert(
+                    Rectangle.from_mpl, obj, context=context, vertices=vertices[obj]
+                )
+        # convert polygons
+        if isinstance(obj, mpl.patches.Polygon):
+            with stats.stage("polygons"):
+                p += convert(
+                    Polygon.from_mpl, obj, context=context, vertices=vertices[obj]
+                )
+        # convert text
+        if isinstance(obj, mpl.text.Text):
+            with stats.stage("text"):
+                p += convert(
+                    Text.from_mpl, obj, context=context, transform=obj.get_transform()
+                )
+        # convert scatter plots
+        if isinstance(obj, mpl.collections.PathCollection):
+            with stats.stage("markers"):
+                p += convert(
+                    MarkerCollection.from_mpl,
+                    obj,
+                    key=(max_markers,),
+                    context=context,
+                    max_markers=max_markers,
+                )
+        # convert pcolormesh
+        if isinstance(obj, mpl.collections.QuadMesh):
+            with stats.stage("meshes"):
+                p += convert(Mesh.from_mpl, obj, context=context)
 
     # create a canvas
     # TODO: Create this with less parameters
-    canvas = Canvas.from_mpl(fig.axes[0], axis=axis)
+    ax = fig.axes[0]
+    with stats.stage("canvas"):
+        canvas = Canvas.from_mpl(ax, axis=axis, context=get_context(ax), cache=cache)
     p += canvas
 
-    # save powerpoint group
-    p.save(filename)
+    stats.count(p)
 
     # return powerpoint group
     return p
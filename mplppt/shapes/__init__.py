@@ -4,7 +4,7 @@
 ## Imports ##
 #############
 
-from .base import Object, Group
+from .base import Object, Group, Raw, Cached
 from .rectangle import Rectangle
 from .line import Line
 from .text import Text
@@ -13,3 +13,6 @@ from .polygon import Polygon
 from .image import Image
 from .image import Mesh
 from .spine import Spine
+from .collection import RectangleCollection
+from .collection import TextCollection
+from .collection import MarkerCollection
@@ -18,6 +18,8 @@ class Object(object):
     a powerpoint object can be any base object or a group of other objects.
     """
 
+    __slots__ = ("name", "_xml", "slidesize")
+
     # scaling factor for matplotlib figures
     # if this factor is 1, the whole slide will be covered by the plot
     _mpl_shrink_factor = 0.9
@@ -44,28 +46,60 @@ class Object(object):
         """
         return []
 
-    def xml(self):
+    def xml(self, compact=False):
         """ Get xml representation of current object 
         
+        Args:
+            compact=False: the compact output mode: False for pretty printed xml, True
+                for minified xml or an int for minified xml with the path coordinates
+                rounded to a grid of that many EMU (see utils.paths.grid_size).
+
         Returns:
             xml: str: the xml representation of this object
         """
         return self._xml
 
-    def save(self, filename):
+    def iterxml(self, compact=False):
+        """ Iterate over the xml representation of current object in chunks
+
+        Objects with a large xml representation override this method to avoid
+        building their complete xml representation in memory at once.
+
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
+        Yields:
+            xml: str: consecutive chunks of the xml representation of this object
+        """
+        yield self.xml(compact=compact)
+
+    def save(self, filename, compression="fast", compact=False, stats=None):
         """ Save current object as powerpoint presentation 
         
         Args:
-            filename: str: the filename to save this object under.
+            filename: str|file: the filename to save this object under or a writable
+                file-like object (like a BytesIO buffer) to write the presentation to.
+            compression="fast": the compression policy of the pptx file (see Package.save)
+            compact=False: the compact output mode of the slide xml (see Object.xml)
+            stats=None: a Stats object to fill with the timings and part sizes of
+                writing the pptx file (see Stats)
         """
-        new(filename, xml=self.xml(), rels=self.rels(), slidesize=self.slidesize)
+        new(
+            filename,
+            xml=self.iterxml(compact=compact),
+            rels=self.rels(),
+            slidesize=self.slidesize,
+            compression=compression,
+            stats=stats,
+        )
 
-    def colorspec(self, color):
+    def colorspec(self, color, compact=False):
         """ Xml representation of the color of the object. 
         
         Args:
             color: None|str|tuple: color can be a hexstring of format 'aaaaaa', or a tuple consisting of a
                 hexstring and an alpha value between 0 and 1. If `None` a `noFill` xml tag will be returned.
+            compact=False: in compact mode, the default (opaque) alpha value is left out.
 
         Returns:
             xml: the xml representation for the color of the object.
@@ -78,6 +112,8 @@ class Object(object):
                 alpha = str(int(alpha * 100000))
             else:
                 alpha = "100000"
+            if compact and alpha == "100000":
+                return '<a:solidFill><a:srgbClr val="' + color + '"/></a:solidFill>'
             return (
                 '<a:solidFill><a:srgbClr val="'
                 + color
@@ -111,6 +147,105 @@ class Object(object):
         return self + other
 
 
+################
+## Raw Object ##
+################
+
+
+class Raw(Object):
+    """ An object with a precomputed xml representation and precomputed relationships
+
+    This is useful to move already converted objects between processes.
+    """
+
+    __slots__ = ("_rels",)
+
+    def __init__(self, xml="", rels=None, name="", slidesize=(6, 4)):
+        """ raw powerpoint object initialization
+
+        Args:
+            xml: str="": the xml representation of the object
+            rels=None: the list of relationships of the object
+            name: str="": the name of the object
+            slidesize=(6,4): the size of the slide the object is embedded in.
+        """
+        Object.__init__(self, name=name, slidesize=slidesize)
+        self._xml = xml
+        self._rels = [] if rels is None else rels
+
+    @classmethod
+    def from_object(cls, obj, compact=False):
+        """ Create a raw object by precomputing the xml and relationships of another object
+
+        Args:
+            obj: Object: the object to precompute the representation for
+            compact=False: the compact output mode of the xml (see Object.xml)
+
+        Returns:
+            raw: Raw: the raw object
+        """
+        return cls(
+            xml=obj.xml(compact=compact),
+            rels=obj.rels(),
+            name=obj.name,
+            slidesize=obj.slidesize,
+        )
+
+    def rels(self):
+        """ Get relationship representation of current object 
+        
+        Returns:
+            rels: list: the list of relationships to other objects.
+        """
+        return self._rels
+
+
+###################
+## Cached Object ##
+###################
+
+
+class Cached(Object):
+    """ A converted object that renders its xml representation only once per output mode
+
+    This is how the shapes of a ShapeCache are reused between exports.
+    """
+
+    __slots__ = ("obj", "_xmls")
+
+    def __init__(self, obj):
+        """ cached powerpoint object initialization
+
+        Args:
+            obj: Object: the object to memoize the xml representation of
+        """
+        Object.__init__(self, name=obj.name, slidesize=obj.slidesize)
+        self.obj = obj
+        self._xmls = {}
+
+    def rels(self):
+        """ Get relationship representation of current object
+
+        Returns:
+            rels: list: the list of relationships to other objects.
+        """
+        return self.obj.rels()
+
+    def xml(self, compact=False):
+        """ Get xml representation of current object
+
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
+        Returns:
+            xml: str: the xml representation of this object
+        """
+        xml = self._xmls.get(compact)
+        if xml is None:
+            xml = self._xmls[compact] = self.obj.xml(compact=compact)
+        return xml
+
+
 ##################
 ## Object Group ##
 ##################
@@ -125,9 +260,11 @@ class Group(Object):
 
     # TODO: Implement the expected behavior such that an mplppt group corresponds to a powerpoint group.
 
-    def __init__(self, name="ppt", objects=[], slidesize=(6, 4)):
+    __slots__ = ("objects",)
+
+    def __init__(self, name="ppt", objects=None, slidesize=(6, 4)):
         Object.__init__(self, name=name, slidesize=slidesize)
-        self.objects = objects
+        self.objects = [] if objects is None else objects
 
     def rels(self):
         """ Get relationship representation of current object 
@@ -140,16 +277,33 @@ class Group(Object):
             rels += obj.rels()
         return rels
 
-    def xml(self):
+    def xml(self, compact=False):
         """ Get xml representation of current object 
         
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
         Returns:
             xml: str: the xml representation of this object
         """
-        xml = ""
+        return "".join(self.iterxml(compact=compact))
+
+    def iterxml(self, compact=False):
+        """ Iterate over the xml representation of current object in chunks
+
+        Args:
+            compact=False: the compact output mode (see Object.xml). In compact mode,
+                the objects are not separated by newlines.
+
+        Yields:
+            xml: str: consecutive chunks of the xml representation of this object
+        """
         for obj in self.objects:
-            xml += "\n" + obj.xml() + "\n"
-        return xml
+            if not compact:
+                yield "\n"
+            yield from obj.iterxml(compact=compact)
+            if not compact:
+                yield "\n"
 
     def __add__(self, other):
         """ Objects can be added together to form a Group of objects 
@@ -161,13 +315,15 @@ class Group(Object):
             group: Group: a group of two objects containing this object and the other object.
         """
         # TODO: remove this method in favor of the more generic __add__ method of Object.
-        if other is None: # if nothing is added to the group, one should return the original group
+        # if nothing is added to the group, one should return the original group
+        if other is None:
             return self
         # prefer this slidesize if it's defined, otherwise take over the slidesize of the other group
         slidesize = other.slidesize if len(self.objects) == 0 else self.slidesize
-        if hasattr(other, "objects"): # if the other object is a group, merge the two groups
+        # if the other object is a group, merge the two groups
+        if hasattr(other, "objects"):
             return Group(objects=self.objects + other.objects, slidesize=slidesize)
-        else: # if the other object is an object, add it to the objects
+        else:  # if the other object is an object, add it to the objects
             return Group(objects=self.objects + [other], slidesize=slidesize)
 
     def __iadd__(self, other):
@@ -5,14 +5,14 @@
 #############
 
 import numpy as np
-from scipy.interpolate import interp1d
 
 from .line import Line
 from .text import Text
 from .base import Group
 from .rectangle import Rectangle
+from .collection import TextCollection
 from ..utils.constants import POINTSPERINCH
-from ..utils.mpl import get_plotting_area
+from ..utils.mpl import ConversionContext
 from ..utils.colors import color2hex
 
 
@@ -23,6 +23,7 @@ from ..utils.colors import color2hex
 
 class Canvas(Group):
     """ Draw a canvas around a group of objects """
+
     def __init__(
         self, x, y, cx, cy, lw=0.8, ec="000000", fc="ffffff", slidesize=(6, 4)
     ):
@@ -109,7 +110,16 @@ class Canvas(Group):
         )
 
     @classmethod
-    def from_mpl(cls, mpl_ax, lw=0.8, ec="000000", fc="ffffff", axis=True):
+    def from_mpl(
+        cls,
+        mpl_ax,
+        lw=0.8,
+        ec="000000",
+        fc="ffffff",
+        axis=True,
+        context=None,
+        cache=None,
+    ):
         """ Create a canvas starting from a matplotlib axis
         
         Args:
@@ -118,14 +128,18 @@ class Canvas(Group):
             ec: the edgecolor to draw the canvas in
             fc: the facecolor to draw the canvas in
             axis=True: wether to draw the axis ticks and labels.
+            context=None: the conversion context of the axis.
+                If None, the conversion context will be created.
+            cache=None: a ShapeCache to reuse the tick labels converted in earlier
+                exports from (see ShapeCache).
          
         """
-
-        # Get slidesize from matplotlib figure
-        slidesize = (mpl_ax.figure.get_figwidth(), mpl_ax.figure.get_figheight())
+        if context is None:
+            context = ConversionContext.from_axes(mpl_ax)
+        slidesize = context.slidesize
 
         # Get plotting area
-        slide_x0, slide_x1, slide_y1, slide_y0 = get_plotting_area(mpl_ax.figure)
+        slide_x0, slide_x1, slide_y1, slide_y0 = context.area
 
         x = min(slide_x0, slide_x1) / POINTSPERINCH
         y = min(slide_y0, slide_y1) / POINTSPERINCH
@@ -146,45 +160,34 @@ class Canvas(Group):
 
         # Add ticks (numbers) to side of plot
         if axis:
-            ylim = mpl_ax.get_ylim()
+            # The tick labels are placed just outside the plotting area, without
+            # modifying the matplotlib tick labels themselves. The offset from the
+            # plotting area is 1% of the axes size (in axes coordinates), such that it
+            # doesn't depend on the scale of the axis (like a log scale).
+            ticklabels = TextCollection(name="Canvas_ticklabels", slidesize=slidesize)
+
+            def convert(mpl_text, xy, transform, key):
+                text = mpl_text._text.replace("\u2212", "-")  # unicode minus to ascii
+                kwargs = dict(context=context, xy=xy, text=text, transform=transform)
+                if cache is None:
+                    return Text.from_mpl(mpl_text, **kwargs)
+                return cache.convert(
+                    Text.from_mpl, mpl_text, key=(key, xy, text), **kwargs
+                ).obj
+
+            # x: data coordinates, y: axes coordinates
+            transform = mpl_ax.get_xaxis_transform()
             for mpl_text in mpl_ax.xaxis.get_ticklabels():
-                # HACK: I havent found a way to copy the axis.
-                # We store the old values and put them back in
-                # The figure to not change the original matplotlib axis
-                old_axes = mpl_text.axes
-                old_text = mpl_text._text
-                old_y = mpl_text._y
-
-                mpl_text.axes = mpl_ax
-                mpl_text._text = mpl_text._text.replace(
-                    "\u2212", "-"
-                )  #'\u2212 yields errors while writing to file
-                mpl_text._y = ylim[0] - 0.01 * (ylim[1] - ylim[0])
-                canvas = canvas + Text.from_mpl(mpl_text)
-
-                mpl_text.axes = old_axes
-                mpl_text._text = old_text
-                mpl_text._y = old_y
-
-            xlim = mpl_ax.get_xlim()
+                xy = (mpl_text._x, -0.01)
+                ticklabels.add(convert(mpl_text, xy, transform, "x"))
+
+            # x: axes coordinates, y: data coordinates
+            transform = mpl_ax.get_yaxis_transform()
             for mpl_text in mpl_ax.yaxis.get_ticklabels():
-                # HACK: I havent found a way to copy the axis.
-                # We store the old values and put them back in
-                # The figure to not change the original matplotlib axis
-                old_axes = mpl_text.axes
-                old_text = mpl_text._text
-                old_x = mpl_text._x
-
-                mpl_text.axes = mpl_ax
-                mpl_text._text = mpl_text._text.replace(
-                    "\u2212", "-"
-                )  #'\u2212 yields errors while writing to file
-                mpl_text._x = xlim[0] - 0.01 * (xlim[1] - xlim[0])
-                canvas = canvas + Text.from_mpl(mpl_text)
-
-                mpl_text.axes = old_axes
-                mpl_text._text = old_text
-                mpl_text._x = old_x
+                xy = (-0.01, mpl_text._y)
+                ticklabels.add(convert(mpl_text, xy, transform, "y"))
+
+            canvas.objects.append(ticklabels)
 
         # Return canvas
         return canvas
@@ -0,0 +1,604 @@
+""" Many homogeneous powerpoint shapes stored as parallel arrays """
+
+
+#############
+## Imports ##
+#############
+
+import abc
+
+import numpy as np
+import matplotlib as mpl
+
+from .base import Object
+from .image import Image
+from ..templates import LINE
+from ..templates import TEXTBOX
+from ..templates import RECTANGLE
+from ..utils.colors import color2hex
+from ..utils.strings import random_name
+from ..utils.constants import PIXELSPERPOINT
+from ..utils.mpl import ConversionContext
+from ..utils.paths import path2xml
+from ..utils.paths import grid_size
+
+
+################
+## Collection ##
+################
+
+
+class Collection(Object, metaclass=abc.ABCMeta):
+    """ A collection of homogeneous shapes
+
+    The properties of the shapes are stored in parallel numpy arrays (columns), such
+    that many shapes don't need many python objects. Colors are stored as an index
+    into a palette of unique colors. Appending a shape is O(1) (amortized).
+    """
+
+    __slots__ = ("_columns", "_size", "_bbox", "_palette", "_palette_index")
+
+    # (name, dtype) of the columns of the collection
+    _fields = (
+        ("x", float),
+        ("y", float),
+        ("cx", float),
+        ("cy", float),
+    )
+
+    # the columns containing colors (stored as an index into the palette)
+    _colors = ()
+
+    def __init__(self, name="", capacity=16, slidesize=(6, 4)):
+        """ Create an empty collection
+
+        Args:
+            name: str="": the name of the collection
+            capacity=16: the initial number of shapes the collection has room for
+            slidesize=(6,4): the size of the slide the collection is embedded in.
+        """
+        Object.__init__(self, name=name, slidesize=slidesize)
+        self._columns = {
+            field: np.empty(capacity, dtype=dtype) for field, dtype in self._fields
+        }
+        self._size = 0
+        self._bbox = None
+        self._palette = []
+        self._palette_index = {}
+
+    def __len__(self):
+        return self._size
+
+    def __getattr__(self, name):
+        """ get a column of the collection as an array """
+        # private names (like the slots themselves while the collection is being
+        # copied or unpickled) are never columns; looking up the columns for them
+        # would recurse into this method.
+        if not name.startswith("_"):
+            columns = object.__getattribute__(self, "_columns")
+            if name in columns:
+                return columns[name][: object.__getattribute__(self, "_size")]
+        raise AttributeError(
+            "%r object has no attribute %r" % (type(self).__name__, name)
+        )
+
+    @property
+    def palette(self):
+        """ The unique colors used in the collection """
+        return self._palette
+
+    def color_index(self, color):
+        """ Get the index of a color in the palette of the collection
+
+        Args:
+            color: the color to find the index for (None means no color)
+
+        Returns:
+            idx: int: the index of the color in the palette
+        """
+        key = color if color is None or isinstance(color, str) else tuple(color)
+        idx = self._palette_index.get(key)
+        if idx is None:
+            idx = self._palette_index[key] = len(self._palette)
+            self._palette.append(color)
+        return idx
+
+    def color_indices(self, colors):
+        """ Get the indices of many colors in the palette of the collection
+
+        Args:
+            colors: the colors to find the indices for. This can be a single color
+                for all shapes, a list of colors or an Nx4 array of rgba values
+                (which will be converted only once per unique color).
+
+        Returns:
+            idxs: int|list|array: the indices of the colors in the palette
+        """
+        if colors is None or isinstance(colors, str):
+            return self.color_index(colors)
+        if isinstance(colors, np.ndarray) and colors.ndim == 2:
+            unique, inverse = np.unique(colors, axis=0, return_inverse=True)
+            idxs = [self.color_index(color2hex(tuple(color))) for color in unique]
+            return np.array(idxs, dtype=np.int32)[inverse.ravel()]
+        return [self.color_index(color) for color in colors]
+
+    def _reserve(self, n):
+        """ make sure the collection has room for n more shapes """
+        capacity = len(self._columns[self._fields[0][0]])
+        if self._size + n <= capacity:
+            return
+        capacity = max(2 * capacity, self._size + n)
+        for field, column in self._columns.items():
+            new = np.empty(capacity, dtype=column.dtype)
+            new[: self._size] = column[: self._size]
+            self._columns[field] = new
+
+    def append(self, **values):
+        """ Append a single shape to the collection
+
+        Args:
+            **values: the value for each column of the collection
+        """
+        self._reserve(1)
+        for field in self._colors:
+            values[field] = self.color_index(values[field])
+        for field, _ in self._fields:
+            self._columns[field][self._size] = values[field]
+        self._size += 1
+        self._bbox = None
+
+    def extend(self, **arrays):
+        """ Append many shapes to the collection at once
+
+        Args:
+            **arrays: the values for each column of the collection. Colors can be
+                given in any form accepted by color_indices.
+        """
+        n = max(
+            len(arrays[field]) if np.ndim(arrays[field]) else 1
+            for field, _ in self._fields
+        )
+        if n == 0:
+            return
+        self._reserve(n)
+        for field in self._colors:
+            arrays[field] = self.color_indices(arrays[field])
+        for field, _ in self._fields:
+            self._columns[field][self._size : self._size + n] = arrays[field]
+        self._size += n
+        self._bbox = None
+
+    @property
+    def bbox(self):
+        """ The bounding box (x, y, cx, cy) of all the shapes in the collection """
+        if self._bbox is None:
+            if self._size == 0:
+                return (0, 0, 0, 0)
+            x = np.min(self.x)
+            y = np.min(self.y)
+            cx = np.max(self.x + self.cx) - x
+            cy = np.max(self.y + self.cy) - y
+            self._bbox = (x, y, cx, cy)
+        return self._bbox
+
+    def xml(self, compact=False):
+        """ Get xml representation of the collection
+
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
+        Returns:
+            xml: str: the xml representation of the collection
+        """
+        return "".join(self.iterxml(compact=compact))
+
+    def iterxml(self, compact=False, chunksize=1000):
+        """ Iterate over the xml representation of the collection in chunks
+
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+            chunksize=1000: the number of shapes per chunk
+
+        Yields:
+            xml: str: consecutive chunks of the xml representation of the collection
+        """
+        for start in range(0, self._size, chunksize):
+            stop = min(start + chunksize, self._size)
+            yield "".join(self._xml_chunk(start, stop, compact))
+
+    @abc.abstractmethod
+    def _xml_chunk(self, start, stop, compact=False):
+        """ Iterate over the xml representations of the shapes [start:stop] """
+
+
+###########################
+## Rectangle Collection ##
+###########################
+
+
+class RectangleCollection(Collection):
+    """ A collection of rectangles """
+
+    __slots__ = ()
+
+    _fields = Collection._fields + (("lw", float), ("ec", np.int32), ("fc", np.int32))
+
+    _colors = ("ec", "fc")
+
+    @classmethod
+    def from_mpl(cls, mpl_rects, context=None):
+        """ Create a rectangle collection starting from many matplotlib Rectangle objects
+
+        This converts the bars of a bar chart or a histogram (a BarContainer) in a single
+        batch: all corners are transformed at once, the colors are converted once per
+        unique color and the bars outside the plotting area are culled.
+
+        Args:
+            mpl_rects: the matplotlib rectangles to convert (sharing the same axes)
+            context=None: the conversion context of the axes of the rectangles.
+                If None, the conversion context will be created.
+
+        Returns:
+            collection: RectangleCollection: the converted rectangles
+        """
+        mpl_rects = [rect for rect in mpl_rects if rect.get_visible()]
+        if not mpl_rects:
+            return None
+        if context is None:
+            context = ConversionContext.from_axes(mpl_rects[0].axes)
+
+        # Get the two opposite corners of all rectangles
+        n = len(mpl_rects)
+        xy = np.empty((n, 2, 2), dtype=float)
+        xy[:, 0, 0] = [rect.get_x() for rect in mpl_rects]
+        xy[:, 0, 1] = [rect.get_y() for rect in mpl_rects]
+        xy[:, 1, 0] = xy[:, 0, 0] + [rect.get_width() for rect in mpl_rects]
+        xy[:, 1, 1] = xy[:, 0, 1] + [rect.get_height() for rect in mpl_rects]
+
+        # Translate plot data to locations on slide
+        transdata = mpl_rects[0].axes.transData
+        if all(rect.get_data_transform() is transdata for rect in mpl_rects):
+            x, y = context.transform(xy)
+        else:
+            vertices = context.transform_artists(mpl_rects)
+            x = np.concatenate([vertices[rect][0] for rect in mpl_rects])
+            y = np.concatenate([vertices[rect][1] for rect in mpl_rects])
+        x, y = x.reshape(n, 2), y.reshape(n, 2)
+
+        # If a rectangle is completely outside plotting area, then we shouldnt show it at all:
+        slide_x0, slide_x1, slide_y1, slide_y0 = context.area
+        xmin, xmax = x.min(1), x.max(1)
+        ymin, ymax = y.min(1), y.max(1)
+        visible = (xmax >= slide_x0) & (xmin <= slide_x1)
+        visible &= (ymax >= slide_y1) & (ymin <= slide_y0)
+
+        # If a rectangle is partly outside the plotting area, we map the values outside to
+        # the margin area (over which the (white?) rectangles of the Canvas will later be drawn)
+        xmin, xmax = xmin[visible], xmax[visible]
+        ymin, ymax = ymin[visible], ymax[visible]
+        context.clip(xmin, ymin)
+        context.clip(xmax, ymax)
+
+        idxs = np.flatnonzero(visible)
+        collection = cls(
+            name="mplrects_" + random_name(5),
+            capacity=max(len(idxs), 1),
+            slidesize=context.slidesize,
+        )
+        collection.extend(
+            x=xmin,
+            y=ymin,
+            cx=xmax - xmin,
+            cy=ymax - ymin,
+            lw=np.array([mpl_rects[i].get_linewidth() for i in idxs], dtype=float),
+            ec=np.array([mpl_rects[i].get_edgecolor() for i in idxs], dtype=float),
+            fc=np.array([mpl_rects[i].get_facecolor() for i in idxs], dtype=float),
+        )
+        return collection
+
+    def add(self, rect):
+        """ Add a Rectangle object to the collection
+
+        Args:
+            rect: Rectangle: the rectangle to add
+        """
+        self.append(
+            x=rect.x,
+            y=rect.y,
+            cx=rect.cx,
+            cy=rect.cy,
+            lw=rect.lw,
+            ec=rect.ec,
+            fc=rect.fc,
+        )
+
+    def _xml_chunk(self, start, stop, compact=False):
+        """ Iterate over the xml representations of the rectangles [start:stop] """
+        colorspecs = [self.colorspec(color, compact) for color in self._palette]
+        columns = self._columns
+        x = (columns["x"][start:stop] * PIXELSPERPOINT).astype(np.int64) + 1
+        y = (columns["y"][start:stop] * PIXELSPERPOINT).astype(np.int64) + 1
+        cx = (columns["cx"][start:stop] * PIXELSPERPOINT).astype(np.int64)
+        cy = (columns["cy"][start:stop] * PIXELSPERPOINT).astype(np.int64)
+        lw = (columns["lw"][start:stop] * PIXELSPERPOINT).astype(np.int64)
+        template = RECTANGLE.compact if compact else RECTANGLE
+        yield template.render_many(
+            stop - start,
+            name=["%s_%i" % (self.name, i) for i in range(start, stop)],
+            x=x,
+            y=y,
+            cx=cx,
+            cy=cy,
+            lw=lw,
+            colorspec=[colorspecs[i] for i in columns["ec"][start:stop].tolist()],
+            bgcolorspec=[colorspecs[i] for i in columns["fc"][start:stop].tolist()],
+        )
+
+
+######################
+## Text Collection ##
+######################
+
+
+class TextCollection(Collection):
+    """ A collection of text boxes
+
+    The x and y columns contain the effective location of the upper left corner of
+    each text box (i.e. already adjusted for the alignment of the text).
+    """
+
+    __slots__ = ()
+
+    _fields = Collection._fields + (
+        ("size", float),
+        ("color", np.int32),
+        ("font", object),
+        ("text", object),
+    )
+
+    _colors = ("color",)
+
+    def add(self, text):
+        """ Add a Text object to the collection
+
+        Args:
+            text: Text: the text box to add
+        """
+        if text.text.replace(" ", "").replace("\n", "") == "":
+            return  # text boxes without characters are not shown anyway
+        self.append(
+            x=text.x,
+            y=text.y,
+            cx=text.cx,
+            cy=text.cy,
+            size=text.size,
+            color=color2hex(text.color),
+            font=text.font,
+            text=text.text,
+        )
+
+    def _xml_chunk(self, start, stop, compact=False):
+        """ Iterate over the xml representations of the text boxes [start:stop] """
+        nocolor = self.colorspec(None)
+        columns = self._columns
+        x = (columns["x"][start:stop] * PIXELSPERPOINT).astype(np.int64) + 1
+        y = (columns["y"][start:stop] * PIXELSPERPOINT).astype(np.int64) + 1
+        cx = (columns["cx"][start:stop] * PIXELSPERPOINT).astype(np.int64)
+        cy = (columns["cy"][start:stop] * PIXELSPERPOINT).astype(np.int64)
+        size = (columns["size"][start:stop] * 100).astype(np.int64)
+        text = columns["text"][start:stop]
+        template = TEXTBOX.compact if compact else TEXTBOX
+        yield template.render_many(
+            stop - start,
+            text=text,
+            size=size,
+            color=[self._palette[i] for i in columns["color"][start:stop].tolist()],
+            font=columns["font"][start:stop],
+            name=[t.splitlines()[0] for t in text],
+            x=x,
+            y=y,
+            cx=cx,
+            cy=cy,
+            lw=int(0.2 * PIXELSPERPOINT),
+            colorspec=nocolor,
+            bgcolorspec=nocolor,
+        )
+
+
+########################
+## Marker Collection ##
+########################
+
+
+class MarkerCollection(Collection):
+    """ A collection of markers (like the points of a scatter plot)
+
+    Each marker is an instance of one of a few marker shapes. The xml of each marker
+    shape is generated only once (per style), after which the markers are emitted by
+    stamping their locations into this precompiled xml fragment.
+
+    The x and y columns contain the location of the upper left corner of each marker,
+    the cx and cy columns contain the size of the marker shape.
+    """
+
+    __slots__ = ("markers",)
+
+    _fields = Collection._fields + (
+        ("marker", np.int32),
+        ("lw", float),
+        ("ec", np.int32),
+        ("fc", np.int32),
+    )
+
+    _colors = ("ec", "fc")
+
+    def __init__(self, name="", markers=None, capacity=16, slidesize=(6, 4)):
+        """ Create an empty marker collection
+
+        Args:
+            name: str="": the name of the collection
+            markers=None: list of marker shapes. Each marker shape is a list of Nx2
+                arrays of polygon (or polyline) vertices relative to the upper left
+                corner of the marker (in points).
+            capacity=16: the initial number of markers the collection has room for
+            slidesize=(6,4): the size of the slide the collection is embedded in.
+        """
+        Collection.__init__(self, name=name, capacity=capacity, slidesize=slidesize)
+        self.markers = [] if markers is None else markers
+
+    @classmethod
+    def from_mpl(cls, mpl_collection, context=None, max_markers=None):
+        """ Create a marker collection starting from a matplotlib PathCollection
+
+        The offsets, sizes and colors of the markers are read as arrays and all offsets
+        are transformed at once. The geometry of each marker shape is only computed once
+        per unique path and size.
+
+        Args:
+            mpl_collection: the matplotlib PathCollection (like the result of ax.scatter)
+            context=None: the conversion context of the axes of the collection.
+                If None, the conversion context will be created.
+            max_markers=None: if the collection has more markers than this, the
+                collection is rendered as an image instead.
+
+        Returns:
+            collection: MarkerCollection|Image: the converted markers
+        """
+        if context is None:
+            context = ConversionContext.from_axes(mpl_collection.axes)
+
+        offsets = np.ma.filled(
+            np.ma.asarray(mpl_collection.get_offsets(), float), np.nan
+        )
+        paths = mpl_collection.get_paths()
+        if len(offsets) == 0 or len(paths) == 0:
+            return None
+
+        if max_markers is not None and len(offsets) > max_markers:
+            return Image.from_artists([mpl_collection], context=context)
+
+        # Translate the offsets to locations on slide
+        transform = mpl_collection.get_offset_transform()
+        if transform is mpl_collection.axes.transData:
+            transform = None
+        x, y = context.transform(offsets, transform)
+
+        # Get the (cycled) properties of all markers
+        n = len(offsets)
+        transforms = mpl_collection.get_transforms()
+        if len(transforms) == 0:
+            transforms = np.eye(3)[None]
+        idxs = np.arange(n)
+        path_idxs = idxs % len(paths)
+        transform_idxs = idxs % len(transforms)
+        marker_keys, marker = np.unique(
+            np.stack((path_idxs, transform_idxs), axis=1), axis=0, return_inverse=True
+        )
+        lw = np.asarray(mpl_collection.get_linewidth(), dtype=float).reshape(-1)
+        ec = np.asarray(mpl_collection.get_edgecolor(), dtype=float).reshape(-1, 4)
+        fc = np.asarray(mpl_collection.get_facecolor(), dtype=float).reshape(-1, 4)
+        lw = lw[idxs % len(lw)] if len(lw) else np.zeros(n)
+        ec = ec[idxs % len(ec)] if len(ec) else None
+        fc = fc[idxs % len(fc)] if len(fc) else None
+
+        # Compute the geometry of each unique marker shape (on the slide, y runs down)
+        flip = np.array([[1, 0, 0], [0, -1, 0], [0, 0, 1]], dtype=float)
+        linear = mpl_collection.get_transform().get_affine().get_matrix().copy()
+        linear[:2, 2] = 0
+        markers, corners = [], []
+        for path_idx, transform_idx in marker_keys:
+            matrix = flip @ linear @ transforms[transform_idx]
+            path = paths[path_idx].transformed(mpl.transforms.Affine2D(matrix))
+            polygons = [p for p in path.to_polygons(closed_only=False) if len(p)]
+            vertices = np.concatenate(polygons)
+            corner = vertices.min(0)
+            markers.append([polygon - corner for polygon in polygons])
+            corners.append(np.append(corner, vertices.max(0) - corner))
+        corners = np.array(corners)[marker.ravel()]
+
+        # If a marker is outside plotting area, then we shouldnt show it at all:
+        slide_x0, slide_x1, slide_y1, slide_y0 = context.area
+        visible = (x >= slide_x0) & (x <= slide_x1) & (y >= slide_y1) & (y <= slide_y0)
+
+        collection = cls(
+            name="mplmarkers_" + random_name(5),
+            markers=markers,
+            capacity=max(int(visible.sum()), 1),
+            slidesize=context.slidesize,
+        )
+        collection.extend(
+            x=(x + corners[:, 0])[visible],
+            y=(y + corners[:, 1])[visible],
+            cx=corners[visible, 2],
+            cy=corners[visible, 3],
+            marker=marker.ravel()[visible],
+            lw=lw[visible],
+            ec=None if ec is None else ec[visible],
+            fc=None if fc is None else fc[visible],
+        )
+        return collection
+
+    def fragment(self, marker, lw, ec, fc, compact=False):
+        """ Get the precompiled xml fragment for a marker shape in a certain style
+
+        Args:
+            marker: int: the index of the marker shape
+            lw: int: the linewidth (in EMU)
+            ec: int: the index of the edgecolor in the palette
+            fc: int: the index of the facecolor in the palette
+            compact=False: the compact output mode (see Object.xml)
+
+        Returns:
+            fragment: str: the xml of the marker with format specifiers for the number,
+                the x-location and the y-location (in EMU) of each marker instance.
+        """
+        polygons = self.markers[marker]
+        cx, cy = np.max(np.concatenate(polygons), axis=0)
+        grid = grid_size(compact)
+        shapespec = "".join(
+            path2xml(
+                polygon,
+                closed=len(polygon) > 2 and (polygon[0] == polygon[-1]).all(),
+                compact=compact,
+            )
+            for polygon in polygons
+        )
+        # the rendered fragment is used as format string, the template has no "%" itself
+        template = LINE.compact if compact else LINE
+        return template.render(
+            name=self.name.replace("%", "%%") + "_%d",
+            x="%d",
+            y="%d",
+            cx=int(cx * PIXELSPERPOINT),
+            cy=int(cy * PIXELSPERPOINT),
+            w=int(cx * PIXELSPERPOINT / grid),
+            h=int(cy * PIXELSPERPOINT / grid),
+            shapespec=shapespec,
+            lw=lw,
+            colorspec=self.colorspec(self._palette[ec], compact),
+            bgcolorspec=self.colorspec(self._palette[fc], compact),
+        )
+
+    def _xml_chunk(self, start, stop, compact=False):
+        """ Iterate over the xml representations of the markers [start:stop] """
+        columns = self._columns
+        x = (columns["x"][start:stop] * PIXELSPERPOINT).astype(np.int64) + 1
+        y = (columns["y"][start:stop] * PIXELSPERPOINT).astype(np.int64) + 1
+        lw = (columns["lw"][start:stop] * PIXELSPERPOINT).astype(np.int64)
+        styles = np.stack(
+            (
+                columns["marker"][start:stop],
+                lw,
+                columns["ec"][start:stop],
+                columns["fc"][start:stop],
+            ),
+            axis=1,
+        )
+        styles, style = np.unique(styles, axis=0, return_inverse=True)
+        fragments = np.array(
+            [self.fragment(*map(int, s), compact=compact) for s in styles], dtype=object
+        )
+        fmt = "".join(fragments[style.ravel()])
+        yield fmt % tuple(
+            np.stack((np.arange(start, stop), x, y), axis=1).ravel().tolist()
+        )
@@ -4,18 +4,18 @@
 ## Imports ##
 #############
 
-import os
 import numpy as np
-from matplotlib.pyplot import imread, imsave
-from scipy.interpolate import interp2d
+from time import perf_counter
+from matplotlib.image import imread
 
 from .base import Object
 from ..templates import IMAGE
 from ..utils.strings import random_name
-from ..utils.contextmanagers import chdir
+from ..utils.images import encode_image
+from ..utils.images import media_target
 from ..utils.constants import PIXELSPERPOINT
-from ..utils.constants import POINTSPERINCH
-from ..utils.mpl import get_plotting_area
+from ..utils.mpl import ConversionContext
+from ..utils.mpl import rasterize
 
 
 ###############
@@ -26,11 +26,14 @@ from ..utils.mpl import get_plotting_area
 class Image(Object):
     """ A Powerpoint Image """
 
+    __slots__ = ("data", "id", "source", "target", "x", "y", "cx", "cy", "encode_time")
+
     def __init__(self, source, name="", x=0, y=0, cx=None, cy=None, slidesize=(6, 4)):
         """ Create a powerpoint image
 
         Args:
-            source: the filename of the image to add to the powerpoint slide
+            source: the filename of the image to add to the powerpoint slide or an
+                image array (which will be encoded as png in memory)
             name: the xml-name for the image
             x=0: the x-location of the image
             y=0: the y-location of the image
@@ -38,24 +41,66 @@ class Image(Object):
             cy=0: the height of the image
             slidesize=(6,8): the slidesize to put the image in
         """
+        if not isinstance(source, str):
+            start = perf_counter()
+            array = np.asarray(source)
+            self.data = encode_image(array, "png")
+            source = random_name(5) + ".png"
+            # the time in seconds it took to encode the image
+            self.encode_time = perf_counter() - start
+        else:
+            # the file is embedded as is, it's only decoded if its size is needed.
+            array = None
+            with open(source, "rb") as file:
+                self.data = file.read()
+            self.encode_time = 0.0
         name = ".".join(source.split(".")[:-1]) if name == "" else name
         Object.__init__(self, name=name, slidesize=slidesize)
-        self.array = imread(source)
         self.id = random_name(5)
         self.source = source
-        self.target = self.name + "_" + self.id + "." + source.split(".")[-1]
+        self.target = media_target(self.data, source.split(".")[-1])
         self.x = x
         self.y = y
 
-        self.cx = 10000 * self.array.shape[1] / PIXELSPERPOINT if cx is None else cx
-        self.cy = 10000 * self.array.shape[0] / PIXELSPERPOINT if cy is None else cy
+        if cx is None or cy is None:
+            shape = (imread(source) if array is None else array).shape
+            cx = 10000 * shape[1] / PIXELSPERPOINT if cx is None else cx
+            cy = 10000 * shape[0] / PIXELSPERPOINT if cy is None else cy
+        self.cx = cx
+        self.cy = cy
         self._xml = IMAGE
 
+    @classmethod
+    def from_artists(cls, mpl_artists, context=None, dpi=None):
+        """ Create an image by rendering matplotlib artists over the plotting area
+
+        Args:
+            mpl_artists: the matplotlib artists (of the same axes) to render
+            context=None: the conversion context of the axes of the artists.
+                If None, the conversion context will be created.
+            dpi=None: the resolution to render the artists at. If None, the
+                resolution of the figure is used.
+        """
+        mpl_artists = list(mpl_artists)
+        if context is None:
+            context = ConversionContext.from_axes(mpl_artists[0].axes)
+        xmin, xmax, ymin, ymax = context.area
+        return cls(
+            source=rasterize(mpl_artists, context.area, dpi=dpi),
+            name="mplraster_" + random_name(5),
+            x=xmin,
+            y=ymin,
+            cx=xmax - xmin,
+            cy=ymax - ymin,
+            slidesize=context.slidesize,
+        )
+
     def rels(self):
         """ The relationship representation of the image
 
         This relationship information contains the source location of the image,
-        as well as the xml schema used to visualize it.
+        as well as the xml schema used to visualize it. Identical images share the
+        same target (see media_target), such that they are stored only once.
 
         Returns:
             rels: list: the list of relationships for the image.
@@ -63,15 +108,19 @@ class Image(Object):
         """
         rels = '<Relationship Id="{id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{target}"/>'
         rels = rels.format(id=self.id, target=self.target)
-        return [(rels, self.array, self.target)]
+        return [(rels, self.data, self.target)]
 
-    def xml(self):
+    def xml(self, compact=False):
         """ Get xml representation of the image
 
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
         Returns:
             xml: the xml representation for the image
         """
-        xml = self._xml.format(
+        template = self._xml.compact if compact else self._xml
+        xml = template.render(
             name=self.name,
             x=int(self.x * PIXELSPERPOINT) + 1,
             y=int(self.y * PIXELSPERPOINT) + 1,
@@ -85,54 +134,86 @@ class Image(Object):
 class Mesh(Image):
     """ Matplotlib QuadMesh (plt.pcolormesh) representated as a powerpoint image """
 
+    __slots__ = ()
+
     @classmethod
-    def from_mpl(cls, mpl_mesh):
+    def from_mpl(cls, mpl_mesh, context=None):
         """ create a Mesh from a matplotlib QuadMesh object
 
+        The visible cells are colormapped with the colormap and norm of the mesh
+        (masked cells become transparent) and encoded to png in memory exactly once.
+        Meshes that don't map onto the pixels of an image (like meshes with non-uniform
+        cells or with gouraud shading) are rendered by matplotlib instead.
+
         Args:
             mpl_mesh: the matplotlib QuadMesh object to represent as a powerpoint image
+            context=None: the conversion context of the axes of the mesh.
+                If None, the conversion context will be created.
         """
-        xlim = mpl_mesh.axes.get_xlim()
-        ylim = mpl_mesh.axes.get_ylim()
-        X = mpl_mesh._coordinates[:-1, :-1, 0]
-        Y = mpl_mesh._coordinates[:-1, :-1, 1]
-        xmin, xmax = max(np.min(X), min(xlim)), min(np.max(X), max(xlim))
-        ymin, ymax = max(np.min(Y), min(ylim)), min(np.max(Y), max(ylim))
-
-        H, W, *_ = mpl_mesh._coordinates.shape
-        Z = mpl_mesh._A.reshape(H-1, W-1).data
-
-        # Get plotting area
-        slide_x0, slide_x1, slide_y1, slide_y0 = get_plotting_area(mpl_mesh.figure)
-
-        # Get slidesize from matplotlib figure
-        slidesize = (mpl_mesh.figure.get_figwidth(), mpl_mesh.figure.get_figheight())
-
-        # Translate plot data to locations on slide
-        plot_x0, plot_x1 = mpl_mesh.axes.get_xlim()
-        mx = (slide_x0 - slide_x1) / (plot_x0 - plot_x1)
-        x = mx * (xmin - plot_x0) + slide_x0
-        cx = mx * (xmax - xmin)
-        if cx < 0:
-            x += cx
-            cx *= -1
-
-        plot_y0, plot_y1 = mpl_mesh.axes.get_ylim()
-        my = (slide_y0 - slide_y1) / (plot_y0 - plot_y1)
-        y = my * (ymin - plot_y0) + slide_y0
-        cy = my * (ymax - ymin)
-        if cy < 0:
-            y += cy
-            cy *= -1
-
-        id = random_name(5)
-        _x, _y = np.where(((X > xmin) & (X < xmax) & (Y > ymin) & (Y < ymax)))
-        imsave(id + ".png", Z[max(_x) : min(_x) : -1, min(_y) : max(_y)])
-
-        mesh = cls(
-            source=id + ".png", name=id, x=x, y=y, cx=cx, cy=cy, slidesize=slidesize
+        if context is None:
+            context = ConversionContext.from_axes(mpl_mesh.axes)
+
+        # Translate the cell edges to locations on slide
+        coordinates = mpl_mesh.get_coordinates()
+        H, W = coordinates.shape[0] - 1, coordinates.shape[1] - 1
+        transform = mpl_mesh.get_transform()
+        if transform is mpl_mesh.axes.transData:
+            transform = None
+        x, y = context.transform(coordinates.reshape(-1, 2), transform)
+        x, y = x.reshape(H + 1, W + 1), y.reshape(H + 1, W + 1)
+        xedges, yedges = x[0], y[:, 0]
+
+        # Only rectilinear meshes with uniform cells on the slide map onto an image
+        uniform = (
+            np.allclose(x, xedges[None, :])
+            and np.allclose(y, yedges[:, None])
+            and np.allclose(np.diff(xedges), (xedges[-1] - xedges[0]) / W, rtol=1e-3)
+            and np.allclose(np.diff(yedges), (yedges[-1] - yedges[0]) / H, rtol=1e-3)
+        )
+        A = mpl_mesh.get_array()
+        if (
+            A is None
+            or getattr(mpl_mesh, "_shading", "flat") == "gouraud"
+            or not uniform
+        ):
+            return Image.from_artists([mpl_mesh], context=context)
+
+        # Only keep the cells that are (partly) visible. Cells that are partly outside the
+        # plotting area will be covered by the margin rectangles of the Canvas.
+        slide_x0, slide_x1, slide_y1, slide_y0 = context.area
+        cols = np.flatnonzero(
+            (np.maximum(xedges[:-1], xedges[1:]) > slide_x0)
+            & (np.minimum(xedges[:-1], xedges[1:]) < slide_x1)
+        )
+        rows = np.flatnonzero(
+            (np.maximum(yedges[:-1], yedges[1:]) > slide_y1)
+            & (np.minimum(yedges[:-1], yedges[1:]) < slide_y0)
+        )
+        if len(cols) == 0 or len(rows) == 0:
+            return None
+        c0, c1 = cols[0], cols[-1] + 1
+        r0, r1 = rows[0], rows[-1] + 1
+
+        # Colormap the visible cells in a single pass
+        A = np.ma.asarray(A)
+        A = A.reshape((H, W) + A.shape[2:])[r0:r1, c0:c1]
+        alpha = mpl_mesh.get_alpha()
+        rgba = mpl_mesh.to_rgba(
+            A, alpha=alpha if np.isscalar(alpha) else None, bytes=True
+        )
+
+        # Image rows run top to bottom and image columns left to right on the slide
+        if yedges[r1] < yedges[r0]:
+            rgba = rgba[::-1]
+        if xedges[c1] < xedges[c0]:
+            rgba = rgba[:, ::-1]
+
+        return cls(
+            source=rgba,
+            name="mplmesh_" + random_name(5),
+            x=min(xedges[c0], xedges[c1]),
+            y=min(yedges[r0], yedges[r1]),
+            cx=abs(xedges[c1] - xedges[c0]),
+            cy=abs(yedges[r1] - yedges[r0]),
+            slidesize=context.slidesize,
         )
-        os.remove(id + ".png")
-        mesh.id = id
-        mesh.target = id + ".png"
-        return mesh
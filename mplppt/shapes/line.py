@@ -6,15 +6,18 @@
 #############
 
 import numpy as np
-from scipy.interpolate import interp1d
+import matplotlib as mpl
 
 from .base import Object
 from ..templates import LINE
 from ..utils.colors import color2hex
 from ..utils.strings import random_name
-from ..utils.constants import POINTSPERINCH
 from ..utils.constants import PIXELSPERPOINT
-from ..utils.mpl import get_plotting_area
+from ..utils.mpl import ConversionContext
+from ..utils.paths import path2xml
+from ..utils.paths import iterpath2xml
+from ..utils.paths import grid_size
+from ..utils.decimation import decimate
 
 
 ##########
@@ -25,6 +28,8 @@ from ..utils.mpl import get_plotting_area
 class Line(Object):
     """ A Line """
 
+    __slots__ = ("_shape", "_bbox", "lw", "ec", "fc", "closed", "dropped")
+
     def __init__(
         self,
         name="Line",
@@ -47,95 +52,120 @@ class Line(Object):
             slidesize=(6,4): the slidesize in which to embed the line.
         """
         Object.__init__(self, name=name, slidesize=slidesize)
-        self.shape = np.array(shape)
+        self.shape = shape
         self.lw = lw
         self.ec = ec
         self.fc = fc
         self.closed = closed
+        self.dropped = 0  # number of vertices dropped by decimation
         self._xml = LINE
 
+    @property
+    def shape(self):
+        """ The shape of the line: Nx2 array of (x, y) coordinates """
+        return self._shape
+
+    @shape.setter
+    def shape(self, shape):
+        self._shape = np.array(shape)
+        self._bbox = None
+
+    @property
+    def bbox(self):
+        """ The bounding box (x, y, cx, cy) of the finite points of the shape
+        (computed only once) """
+        if self._bbox is None:
+            shape = self._shape[np.isfinite(self._shape).all(axis=1)]
+            if len(shape) == 0:
+                return (0, 0, 0, 0)
+            x, y = np.min(shape, axis=0)
+            cx, cy = np.max(shape, axis=0) - (x, y)
+            self._bbox = (x, y, cx, cy)
+        return self._bbox
+
     @property
     def x(self):
         """ X location of the upper left corner of the shape """
-        return np.min(self.shape, axis=0)[0]
+        return self.bbox[0]
 
     @property
     def y(self):
         """ Y location of the upper left corner of the shape """
-        return np.min(self.shape, axis=0)[1]
+        return self.bbox[1]
 
     @property
     def cx(self):
         """ Total width of the shape """
-        return (np.max(self.shape, axis=0) - np.min(self.shape, axis=0))[0]
+        return self.bbox[2]
 
     @property
     def cy(self):
         """ Total height of the shape """
-        return (np.max(self.shape, axis=0) - np.min(self.shape, axis=0))[1]
+        return self.bbox[3]
 
     def get_adjusted_shape(self):
         """ To draw a resize box around the shape, we need to give the coordinates of the
         shape relative to the the upper left corner of the shape
 
         Returns:
-            shape: list: the shape of the line relative to the upper left corner
+            shape: array: the shape of the line relative to the upper left corner
         """
-        shape = self.shape.copy()
-        shape[:, 0] -= self.x
-        shape[:, 1] -= self.y
-        return shape
+        return self.shape - (self.x, self.y)
 
     @classmethod
-    def from_mpl(cls, mpl_line):
+    def from_mpl(
+        cls, mpl_line, decimation=None, tolerance=None, context=None, vertices=None
+    ):
         """ Create a line starting from a matplotlib Line2D object
 
         Args:
             mpl_line: the matplotlib line to convert into a ppt line
+            decimation=None: the decimation mode to reduce the number of vertices with:
+                None: keep all vertices
+                "lossless": drop duplicate and collinear vertices after EMU rounding
+                "minmax": per-column min/max decimation (lossy)
+                "rdp": Douglas-Peucker decimation (lossy)
+                The lossy modes fall back to "lossless" if matplotlib would not simplify
+                the line either (see the rcParams "path.simplify").
+            tolerance=None: the tolerance of the lossy decimation modes as a distance
+                on the slide (in points). If None, the rcParams "path.simplify_threshold"
+                is used.
+            context=None: the conversion context of the axes of the line.
+                If None, the conversion context will be created.
+            vertices=None: the (x, y) slide coordinates of the line, if they were already
+                transformed (see ConversionContext.transform_artists).
+
+        Note:
+            the number of dropped vertices is stored in the `dropped` attribute of the line.
         """
-
-        # TODO: The code below gets repeated a lot over the different shapes.
-        #      Create a method in the Object class that extrapolates the
-        #      x and y values.
-
-        # Get slidesize from matplotlib figure
-        slidesize = (mpl_line.figure.get_figwidth(), mpl_line.figure.get_figheight())
-
-        # Get plotting area
-        slide_x0, slide_x1, slide_y1, slide_y0 = get_plotting_area(mpl_line.figure)
+        if context is None:
+            context = ConversionContext.from_axes(mpl_line.axes)
 
         # Translate plot data to locations on slide
-        plot_x0, plot_x1 = mpl_line.axes.get_xlim()
-        plot_y0, plot_y1 = mpl_line.axes.get_ylim()
-
-        mx = (slide_x1 - slide_x0) / (plot_x1 - plot_x0)
-        sx = 0.5 * slide_x0
-        px = sx / mx
-
-        my = (slide_y1 - slide_y0) / (plot_y1 - plot_y0)
-        sy = 0.5 * slide_y0
-        py = sy / my
-
-        x = interp1d(
-            [plot_x0, plot_x1], [slide_x0, slide_x1], fill_value="extrapolate"
-        )(mpl_line._x)
-        y = interp1d(
-            [plot_y0, plot_y1], [slide_y0, slide_y1], fill_value="extrapolate"
-        )(mpl_line._y)
+        if vertices is None:
+            vertices = context.transform_artists([mpl_line])[mpl_line]
+        x, y = (v.copy() for v in vertices)
 
         # HACK: If an object is partly outside the plotting area, we map the values outside to the
         # margin area (over which the (white?) rectangles of the Canvas will later be drawn)
-        x[x < 0.5 * slide_x0] = 0.5 * slide_x0
-        x[x > slide_x1 + 0.5 * slide_x0] = slide_x1 + 0.5 * slide_x0
-        y[y < 0.5 * slide_y1] = 0.5 * slide_y1
-        y[y > slide_y0 + 0.5 * slide_y1] = slide_y0 + 0.5 * slide_y1
+        context.clip(x, y)
 
         shape = np.stack((x, y), axis=1)
 
         # If object is completely outside plotting area, then we shouldnt show it at all:
-        if ((y < slide_y1) | (y > slide_y0) | (x < slide_x0) | (x > slide_x1)).all():
+        if context.outside(x, y):
             return None
 
+        # Decimate the line at slide resolution
+        if decimation in ("minmax", "rdp"):
+            if not (
+                mpl.rcParams["path.simplify"] and mpl_line.get_path().should_simplify
+            ):
+                decimation = "lossless"
+        if tolerance is None:
+            tolerance = mpl.rcParams["path.simplify_threshold"]
+        shape, dropped = decimate(shape, decimation, tolerance)
+
         # Create Line
         line = cls(
             name="mplline_" + random_name(5),
@@ -144,48 +174,54 @@ class Line(Object):
             ec=color2hex(mpl_line.get_color()),
             fc=None,
             closed=False,
-            slidesize=slidesize,
+            slidesize=context.slidesize,
         )
+        line.dropped = dropped
         return line
 
-    def xml(self):
+    def xml(self, compact=False):
         """ Get the xml representation of the whole object containing the line 
         
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
         Returns:
             xml: str: the xml representation of the whole object containing the line
         """
-        xml = self._xml.format(
-            name=self.name,
-            x=int(self.x * PIXELSPERPOINT) + 1,
-            y=int(self.y * PIXELSPERPOINT) + 1,
-            cx=int(self.cx * PIXELSPERPOINT),
-            cy=int(self.cy * PIXELSPERPOINT),
-            lw=int(self.lw * PIXELSPERPOINT),
-            shapespec=self.shapespec(self.get_adjusted_shape(), self.closed),
-            colorspec=self.colorspec(self.ec),
-            bgcolorspec=self.colorspec(self.fc),
-        )
-        return xml
+        return "".join(self.iterxml(compact=compact))
 
-    def shapespec(self, shape, closed):
-        """ Get the xml representation of just the line. """
-        # check if shape is empty
-        if len(shape) == 0:
-            return ""
+    def iterxml(self, compact=False):
+        """ Iterate over the xml representation of the whole object containing the line
 
-        # first point in shape
-        shapespec = '<a:moveTo><a:pt x="{x}" y="{y}"/></a:moveTo>\n'.format(
-            x=int(shape[0][0] * PIXELSPERPOINT), y=int(shape[0][1] * PIXELSPERPOINT)
-        )
+        The path of the line is streamed in chunks, such that the xml of lines with
+        many points never needs to be held in memory at once.
 
-        # other points in shape
-        for x, y in shape[1:]:
-            shapespec = shapespec + '<a:lnTo><a:pt x="{x}" y="{y}"/></a:lnTo>\n'.format(
-                x=int(x * PIXELSPERPOINT), y=int(y * PIXELSPERPOINT)
-            )
+        Args:
+            compact=False: the compact output mode (see Object.xml). The width and
+                height of the path are expressed in the same grid as its points.
 
-        # close shape
-        if closed:
-            shapespec = shapespec + "<a:close/>\n"
+        Yields:
+            xml: str: consecutive chunks of the xml representation of the line
+        """
+        x, y, cx, cy = self.bbox
+        grid = grid_size(compact)
+        template = self._xml.compact if compact else self._xml
+        yield from template.iterrender(
+            name=self.name,
+            x=int(x * PIXELSPERPOINT) + 1,
+            y=int(y * PIXELSPERPOINT) + 1,
+            cx=int(cx * PIXELSPERPOINT),
+            cy=int(cy * PIXELSPERPOINT),
+            w=int(cx * PIXELSPERPOINT / grid),
+            h=int(cy * PIXELSPERPOINT / grid),
+            lw=int(self.lw * PIXELSPERPOINT),
+            colorspec=self.colorspec(self.ec, compact),
+            bgcolorspec=self.colorspec(self.fc, compact),
+            shapespec=iterpath2xml(
+                self.shape, self.closed, origin=(x, y), compact=compact
+            ),
+        )
 
-        return shapespec
+    def shapespec(self, shape, closed, compact=False):
+        """ Get the xml representation of just the line. """
+        return path2xml(shape, closed, compact=compact)
@@ -6,14 +6,11 @@
 #############
 
 import numpy as np
-from scipy.interpolate import interp1d
 
 from .line import Line
 from ..utils.colors import color2hex
 from ..utils.strings import random_name
-from ..utils.constants import POINTSPERINCH
-from ..utils.constants import PIXELSPERPOINT
-from ..utils.mpl import get_plotting_area
+from ..utils.mpl import ConversionContext
 
 
 #############
@@ -24,6 +21,8 @@ from ..utils.mpl import get_plotting_area
 class Polygon(Line):
     """ A polygon. """
 
+    __slots__ = ()
+
     def __init__(
         self,
         name="Polygon",
@@ -48,58 +47,32 @@ class Polygon(Line):
         )
 
     @classmethod
-    def from_mpl(cls, mpl_poly):
+    def from_mpl(cls, mpl_poly, context=None, vertices=None):
         """ Create a polygon starting from a matplotlib Polygon object
 
         Args:
             mpl_poly: the matplotlib polygon to convert into a ppt polygon
+            context=None: the conversion context of the axes of the polygon.
+                If None, the conversion context will be created.
+            vertices=None: the (x, y) slide coordinates of the polygon, if they were already
+                transformed (see ConversionContext.transform_artists).
         """
-
-        #TODO: The code below gets repeated a lot over the different shapes.
-        #      Create a method in the Object class that extrapolates the
-        #      x and y values.
-
-        # Get slidesize from matplotlib figure
-        slidesize = (mpl_poly.figure.get_figwidth(), mpl_poly.figure.get_figheight())
-
-        # Get plotting area
-        slide_x0, slide_x1, slide_y1, slide_y0 = get_plotting_area(mpl_poly.figure)
+        if context is None:
+            context = ConversionContext.from_axes(mpl_poly.axes)
 
         # Translate plot data to locations on slide
-        plot_x0, plot_x1 = mpl_poly.axes.get_xlim()
-        plot_y0, plot_y1 = mpl_poly.axes.get_ylim()
-
-        mx = (slide_x1 - slide_x0) / (plot_x1 - plot_x0)
-        sx = 0.5 * slide_x0
-        px = sx / mx
-
-        my = (slide_y1 - slide_y0) / (plot_y1 - plot_y0)
-        sy = 0.5 * slide_y0
-        py = sy / my
-
-        try:
-            x, y = mpl_poly.get_xy().T
-        except AttributeError:
-            x, y = mpl_poly._get_xy().T
-
-        x = interp1d(
-            [plot_x0, plot_x1], [slide_x0, slide_x1], fill_value="extrapolate"
-        )(x)
-        y = interp1d(
-            [plot_y0, plot_y1], [slide_y0, slide_y1], fill_value="extrapolate"
-        )(y)
+        if vertices is None:
+            vertices = context.transform_artists([mpl_poly])[mpl_poly]
+        x, y = (v.copy() for v in vertices)
 
         # HACK: If an object is partly outside the plotting area, we map the values outside to the
         # margin area (over which the (white?) rectangles of the Canvas will later be drawn)
-        x[x < 0.5 * slide_x0] = 0.5 * slide_x0
-        x[x > slide_x1 + 0.5 * slide_x0] = slide_x1 + 0.5 * slide_x0
-        y[y < 0.5 * slide_y1] = 0.5 * slide_y1
-        y[y > slide_y0 + 0.5 * slide_y1] = slide_y0 + 0.5 * slide_y1
+        context.clip(x, y)
 
         shape = np.stack((x, y), axis=1)
 
         # If object is completely outside plotting area, then we shouldnt show it at all:
-        if ((y < slide_y1) | (y > slide_y0) | (x < slide_x0) | (x > slide_x1)).all():
+        if context.outside(x, y):
             return None
 
         # Create Line
@@ -108,7 +81,7 @@ class Polygon(Line):
             shape=shape,
             ec=color2hex(mpl_poly._edgecolor),
             fc=None if not mpl_poly.fill else color2hex(mpl_poly._facecolor),
-            slidesize=slidesize,
+            slidesize=context.slidesize,
         )
 
         return poly
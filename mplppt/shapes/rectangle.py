@@ -9,9 +9,8 @@ from .base import Object
 from ..templates import RECTANGLE
 from ..utils.colors import color2hex
 from ..utils.strings import random_name
-from ..utils.constants import POINTSPERINCH
 from ..utils.constants import PIXELSPERPOINT
-from ..utils.mpl import get_plotting_area
+from ..utils.mpl import ConversionContext
 
 
 ###############
@@ -22,6 +21,8 @@ from ..utils.mpl import get_plotting_area
 class Rectangle(Object):
     """ A rectangle """
 
+    __slots__ = ("x", "y", "cx", "cy", "lw", "ec", "fc")
+
     def __init__(
         self,
         name="Rect",
@@ -58,41 +59,26 @@ class Rectangle(Object):
         self._xml = RECTANGLE
 
     @classmethod
-    def from_mpl(cls, mpl_rect):
+    def from_mpl(cls, mpl_rect, context=None, vertices=None):
         """ Create a rectangle starting from a matplotlib Rectangle object
 
         Args:
             mpl_rect: the matplotlib rectangle to convert to a powerpoint rectangle
+            context=None: the conversion context of the axes of the rectangle.
+                If None, the conversion context will be created.
+            vertices=None: the (x, y) slide coordinates of two opposite corners of the
+                rectangle, if they were already transformed
+                (see ConversionContext.transform_artists).
         """
-
-        # TODO: The code below gets repeated a lot over the different shapes.
-        #       Create a method in the Object class that extrapolates the
-        #       x and y values.
-
-        # Get slidesize from matplotlib figure
-        slidesize = (mpl_rect.figure.get_figwidth(), mpl_rect.figure.get_figheight())
-
-        # Get plotting area
-        slide_x0, slide_x1, slide_y1, slide_y0 = get_plotting_area(mpl_rect.figure)
-
-        rx, ry = mpl_rect.xy
+        if context is None:
+            context = ConversionContext.from_axes(mpl_rect.axes)
 
         # Translate plot data to locations on slide
-        plot_x0, plot_x1 = mpl_rect.axes.get_xlim()
-        mx = (slide_x0 - slide_x1) / (plot_x0 - plot_x1)
-        x = mx * (rx - plot_x0) + slide_x0
-        cx = mx * mpl_rect._width
-        if cx < 0:
-            x += cx
-            cx *= -1
-
-        plot_y0, plot_y1 = mpl_rect.axes.get_ylim()
-        my = (slide_y0 - slide_y1) / (plot_y0 - plot_y1)
-        y = my * (ry - plot_y0) + slide_y0
-        cy = my * mpl_rect._height
-        if cy < 0:
-            y += cy
-            cy *= -1
+        if vertices is None:
+            vertices = context.transform_artists([mpl_rect])[mpl_rect]
+        (x0, x1), (y0, y1) = vertices
+        x, cx = min(x0, x1), abs(x1 - x0)
+        y, cy = min(y0, y1), abs(y1 - y0)
 
         # HACK: If an object is partly outside the plotting area, we map the values outside to the
         # margin area (over which the (white?) rectangles of the Canvas will later be drawn)
@@ -111,20 +97,25 @@ class Rectangle(Object):
             lw=mpl_rect._linewidth,
             ec=color2hex(mpl_rect._edgecolor),
             fc=color2hex(mpl_rect._facecolor),
-            slidesize=slidesize,
+            slidesize=context.slidesize,
         )
         return rect
 
-    def xml(self):
-        """ Get xml representation of the rectangle """
-        xml = self._xml.format(
+    def xml(self, compact=False):
+        """ Get xml representation of the rectangle
+
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+        """
+        template = self._xml.compact if compact else self._xml
+        xml = template.render(
             name=self.name,
             x=int(self.x * PIXELSPERPOINT) + 1,
             y=int(self.y * PIXELSPERPOINT) + 1,
             cx=int(self.cx * PIXELSPERPOINT),
             cy=int(self.cy * PIXELSPERPOINT),
             lw=int(self.lw * PIXELSPERPOINT),
-            colorspec=self.colorspec(self.ec),
-            bgcolorspec=self.colorspec(self.fc),
+            colorspec=self.colorspec(self.ec, compact),
+            bgcolorspec=self.colorspec(self.fc, compact),
         )
         return xml
@@ -6,7 +6,6 @@
 #############
 
 import numpy as np
-from scipy.interpolate import interp1d
 
 from .line import Line
 from ..templates import LINE
@@ -20,6 +19,8 @@ from ..utils.constants import PIXELSPERPOINT
 ## Spine ##
 ###########
 class Spine(Line):
+    __slots__ = ()
+
     @classmethod
     def from_mpl(cls, mpl_spine):
         """ Create a line starting from a matplotlib Spine object
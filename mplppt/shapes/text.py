@@ -5,18 +5,16 @@
 ## Imports ##
 #############
 
+import copy
 import numpy as np
-from scipy.interpolate import interp1d
 
 from .base import Object
-from ..templates import TEXT
-from ..templates import RECTANGLE
+from ..templates import TEXTBOX
 from ..utils.colors import color2hex
 from ..utils.strings import random_name
 from ..utils.constants import ALIGNMENTS
-from ..utils.constants import POINTSPERINCH
 from ..utils.constants import PIXELSPERPOINT
-from ..utils.mpl import get_plotting_area
+from ..utils.mpl import ConversionContext
 
 
 ##########
@@ -27,6 +25,8 @@ from ..utils.mpl import get_plotting_area
 class Text(Object):
     """ A text box """
 
+    __slots__ = ("text", "_x", "_y", "cx", "cy", "ha", "va", "size", "color", "font")
+
     def __init__(
         self,
         text="",
@@ -67,7 +67,7 @@ class Text(Object):
         self.size = size
         self.color = color
         self.font = font
-        self._xml = RECTANGLE.replace("</p:sp>", "\n" + TEXT + "\n</p:sp>\n")
+        self._xml = TEXTBOX
 
     @property
     def x(self):
@@ -88,35 +88,35 @@ class Text(Object):
         return self._y
 
     @classmethod
-    def from_mpl(cls, mpl_text):
+    def from_mpl(cls, mpl_text, context=None, xy=None, text=None, transform=None):
         """ Create a text box starting from a matplotlib Text object
 
         Args:
             mpl_text: the matplotlib text to convert into powerpoint text.
-        
+            context=None: the conversion context of the axes of the text.
+                If None, the conversion context will be created.
+            xy=None: the location of the text (in the coordinates of `transform`). If
+                None, the location of the matplotlib text is used.
+            text=None: the text to show. If None, the text of the matplotlib text is used.
+            transform=None: the matplotlib transform that maps the given location to
+                display coordinates. If None, the location is in data coordinates.
+
+        Note:
+            the matplotlib text is never modified.
         """
-
-        # TODO: The code below gets repeated a lot over the different shapes.
-        #       Create a method in the Object class that extrapolates the
-        #       x and y values.
-
-        # Get slidesize from matplotlib figure
-        slidesize = (mpl_text.figure.get_figwidth(), mpl_text.figure.get_figheight())
-        f = cls._mpl_shrink_factor
-
-        # Get plotting area
-        slide_x0, slide_x1, slide_y1, slide_y0 = get_plotting_area(mpl_text.figure)
+        if context is None:
+            context = ConversionContext.from_axes(mpl_text.axes)
+        if xy is None:
+            xy = (mpl_text._x, mpl_text._y)
+        if text is None:
+            text = mpl_text._text
+        elif text != mpl_text._text:
+            # measure the given text on a (detached) shallow copy of the matplotlib text
+            mpl_text = copy.copy(mpl_text)
+            mpl_text._text = text
 
         # Translate text location data to locations on slide
-        plot_x0, plot_x1 = mpl_text.axes.get_xlim()
-        plot_y0, plot_y1 = mpl_text.axes.get_ylim()
-
-        x = interp1d(
-            [plot_x0, plot_x1], [slide_x0, slide_x1], fill_value="extrapolate"
-        )(mpl_text._x)
-        y = interp1d(
-            [plot_y0, plot_y1], [slide_y0, slide_y1], fill_value="extrapolate"
-        )(mpl_text._y)
+        (x,), (y,) = context.transform([xy], transform)
 
         # HACK: If an object is partly outside the plotting area, we map the values outside to the
         # margin area (over which the (white?) rectangles of the Canvas will later be drawn)
@@ -133,7 +133,7 @@ class Text(Object):
 
         # Create Textbox
         text = cls(
-            text=mpl_text._text,
+            text=text,
             x=x,
             y=y,
             cx=abs(cx),
@@ -143,14 +143,17 @@ class Text(Object):
             color=mpl_text.get_color(),
             ha=mpl_text._horizontalalignment,
             va=mpl_text._verticalalignment,
-            slidesize=slidesize,
+            slidesize=context.slidesize,
         )
 
         return text
 
-    def xml(self):
+    def xml(self, compact=False):
         """ Get xml representation of the text 
         
+        Args:
+            compact=False: the compact output mode (see Object.xml)
+
         Returns:
             xml: str: the xml representation of the text
         """
@@ -166,7 +169,8 @@ class Text(Object):
             cy = self.size + 2
 
         # Return xml representation
-        xml = self._xml.format(
+        template = self._xml.compact if compact else self._xml
+        xml = template.render(
             text=self.text,
             size=int(self.size * 100),
             color=color2hex(self.color),
@@ -0,0 +1,204 @@
+""" Timings and counters of an export """
+
+
+#############
+## Imports ##
+#############
+
+import threading
+from time import perf_counter
+from contextlib import nullcontext
+from contextlib import contextmanager
+
+
+###########
+## Stats ##
+###########
+
+
+class Stats(object):
+    """ Statistics of an export, filled in while the export runs
+
+    Pass a Stats object as the `stats` argument of savefig (or fig2group, Object.save,
+    Presentation.save and Package.save) to collect:
+
+    Attributes:
+        stages: dict: the (total) duration in seconds of each stage of the export
+            ("layout", "findobj", "lines", "text", "canvas", "xml", "package", ...)
+        shapes: dict: the number of converted shapes by type
+        vertices: int: the total number of vertices of the custom geometries
+            (lines, polygons and markers)
+        dropped: int: the total number of vertices dropped by decimation
+        parts: dict: the size and compressed size in bytes of each part of the package
+        media: dict: the time in seconds it took to encode each media part
+
+    Args:
+        tracer=None: a function taking a stage name and returning a context manager that
+            wraps the stage (like `start_as_current_span` of an OpenTelemetry tracer).
+            The stages are traced as they run; the "xml" stage, which is generated
+            lazily while the package is compressed, is only timed.
+    """
+
+    def __init__(self, tracer=None):
+        self.tracer = tracer
+        self.stages = {}
+        self.shapes = {}
+        self.vertices = 0
+        self.dropped = 0
+        self.parts = {}
+        self.media = {}
+        self._lock = threading.Lock()  # stages can be timed from several threads
+
+    def add_time(self, name, duration):
+        """ Add a duration to the total duration of a stage
+
+        Args:
+            name: str: the name of the stage
+            duration: float: the duration in seconds
+        """
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + duration
+
+    @contextmanager
+    def stage(self, name):
+        """ Time (and trace) a stage of the export
+
+        Args:
+            name: str: the name of the stage. The durations of stages with the same
+                name are added together.
+        """
+        start = perf_counter()
+        try:
+            if self.tracer is None:
+                yield
+            else:
+                with self.tracer(name):
+                    yield
+        finally:
+            self.add_time(name, perf_counter() - start)
+
+    def timed(self, iterable, name):
+        """ Time the production of the items of a lazy iterable as a stage
+
+        Args:
+            iterable: the iterable to time
+            name: str: the name of the stage
+
+        Yields:
+            item: the items of the iterable
+        """
+        iterator = iter(iterable)
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(name, perf_counter() - start)
+                return
+            self.add_time(name, perf_counter() - start)
+            yield item
+
+    def part(self, name, size, compressed):
+        """ Record the size of a part of the package
+
+        Args:
+            name: str: the name of the part in the package
+            size: int: the size of the part in bytes
+            compressed: int: the compressed size of the part in bytes
+        """
+        self.parts[name] = (size, compressed)
+
+    def count(self, obj):
+        """ Count the shapes, the vertices and the media of an mplppt object
+
+        Args:
+            obj: the mplppt object (or group) to count
+        """
+        from .shapes import Line
+        from .shapes import Image
+        from .shapes import Cached
+        from .shapes.collection import Collection
+        from .shapes.collection import MarkerCollection
+
+        if isinstance(obj, Cached):
+            obj = obj.obj
+        if hasattr(obj, "objects"):
+            for child in obj.objects:
+                self.count(child)
+            return
+
+        kind = type(obj).__name__
+        number = 1
+        if isinstance(obj, Collection):
+            kind = kind.replace("Collection", "") or kind
+            number = len(obj)
+        self.shapes[kind] = self.shapes.get(kind, 0) + number
+
+        if isinstance(obj, Line):
+            self.vertices += len(obj.shape)
+            self.dropped += obj.dropped
+        elif isinstance(obj, MarkerCollection) and len(obj):
+            sizes = [sum(len(polygon) for polygon in marker) for marker in obj.markers]
+            self.vertices += sum(sizes[int(marker)] for marker in obj.marker)
+        elif isinstance(obj, Image):
+            self.media[obj.target] = self.media.get(obj.target, 0.0) + obj.encode_time
+
+    def as_dict(self):
+        """ The statistics as a (json serializable) dictionary
+
+        Returns:
+            stats: dict: the statistics
+        """
+        return {
+            "stages": dict(self.stages),
+            "shapes": dict(self.shapes),
+            "vertices": self.vertices,
+            "dropped": self.dropped,
+            "parts": {name: list(sizes) for name, sizes in self.parts.items()},
+            "media": dict(self.media),
+        }
+
+    def __str__(self):
+        lines = ["stages:"]
+        lines += ["  %-20s %10.2fms" % (k, 1000 * v) for k, v in self.stages.items()]
+        lines += ["shapes:"]
+        lines += ["  %-20s %10i" % (k, v) for k, v in self.shapes.items()]
+        lines += ["vertices: %i (%i dropped)" % (self.vertices, self.dropped)]
+        size = sum(size for size, _ in self.parts.values())
+        compressed = sum(compressed for _, compressed in self.parts.values())
+        lines += [
+            "parts: %i (%i bytes, %i compressed)" % (len(self.parts), size, compressed)
+        ]
+        lines += [
+            "media: %i (%.2fms encoding)"
+            % (len(self.media), 1000 * sum(self.media.values()))
+        ]
+        return "\n".join(lines)
+
+
+class _NoStats(Stats):
+    """ Stats that are not collected (the default), with the least possible overhead """
+
+    def __init__(self):
+        Stats.__init__(self)
+
+    def add_time(self, name, duration):
+        pass
+
+    def stage(self, name):
+        return _NOSTAGE
+
+    def timed(self, iterable, name):
+        return iterable
+
+    def part(self, name, size, compressed):
+        pass
+
+    def count(self, obj):
+        pass
+
+
+_NOSTAGE = nullcontext()
+
+# the stats used when no stats are collected
+NOSTATS = _NoStats()
@@ -1,25 +1,68 @@
+""" The xml templates of the shapes and the pptx template of new presentations """
+
 #############
 ## Imports ##
 #############
 
-import os
-from ..utils import chdir, get_content
+from .template import Template
+from .template import escape_xml
+
+try:  # Python >= 3.9
+    from importlib.resources import files
+except ImportError:  # the templates are plain files next to this module
+    from pathlib import Path
+
+    def files(package):
+        return Path(__file__).parent
 
 
 ###############
 ## Constants ##
 ###############
 
-TEMPLATESPATH = __file__.replace("__init__.pyc", "").replace("__init__.py", "")
-PPTXPATH = os.path.join(TEMPLATESPATH, "pptx")
+# the folder with the templates as a Traversable resource, which is independent of
+# the working directory and also works when the package is not unpacked on disk.
+TEMPLATES = files(__name__)
+PPTX = TEMPLATES.joinpath("pptx")
+
+
+###############
+## Functions ##
+###############
+
+
+def iterresources(folder, prefix=""):
+    """ Iterate over all the files in a resource folder (recursively)
+
+    The files in a folder are yielded (in sorted order) before the files in its
+    subfolders, like os.walk would.
+
+    Args:
+        folder: Traversable: the resource folder to iterate over
+        prefix="": the prefix to add to the (forward slash separated) names
+
+    Yields:
+        name: str: the name of the file relative to the folder
+        content: bytes: the content of the file
+    """
+    entries = sorted(folder.iterdir(), key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_file():
+            yield prefix + entry.name, entry.read_bytes()
+    for entry in entries:
+        if entry.is_dir():
+            yield from iterresources(entry, prefix + entry.name + "/")
 
 
 ###################
 ## XML Templates ##
 ###################
 
-with chdir(TEMPLATESPATH):
-    LINE = get_content("line.xml")
-    TEXT = get_content("text.xml")
-    RECTANGLE = get_content("rectangle.xml")
-    IMAGE = get_content("image.xml")
+# the templates are compiled only once (see Template)
+LINE = Template(TEMPLATES.joinpath("line.xml").read_text())
+TEXT = Template(TEMPLATES.joinpath("text.xml").read_text())
+RECTANGLE = Template(TEMPLATES.joinpath("rectangle.xml").read_text())
+IMAGE = Template(TEMPLATES.joinpath("image.xml").read_text())
+
+# a text box is a rectangle with a text body
+TEXTBOX = RECTANGLE.replace("</p:sp>", "\n" + TEXT.source + "\n</p:sp>\n")
@@ -0,0 +1,195 @@
+""" Precompiled xml templates """
+
+#############
+## Imports ##
+#############
+
+import re
+from string import Formatter
+from itertools import chain
+from itertools import repeat
+
+
+###############
+## Constants ##
+###############
+
+# fields that contain user text and are escaped while rendering
+ESCAPED = ("name", "text", "font")
+
+# entities to escape in user text ("&" first, to not escape the other entities again)
+ENTITIES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"))
+
+# comments and whitespace between tags, stripped from the compact templates
+COMMENT = re.compile(r"<!--.*?-->", re.S)
+WHITESPACE = re.compile(r"(?<=>)\s+|\s+(?=<)")
+
+# empty elements that are equivalent to leaving them out, dropped from the compact
+# templates. Attributes are kept: they can only be dropped if their value equals the
+# default of the schema (dirty="0" is kept, the default of dirty is true).
+DEFAULTS = ("<a:extLst/>", "<a:avLst/>")
+
+# elements left empty after dropping the defaults, collapsed to self-closing tags
+EMPTY = re.compile(r"<([\w:]+)([^<>/]*)></\1>")
+
+
+###############
+## Functions ##
+###############
+
+
+def escape_xml(text):
+    """ Escape user text to insert into xml (as content or as attribute value)
+
+    Args:
+        text: str: the text to escape
+
+    Returns:
+        text: str: the escaped text
+    """
+    text = str(text)
+    for char, entity in ENTITIES:
+        text = text.replace(char, entity)
+    return text
+
+
+def minify(source):
+    """ Strip comments, whitespace between tags and redundant elements from an xml template
+
+    Args:
+        source: str: the xml template
+
+    Returns:
+        source: str: the minified xml template
+    """
+    source = WHITESPACE.sub("", COMMENT.sub("", source))
+    for default in DEFAULTS:
+        source = source.replace(default, "")
+    return EMPTY.sub(r"<\1\2/>", source).strip()
+
+
+##############
+## Template ##
+##############
+
+
+class Template(object):
+    """ An xml template compiled into a list of literal fragments and fields
+
+    The template is parsed only once (at import), after which rendering is a join
+    over the pre-split fragments. The fields containing user text (see ESCAPED) are
+    escaped while rendering.
+
+    Each template also has a compact variant (see Template.compact), which is compiled
+    (only once) on first use.
+    """
+
+    __slots__ = ("source", "fragments", "fields", "_format", "_compact")
+
+    def __init__(self, source):
+        """ Compile an xml template
+
+        Args:
+            source: str: the template with {field} placeholders
+        """
+        self.source = source
+        self.fragments = []
+        self.fields = []
+        for literal, field, _, _ in Formatter().parse(source):
+            self.fragments.append(literal)
+            if field is not None:
+                self.fields.append(field)
+        if len(self.fragments) == len(self.fields):
+            self.fragments.append("")
+        # the template as printf-style format string to render many shapes at once
+        self._format = "%s".join(
+            fragment.replace("%", "%%") for fragment in self.fragments
+        )
+        self._compact = None
+
+    @property
+    def compact(self):
+        """ The minified variant of the template (see minify) """
+        if self._compact is None:
+            source = minify(self.source)
+            self._compact = self if source == self.source else Template(source)
+        return self._compact
+
+    def _values(self, values):
+        """ the values of the fields (in order of the fields), escaped where necessary """
+        return [
+            escape_xml(values[field]) if field in ESCAPED else values[field]
+            for field in self.fields
+        ]
+
+    def render(self, **values):
+        """ Render the template
+
+        Args:
+            **values: the value for each field of the template
+
+        Returns:
+            xml: str: the rendered template
+        """
+        return self._format % tuple(self._values(values))
+
+    def iterrender(self, **values):
+        """ Render the template in chunks
+
+        Args:
+            **values: the value for each field of the template. Values that are not
+                strings or numbers are assumed to be iterables of xml chunks, which
+                are streamed into the rendered template (unescaped).
+
+        Yields:
+            xml: str: consecutive chunks of the rendered template
+        """
+        for fragment, field in zip(self.fragments, self.fields):
+            yield fragment
+            value = values[field]
+            if isinstance(value, str) or not hasattr(value, "__iter__"):
+                yield escape_xml(value) if field in ESCAPED else str(value)
+            else:
+                yield from value
+        yield self.fragments[-1]
+
+    def render_many(self, n, **values):
+        """ Render the template for many shapes at once
+
+        Args:
+            n: int: the number of shapes to render
+            **values: the values for each field of the template: a single value
+                (shared by all shapes) or a sequence of n values.
+
+        Returns:
+            xml: str: the rendered template for all n shapes
+        """
+        if n == 0:
+            return ""
+        columns = []
+        for field in self.fields:
+            value = values[field]
+            if isinstance(value, str) or not hasattr(value, "__len__"):
+                if field in ESCAPED:
+                    value = escape_xml(value)
+                columns.append(repeat(value, n))
+            else:
+                value = value.tolist() if hasattr(value, "tolist") else value
+                if field in ESCAPED:
+                    value = [escape_xml(v) for v in value]
+                columns.append(value)
+        return (self._format * n) % tuple(chain.from_iterable(zip(*columns)))
+
+    def replace(self, old, new):
+        """ Create a new template by replacing a part of the source of this template
+
+        Args:
+            old: str: the part of the template to replace
+            new: str|Template: the replacement
+
+        Returns:
+            template: Template: the new template
+        """
+        if isinstance(new, Template):
+            new = new.source
+        return Template(self.source.replace(old, new))
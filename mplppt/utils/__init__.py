@@ -1,12 +1,51 @@
-""" Utilities for mplppt """
+""" Utilities for mplppt
+
+The utilities that depend on numpy or matplotlib are only imported when one of them
+is accessed (PEP 562), such that the file conversions (see convert) stay cheap.
+"""
 
 
 #############
 ## Imports ##
 #############
 
-from .mpl import *
+from importlib import import_module
+
 from .colors import *
+from .compression import *
 from .strings import *
 from .constants import *
 from .contextmanagers import *
+
+
+###############
+## Constants ##
+###############
+
+# submodules imported on first access of one of their names
+_LAZY_SUBMODULES = ("mpl", "images", "paths", "decimation")
+
+
+###############
+## Functions ##
+###############
+
+
+def __getattr__(name):
+    """ Import the utilities that depend on numpy or matplotlib on first access
+
+    Args:
+        name: str: the name of the utility (or submodule) to get
+
+    Returns:
+        value: the utility (or submodule)
+    """
+    if name in _LAZY_SUBMODULES:
+        return import_module("." + name, __name__)
+    if not name.startswith("_"):
+        for submodule in _LAZY_SUBMODULES:
+            module = import_module("." + submodule, __name__)
+            if hasattr(module, name):
+                value = globals()[name] = getattr(module, name)
+                return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
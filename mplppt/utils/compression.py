@@ -0,0 +1,252 @@
+""" compression policy for the parts of a zip (pptx) archive """
+
+#############
+## Imports ##
+#############
+
+import os
+import sys
+import time
+import zlib
+import zipfile
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# the names exported by `from .compression import *` (see mplppt.utils)
+__all__ = [
+    "COMPRESSION_PRESETS",
+    "COMPRESSED_EXTENSIONS",
+    "Member",
+    "compression_level",
+    "part_compression",
+    "compress_part",
+    "can_write_members",
+    "write_member",
+    "write_streamed",
+    "write_parts",
+]
+
+
+###############
+## Constants ##
+###############
+
+# compression presets: the deflate level of the xml parts (None: store uncompressed)
+COMPRESSION_PRESETS = {"stored": None, "fast": 1, "small": 9}
+
+# parts with these extensions are already compressed and are stored as is
+COMPRESSED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".zip")
+
+# size of the buffers that are fed to the compressor when a part is streamed
+BUFFERSIZE = 1 << 16
+
+# a compressed part of a zip archive, ready to be appended to the archive
+Member = namedtuple("Member", ["name", "data", "crc", "size", "compress_type"])
+
+# zipfile has no public api to append precompressed data. write_member relies on
+# these internals of ZipFile, which are present in CPython 3.6 up to 3.13.
+# On other versions and implementations, the parts are compressed and written by
+# ZipFile itself, in a single thread (see write_parts).
+ZIPFILE_INTERNALS = ("_lock", "_writecheck", "_didModify", "start_dir")
+ZIPFILE_VERSIONS = ((3, 6), (3, 14))
+
+
+###########################
+## Compression Functions ##
+###########################
+
+
+def compression_level(compression="fast"):
+    """ Get the deflate level for a compression policy
+
+    Args:
+        compression="fast": a compression preset ("stored", "fast" or "small"),
+            a deflate level between 0 and 9 or None (store uncompressed).
+
+    Returns:
+        level: int|None: the deflate level (None: store uncompressed)
+    """
+    if compression is None:
+        return None
+    if isinstance(compression, str):
+        if compression not in COMPRESSION_PRESETS:
+            raise ValueError(
+                "invalid compression %r (choose from %s)"
+                % (compression, ", ".join(COMPRESSION_PRESETS))
+            )
+        return COMPRESSION_PRESETS[compression]
+    if not 0 <= compression <= 9:
+        raise ValueError("invalid compression level %r (choose from 0-9)" % compression)
+    return int(compression)
+
+
+def part_compression(name, level):
+    """ Get the compression of a part in a zip archive
+
+    xml (and other) parts are deflated, parts that are already compressed (like
+    png and jpeg images) are stored as is.
+
+    Args:
+        name: str: the name of the part in the archive
+        level: int|None: the deflate level (see compression_level)
+
+    Returns:
+        compress_type: the zipfile compression constant for the part
+        compresslevel: int|None: the deflate level for the part
+    """
+    if level is None or os.path.splitext(name)[-1].lower() in COMPRESSED_EXTENSIONS:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, level
+
+
+def compress_part(name, content, level):
+    """ Compress a part of a zip archive in memory
+
+    zlib releases the GIL while compressing, such that many parts can be compressed
+    in parallel on a pool of threads.
+
+    Args:
+        name: str: the name of the part in the archive
+        content: bytes: the content of the part
+        level: int|None: the deflate level (see compression_level)
+
+    Returns:
+        member: Member: the compressed part
+    """
+    compress_type, compresslevel = part_compression(name, level)
+    data = content
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+        data = compressor.compress(content) + compressor.flush()
+    return Member(name, data, zlib.crc32(content), len(content), compress_type)
+
+
+def can_write_members(zf):
+    """ Check if precompressed parts can be appended to a zip archive
+
+    Args:
+        zf: ZipFile: the zip archive (opened for writing)
+
+    Returns:
+        supported: bool: wether write_member supports this python version and archive
+    """
+    return (
+        sys.implementation.name == "cpython"
+        and ZIPFILE_VERSIONS[0] <= sys.version_info[:2] < ZIPFILE_VERSIONS[1]
+        and all(hasattr(zf, attr) for attr in ZIPFILE_INTERNALS)
+        and hasattr(zipfile.ZipInfo, "FileHeader")
+    )
+
+
+def write_member(zf, member, date_time):
+    """ Append an already compressed part to a zip archive
+
+    This relies on the internals of ZipFile (see can_write_members).
+
+    Args:
+        zf: ZipFile: the zip archive (opened for writing) to append the part to
+        member: Member: the compressed part (see compress_part)
+        date_time: tuple: the modification time of the part (year, month, day,
+            hour, minute, second)
+
+    Returns:
+        zinfo: ZipInfo: the info of the part in the archive
+    """
+    zinfo = zipfile.ZipInfo(member.name, date_time=date_time)
+    zinfo.external_attr = 0o600 << 16
+    zinfo.compress_type = member.compress_type
+    zinfo.CRC = member.crc
+    zinfo.file_size = member.size
+    zinfo.compress_size = len(member.data)
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    # the bookkeeping below mirrors what ZipFile.writestr does after compressing the
+    # data itself.
+    with zf._lock:
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(member.data)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+    return zinfo
+
+
+def write_streamed(zf, name, content):
+    """ Write a streamed part to a zip archive, chunk by chunk
+
+    The part is never held in memory completely: the chunks are collected in buffers
+    of BUFFERSIZE bytes, which are compressed (with the default compression of the
+    archive) and written as soon as they are full.
+
+    Args:
+        zf: ZipFile: the zip archive (opened for writing) to write the part to
+        name: str: the name of the part in the archive
+        content: iterable: the bytes chunks of the part
+
+    Returns:
+        zinfo: ZipInfo: the info of the part in the archive
+    """
+    with zf.open(name, "w", force_zip64=True) as file:
+        buffer, buffersize = [], 0
+        for chunk in content:
+            buffer.append(chunk)
+            buffersize += len(chunk)
+            if buffersize >= BUFFERSIZE:
+                file.write(b"".join(buffer))
+                buffer, buffersize = [], 0
+        file.write(b"".join(buffer))
+    return zf.getinfo(name)
+
+
+def write_parts(zf, parts, level, max_workers=None):
+    """ Write the parts of a zip archive
+
+    If supported (see can_write_members), the parts held in memory (bytes) are
+    compressed in parallel on a pool of threads and appended to the archive in order.
+    At most a few of them per thread are held in memory at any time. Otherwise (or if
+    the parts are stored or max_workers is 1) they are written one by one with the
+    public api of ZipFile. The streamed parts (iterables of bytes chunks, like the
+    slides) are always written as they are produced, in order (see write_streamed),
+    such that they are never held in memory completely.
+
+    Args:
+        zf: ZipFile: the zip archive (opened for writing) to write the parts to
+        parts: iterable: the (name, content) pairs of the parts. The content is bytes
+            or an iterable of bytes chunks.
+        level: int|None: the deflate level (see compression_level)
+        max_workers=None: the number of compression threads. If None, the number of
+            processors on the machine is used.
+
+    Yields:
+        zinfo: ZipInfo: the info of each part in the archive, after it was written
+    """
+    if level is not None and max_workers != 1 and can_write_members(zf):
+        date_time = time.localtime(time.time())[:6]
+        max_workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque()
+            for name, content in parts:
+                if not isinstance(content, bytes):
+                    # the parts before the streamed part are written first
+                    while futures:
+                        yield write_member(zf, futures.popleft().result(), date_time)
+                    yield write_streamed(zf, name, content)
+                    continue
+                futures.append(executor.submit(compress_part, name, content, level))
+                if len(futures) > 2 * max_workers:
+                    yield write_member(zf, futures.popleft().result(), date_time)
+            while futures:
+                yield write_member(zf, futures.popleft().result(), date_time)
+        return
+    for name, content in parts:
+        if isinstance(content, bytes):
+            compress_type, compresslevel = part_compression(name, level)
+            zf.writestr(
+                name, content, compress_type=compress_type, compresslevel=compresslevel
+            )
+            yield zf.getinfo(name)
+        else:
+            yield write_streamed(zf, name, content)
@@ -6,10 +6,9 @@
 
 import os
 import shutil
+import tempfile
 from contextlib import contextmanager
 
-from .strings import random_name
-
 
 ######################
 ## Context Managers ##
@@ -21,6 +20,9 @@ def chdir(path):
     """ Handy working directory changing context manager that returns to
     original folder if something goes wrong
 
+    NOTE: the working directory is shared by all threads of the process. The export
+    functions of mplppt work with explicit paths and never change it.
+
     Args:
         path: str: path of folder to cd into
     """
@@ -37,14 +39,16 @@ def tempdir(source=None):
     """ Creates a temporary folder (empty if no source provided).
     The folder gets automatically removed if something goes wrong.
 
+    The folder is created in the temporary directory of the system (not in the
+    current working directory) and has a unique name, such that temporary folders
+    of concurrent exports never collide.
+
     Args:
         source: the source folder to copy into the temporary folder
     """
-    dirname = random_name()
-    if source is None:
-        os.mkdir(dirname)
-    else:
-        shutil.copytree(source, dirname)
+    dirname = tempfile.mkdtemp(prefix="mplppt_")
+    if source is not None:
+        shutil.copytree(source, dirname, dirs_exist_ok=True)
     try:
         yield dirname
     finally:
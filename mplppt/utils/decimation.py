@@ -0,0 +1,168 @@
+""" Resolution-aware polyline decimation """
+
+
+#############
+## Imports ##
+#############
+
+import numpy as np
+
+from .paths import shape2emu
+
+
+###############
+## Constants ##
+###############
+
+DECIMATION_MODES = (None, "lossless", "minmax", "rdp")
+
+
+###############
+## Functions ##
+###############
+
+
+def remove_redundant(shape):
+    """ Find the points of a polyline that change the drawn line after EMU rounding
+
+    Consecutive duplicate points and points lying on a straight segment between their
+    neighbors (in the same direction) are dropped. This is lossless at EMU resolution.
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points
+
+    Returns:
+        idxs: array: the indices of the points to keep
+    """
+    emu = shape2emu(shape)
+    if len(emu) < 3:
+        return np.arange(len(emu))
+
+    # drop consecutive duplicates
+    keep = np.ones(len(emu), dtype=bool)
+    keep[1:] = np.any(emu[1:] != emu[:-1], axis=1)
+    idxs = np.flatnonzero(keep)
+    emu = emu[idxs]
+    if len(emu) < 3:
+        return idxs
+
+    # drop interior points on a straight segment in the same direction
+    d0 = emu[1:-1] - emu[:-2]
+    d1 = emu[2:] - emu[1:-1]
+    cross = d0[:, 0] * d1[:, 1] - d0[:, 1] * d1[:, 0]
+    dot = d0[:, 0] * d1[:, 0] + d0[:, 1] * d1[:, 1]
+    keep = np.ones(len(emu), dtype=bool)
+    keep[1:-1] = (cross != 0) | (dot <= 0)
+    return idxs[keep]
+
+
+def minmax_decimate(shape, tolerance):
+    """ Per-column min/max decimation of a polyline
+
+    The x-axis is divided in columns of width `tolerance`. For every run of consecutive
+    points within the same column only the first, the last, the lowest and the highest
+    point are kept. This preserves the visual envelope of dense time series.
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points
+        tolerance: float: the width of a column in points
+
+    Returns:
+        idxs: array: the indices of the points to keep
+    """
+    n = len(shape)
+    if n < 5 or tolerance <= 0:
+        return np.arange(n)
+    column = np.floor(shape[:, 0] / tolerance).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    ends = np.r_[starts[1:] - 1, n - 1]
+    run = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    order = np.lexsort((shape[:, 1], run))  # sorted by run, then by y
+    lowest = order[starts]
+    highest = order[ends]
+    return np.unique(np.concatenate([starts, ends, lowest, highest]))
+
+
+def douglas_peucker(shape, tolerance):
+    """ Douglas-Peucker decimation of a polyline
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points
+        tolerance: float: the maximum distance (in points) between the original
+            and the decimated polyline
+
+    Returns:
+        idxs: array: the indices of the points to keep
+    """
+    n = len(shape)
+    if n < 3 or tolerance <= 0:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        p0, p1 = shape[i], shape[j]
+        points = shape[i + 1 : j]
+        d = p1 - p0
+        norm = np.hypot(d[0], d[1])
+        if norm == 0:
+            dist = np.hypot(points[:, 0] - p0[0], points[:, 1] - p0[1])
+        else:
+            dist = np.abs(d[0] * (points[:, 1] - p0[1]) - d[1] * (points[:, 0] - p0[0]))
+            dist = dist / norm
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            k = i + 1 + k
+            keep[k] = True
+            stack.append((i, k))
+            stack.append((k, j))
+    return np.flatnonzero(keep)
+
+
+def decimate(shape, mode="lossless", tolerance=1.0):
+    """ Decimate a polyline
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points
+        mode: str: the decimation mode:
+            None: no decimation
+            "lossless": drop duplicate and collinear points after EMU rounding
+            "minmax": per-column min/max decimation (lossy)
+            "rdp": Douglas-Peucker decimation (lossy)
+        tolerance: float: the tolerance (in points) for the lossy decimation modes
+
+    Returns:
+        shape: array: the decimated shape
+        dropped: int: the number of points that were dropped
+
+    Note:
+        non-finite points (like NaN) break the polyline, as in matplotlib. They are
+        kept and the finite runs between them are decimated separately.
+    """
+    if mode not in DECIMATION_MODES:
+        raise ValueError(
+            "invalid decimation mode %r. Choose from %s" % (mode, DECIMATION_MODES)
+        )
+    shape = np.asarray(shape, dtype=float)
+    n = len(shape)
+    if mode is None:
+        return shape, 0
+    finite = np.isfinite(shape).all(axis=1)
+    if not finite.all():
+        parts = []
+        for run in np.split(np.arange(n), np.flatnonzero(np.diff(finite)) + 1):
+            part = shape[run]
+            if finite[run[0]]:
+                part, _ = decimate(part, mode, tolerance)
+            parts.append(part)
+        shape = np.concatenate(parts)
+        return shape, n - len(shape)
+    if mode == "minmax":
+        shape = shape[minmax_decimate(shape, tolerance)]
+    elif mode == "rdp":
+        shape = shape[douglas_peucker(shape, tolerance)]
+    shape = shape[remove_redundant(shape)]
+    return shape, n - len(shape)
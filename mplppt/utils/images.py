@@ -0,0 +1,50 @@
+""" image encoding """
+
+#############
+## Imports ##
+#############
+
+import io
+import hashlib
+
+
+#####################
+## Image Functions ##
+#####################
+
+
+def encode_image(array, format="png"):
+    """ Encode an image array in memory
+
+    Args:
+        array: array: the image to encode. An RGB(A) array of uint8 values is encoded
+            as is, other arrays are handled like matplotlib.image.imsave does.
+        format="png": the image format to encode the image in
+
+    Returns:
+        data: bytes: the encoded image
+    """
+    import numpy as np
+    from matplotlib.image import imsave
+
+    buffer = io.BytesIO()
+    imsave(buffer, np.asarray(array), format=format)
+    return buffer.getvalue()
+
+
+def media_target(data, extension="png"):
+    """ Get the filename of an encoded image inside the pptx package
+
+    The filename is derived from a hash of the content of the image, such that
+    identical images share a single media part in the package.
+
+    Args:
+        data: bytes: the encoded image
+        extension="png": the file extension of the image
+
+    Returns:
+        target: str: the filename of the image inside the package
+    """
+    return (
+        "image_" + hashlib.blake2b(data, digest_size=16).hexdigest() + "." + extension
+    )
@@ -5,19 +5,26 @@
 ## Imports ##
 #############
 
-import os
+import weakref
+import threading
+from collections import namedtuple
 import numpy as np
 import matplotlib as mpl
-import matplotlib.pyplot as plt
-
-from .strings import random_name
 
 
 ###############
 ## CONSTANTS ##
 ###############
 
-visualized = {}
+# plotting areas of the figures that were already laid out. The figures are weakly
+# referenced, such that exported figures can still be garbage collected.
+_plotting_areas = weakref.WeakKeyDictionary()
+
+# locks that serialize the operations that (temporarily) change the state of a figure
+# (laying it out and rendering it at another resolution), per figure. This allows
+# different figures to be exported concurrently from several threads.
+_figure_locks = weakref.WeakKeyDictionary()
+_figure_locks_lock = threading.Lock()
 
 
 ###############
@@ -25,27 +32,299 @@ visualized = {}
 ###############
 
 
+def figure_lock(fig):
+    """ get the lock that serializes the operations changing the state of a figure
+
+    Args:
+        fig: matplotlib figure to get the lock for
+
+    Returns:
+        lock: threading.RLock: the (reentrant) lock of the figure
+    """
+    with _figure_locks_lock:
+        lock = _figure_locks.get(fig)
+        if lock is None:
+            lock = _figure_locks[fig] = threading.RLock()
+        return lock
+
+
+def layout(fig):
+    """ lay out a matplotlib figure without rendering it to a file
+
+    Args:
+        fig: matplotlib figure to lay out
+    """
+    try:
+        # layout-only pass (matplotlib >= 3.6)
+        fig.draw_without_rendering()
+    except AttributeError:
+        # in-memory draw on the figure's own canvas
+        fig.canvas.draw()
+
+
 def get_plotting_area(fig):
     """ get area which is visualized by matplotlib
 
     Args:
         fig: matplotlib figure to find the area for
-    
+
     Returns:
         xmin, xmax, ymin, ymax: the bounds of the matplotlib figure
     """
-    global visualized
-    if fig not in visualized:
-        # HACK: To get info about spine locations, the axis needs to be visualized first.
-        # We choose png export:
-        fn = random_name() + ".png"
-        plt.savefig(fn)
-        os.remove(fn)
-        visualized[fig] = True
-    spines = plt.findobj(fig, mpl.spines.Spine)
-    bboxes = [np.array(spine.get_extents()) for spine in spines]
-    xmin = np.min([np.min(bbox[:, 0]) for bbox in bboxes])
-    xmax = np.max([np.max(bbox[:, 0]) for bbox in bboxes])
-    ymin = np.min([np.min(bbox[:, 1]) for bbox in bboxes])
-    ymax = np.max([np.max(bbox[:, 1]) for bbox in bboxes])
-    return xmin, xmax, ymin, ymax
+    with figure_lock(fig):
+        area = _plotting_areas.get(fig)
+        if area is None or fig.stale:
+            # To get info about spine locations, the axis needs to be laid out first.
+            layout(fig)
+            spines = fig.findobj(mpl.spines.Spine)
+            bboxes = [np.array(spine.get_extents()) for spine in spines]
+            xmin = np.min([np.min(bbox[:, 0]) for bbox in bboxes])
+            xmax = np.max([np.max(bbox[:, 0]) for bbox in bboxes])
+            ymin = np.min([np.min(bbox[:, 1]) for bbox in bboxes])
+            ymax = np.max([np.max(bbox[:, 1]) for bbox in bboxes])
+            area = _plotting_areas[fig] = (xmin, xmax, ymin, ymax)
+        return area
+
+
+def rasterize(artists, area, dpi=None):
+    """ render matplotlib artists off-screen into an image of the plotting area
+
+    Args:
+        artists: the matplotlib artists (of the same figure) to render
+        area: xmin, xmax, ymin, ymax: the plotting area (see get_plotting_area)
+        dpi=None: the resolution to render the artists at. If None, the resolution
+            of the figure is used.
+
+    Returns:
+        image: array: the rendered plotting area as an RGBA array (uint8)
+    """
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    fig = artists[0].figure
+    with figure_lock(fig):
+        olddpi, stale = fig.dpi, fig.stale
+        scale = 1.0 if dpi is None else dpi / olddpi
+        try:
+            fig.dpi = olddpi * scale
+            width, height = (int(np.ceil(s)) for s in fig.bbox.size)
+            renderer = RendererAgg(width, height, fig.dpi)
+            for artist in sorted(artists, key=lambda artist: artist.get_zorder()):
+                artist.draw(renderer)
+            image = np.array(renderer.buffer_rgba())
+        finally:
+            fig.dpi = olddpi
+            fig.stale = stale  # the layout of the figure did not change
+
+    xmin, xmax, ymin, ymax = (int(round(a * scale)) for a in area)
+    # display coordinates run bottom to top, image rows top to bottom.
+    return image[height - ymax : height - ymin, xmin:xmax]
+
+
+def count_vertices(artist):
+    """ estimate the number of vertices needed to draw a matplotlib artist as vector shapes
+
+    Args:
+        artist: the matplotlib artist to count the vertices for
+
+    Returns:
+        count: int: the (estimated) number of vertices of the artist
+    """
+    if isinstance(artist, mpl.lines.Line2D):
+        return len(artist.get_xydata())
+    if isinstance(artist, mpl.patches.Polygon):
+        return len(artist.get_xy())
+    if isinstance(artist, mpl.patches.Patch):
+        return len(artist.get_path().vertices)
+    if isinstance(artist, mpl.collections.QuadMesh):
+        return artist.get_coordinates()[:-1, :-1].size // 2
+    if isinstance(artist, mpl.collections.Collection):
+        offsets = artist.get_offsets()
+        paths = artist.get_paths()
+        size = max([len(path.vertices) for path in paths], default=0)
+        return size * max(len(offsets), len(paths))
+    if isinstance(artist, mpl.image.AxesImage):
+        return artist.get_array().size
+    return 0
+
+
+def select_rasterized(fig, rasterized):
+    """ select the artists of a figure that should be rasterized in hybrid vector/raster mode
+
+    Only the data artists of the axes (lines, patches, collections and images) can be
+    rasterized. Text, ticks and the canvas always stay vector shapes.
+
+    Args:
+        fig: the matplotlib figure to select the artists in
+        rasterized: which artists to rasterize:
+            None|False: no artists
+            True: the artists for which rasterization was requested in matplotlib
+                (see artist.set_rasterized)
+            int: the artists for which rasterization was requested in matplotlib and
+                after that the artists with the most vertices, until the remaining
+                artists have at most this number of vertices in total (see count_vertices).
+            list: the artists to rasterize (data artists of the axes of the figure)
+
+    Returns:
+        artists: set: the artists to rasterize
+    """
+    if rasterized is None or rasterized is False:
+        return set()
+    if not isinstance(rasterized, (bool, int)):
+        return set(rasterized)
+    artists = [
+        artist
+        for ax in fig.axes
+        for group in (ax.lines, ax.patches, ax.collections, ax.images)
+        for artist in group
+        if artist.get_visible()
+    ]
+    selected = set(artist for artist in artists if artist.get_rasterized())
+    if rasterized is True:
+        return selected
+    budget = rasterized
+    counts = [
+        (count_vertices(a), i) for i, a in enumerate(artists) if a not in selected
+    ]
+    total = sum(count for count, _ in counts)
+    for count, i in sorted(counts, reverse=True):
+        if total <= budget:
+            break
+        selected.add(artists[i])
+        total -= count
+    return selected
+
+
+def get_vertices(artist):
+    """ get the vertices of a matplotlib artist and the transform that maps them to display coordinates
+
+    Args:
+        artist: the matplotlib line, polygon or rectangle to get the vertices for
+
+    Returns:
+        xy: array: Nx2 array of vertices of the artist
+        transform: the matplotlib transform that maps the vertices to display coordinates
+    """
+    if isinstance(artist, mpl.lines.Line2D):
+        return np.asarray(artist.get_xydata(), dtype=float), artist.get_transform()
+    if isinstance(artist, mpl.patches.Rectangle):
+        bbox = artist.get_bbox()
+        xy = np.array([[bbox.x0, bbox.y0], [bbox.x1, bbox.y1]], dtype=float)
+        return xy, artist.get_data_transform()
+    if isinstance(artist, mpl.patches.Polygon):
+        return np.asarray(artist.get_xy(), dtype=float), artist.get_data_transform()
+    raise TypeError("cannot get the vertices of %s" % type(artist).__name__)
+
+
+########################
+## Conversion Context ##
+########################
+
+
+class ConversionContext(
+    namedtuple("ConversionContext", ["slidesize", "area", "xlim", "ylim", "transdata"])
+):
+    """ Immutable description of how an axes maps onto a slide
+
+    A conversion context is computed once per axes and shared by all the objects that
+    are converted from that axes.
+
+    Attributes:
+        slidesize: the size of the slide (in inches)
+        area: xmin, xmax, ymin, ymax: the plotting area on the slide (see get_plotting_area)
+        xlim: the x-limits of the axes
+        ylim: the y-limits of the axes
+        transdata: frozen copy of the transformation from data to display coordinates
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_axes(cls, ax):
+        """ create the conversion context for a matplotlib axes
+
+        Args:
+            ax: the matplotlib axes to create the conversion context for
+
+        Returns:
+            context: the conversion context for the axes
+        """
+        fig = ax.figure
+        slidesize = (fig.get_figwidth(), fig.get_figheight())
+        area = get_plotting_area(fig)
+        return cls(slidesize, area, ax.get_xlim(), ax.get_ylim(), ax.transData.frozen())
+
+    def transform(self, xy, transform=None):
+        """ transform coordinates to slide coordinates
+
+        Args:
+            xy: array: Nx2 array of coordinates
+            transform=None: the matplotlib transform that maps the coordinates to display
+                coordinates. If None, the coordinates are assumed to be data coordinates.
+
+        Returns:
+            x: array: x slide coordinates
+            y: array: y slide coordinates
+        """
+        if transform is None:
+            transform = self.transdata
+        xy = transform.transform(np.asarray(xy, dtype=float).reshape(-1, 2))
+        _, _, ymin, ymax = self.area
+        # display coordinates run bottom to top, slide coordinates top to bottom.
+        return xy[:, 0], (ymin + ymax) - xy[:, 1]
+
+    def transform_artists(self, artists):
+        """ transform the vertices of many artists to slide coordinates at once
+
+        The vertices of all artists sharing the same transform (usually the data
+        transform of the axes) are transformed together in a single vectorized call.
+
+        Args:
+            artists: the matplotlib lines, polygons and rectangles to transform
+
+        Returns:
+            vertices: dict: mapping from artist to its (x, y) slide coordinates
+        """
+        groups = {}
+        for artist in artists:
+            xy, transform = get_vertices(artist)
+            if transform is artist.axes.transData:
+                transform = None
+            group = groups.setdefault(id(transform), (transform, []))
+            group[1].append((artist, xy))
+
+        vertices = {}
+        for transform, group in groups.values():
+            x, y = self.transform(np.concatenate([xy for _, xy in group]), transform)
+            idxs = np.cumsum([len(xy) for _, xy in group])[:-1]
+            for (artist, _), _x, _y in zip(group, np.split(x, idxs), np.split(y, idxs)):
+                vertices[artist] = (_x, _y)
+        return vertices
+
+    def clip(self, x, y):
+        """ map slide coordinates outside the plotting area to the margin area
+        (over which the (white?) rectangles of the Canvas will later be drawn)
+
+        Args:
+            x: array: x slide coordinates (clipped inplace)
+            y: array: y slide coordinates (clipped inplace)
+        """
+        slide_x0, slide_x1, slide_y1, slide_y0 = self.area
+        x[x < 0.5 * slide_x0] = 0.5 * slide_x0
+        x[x > slide_x1 + 0.5 * slide_x0] = slide_x1 + 0.5 * slide_x0
+        y[y < 0.5 * slide_y1] = 0.5 * slide_y1
+        y[y > slide_y0 + 0.5 * slide_y1] = slide_y0 + 0.5 * slide_y1
+
+    def outside(self, x, y):
+        """ check if all given slide coordinates are outside the plotting area
+
+        Args:
+            x: array: x slide coordinates
+            y: array: y slide coordinates
+
+        Returns:
+            outside: bool: True if all coordinates are outside the plotting area.
+                Non-finite coordinates (like NaN) are never inside the plotting area.
+        """
+        slide_x0, slide_x1, slide_y1, slide_y0 = self.area
+        inside = (y >= slide_y1) & (y <= slide_y0) & (x >= slide_x0) & (x <= slide_x1)
+        return not inside.any()
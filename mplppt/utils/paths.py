@@ -0,0 +1,146 @@
+""" Conversion of paths into powerpoint path xml """
+
+
+#############
+## Imports ##
+#############
+
+import numpy as np
+
+from .constants import PIXELSPERPOINT
+
+
+###############
+## Constants ##
+###############
+
+MOVETO = '<a:moveTo><a:pt x="%d" y="%d"/></a:moveTo>\n'
+LNTO = '<a:lnTo><a:pt x="%d" y="%d"/></a:lnTo>\n'
+CLOSE = "<a:close/>\n"
+COMPACT_MOVETO = MOVETO.rstrip("\n")
+COMPACT_LNTO = LNTO.rstrip("\n")
+COMPACT_CLOSE = CLOSE.rstrip("\n")
+CHUNKSIZE = 10000  # number of points per chunk when streaming path xml
+
+
+###############
+## Functions ##
+###############
+
+
+def grid_size(compact=False):
+    """ The size of the grid the path coordinates are expressed in
+
+    Args:
+        compact=False: the compact output mode:
+            False: pretty printed xml with coordinates in EMU
+            True: minified xml with coordinates in EMU
+            int: minified xml with path coordinates rounded to a grid of this
+                number of EMU (a larger grid gives shorter numbers)
+
+    Returns:
+        grid: int: the size of the grid (in EMU)
+    """
+    if compact is False or compact is True or compact is None:
+        return 1
+    grid = int(compact)
+    if grid < 1:
+        raise ValueError(
+            "the compact grid should be a positive number of EMU, got %r" % compact
+        )
+    return grid
+
+
+def shape2emu(shape, grid=1):
+    """ Convert a shape in points to integer EMU coordinates in a single pass
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points. The coordinates
+            should be finite (see iterpath2xml for paths with non-finite points).
+        grid=1: the size of the grid (in EMU) to express the coordinates in
+
+    Returns:
+        shape: array: Nx2 integer array of (x, y) coordinates in EMU (or in grid units)
+    """
+    return (np.asarray(shape, dtype=float) * (PIXELSPERPOINT / grid)).astype(np.int64)
+
+
+def finite_runs(shape):
+    """ Split a shape into the runs of consecutive finite points
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates
+
+    Returns:
+        runs: list: the Mx2 arrays of consecutive finite points of the shape
+    """
+    shape = np.asarray(shape, dtype=float)
+    finite = np.isfinite(shape).all(axis=1)
+    if finite.all():
+        return [shape] if len(shape) else []
+    edges = np.flatnonzero(np.diff(finite)) + 1
+    return [
+        shape[idxs]
+        for idxs in np.split(np.arange(len(shape)), edges)
+        if finite[idxs[0]]
+    ]
+
+
+def path2xml(shape, closed=False, compact=False):
+    """ Get the powerpoint path xml for a shape
+
+    The coordinates are converted to EMU all at once, after which the xml for all
+    points is generated by a single format operation on a preformatted template.
+    This scales linearly with the number of points in the shape.
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points
+        closed=False: wether to close the path or not
+        compact=False: the compact output mode (see grid_size)
+
+    Returns:
+        xml: str: the path xml
+    """
+    return "".join(iterpath2xml(shape, closed, chunksize=None, compact=compact))
+
+
+def iterpath2xml(
+    shape, closed=False, chunksize=CHUNKSIZE, origin=(0, 0), compact=False
+):
+    """ Iterate over the powerpoint path xml for a shape in chunks
+
+    Args:
+        shape: array: Nx2 array of (x, y) coordinates in points
+        closed=False: wether to close the path or not
+        chunksize: int: the (maximum) number of points per chunk.
+            If None, all points are formatted in a single chunk.
+        origin=(0, 0): the (x, y) coordinates (in points) of the origin of the path
+        compact=False: the compact output mode. In compact mode, the points are not
+            separated by newlines and the coordinates are expressed in units of the
+            grid (see grid_size), which should also be used for the width and the
+            height of the path.
+
+    Yields:
+        xml: str: consecutive chunks of the path xml
+
+    Note:
+        non-finite points (like NaN) break the path, as in matplotlib: every run of
+        finite points becomes a subpath starting with a moveTo.
+    """
+    runs = finite_runs(shape)
+    if not runs:
+        return
+    grid = grid_size(compact)
+    moveto, lnto, close = (
+        (COMPACT_MOVETO, COMPACT_LNTO, COMPACT_CLOSE)
+        if compact
+        else (MOVETO, LNTO, CLOSE)
+    )
+    for run in runs:
+        size = len(run) if chunksize is None else chunksize
+        for i in range(0, len(run), size):
+            chunk = shape2emu(run[i : i + size] - origin, grid)
+            fmt = lnto * len(chunk) if i > 0 else moveto + lnto * (len(chunk) - 1)
+            yield fmt % tuple(chunk.ravel().tolist())
+    if closed:
+        yield close
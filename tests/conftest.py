@@ -0,0 +1,54 @@
+""" Shared fixtures of the tests """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import re
+import zipfile
+
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import mplppt
+
+
+##############
+## Fixtures ##
+##############
+
+
+@pytest.fixture
+def figure():
+    """ an empty figure with a single axes (attached to an Agg canvas) """
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    return fig, ax
+
+
+@pytest.fixture
+def export():
+    """ a function exporting a figure into memory and returning the pptx archive """
+
+    def export(fig, **kwargs):
+        buffer = io.BytesIO()
+        mplppt.savefig(buffer, fig=fig, **kwargs)
+        return zipfile.ZipFile(buffer)
+
+    return export
+
+
+@pytest.fixture
+def slide_xml(export):
+    """ a function exporting a figure and returning its slide xml without the
+    (random) names and relationship ids """
+
+    def slide_xml(fig, **kwargs):
+        xml = export(fig, **kwargs).read("ppt/slides/slide1.xml").decode()
+        return re.sub(r'(name|Id|embed)="[^"]*"', "", xml)
+
+    return slide_xml
@@ -0,0 +1,194 @@
+""" Tests of the asyncio-friendly export """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import re
+import asyncio
+import zipfile
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import mplppt
+from mplppt import aio
+
+
+###############
+## Functions ##
+###############
+
+
+def line_figure(i):
+    """ a figure with a long line and a title, different for each i """
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    x = np.linspace(0, 10, 20000)
+    ax.plot(x, np.sin(x + i))
+    ax.set_title("figure %i" % i)
+    return fig
+
+
+def slide_xml(data, n=1):
+    """ the xml of a slide in a pptx file without the (random) names and ids """
+    xml = zipfile.ZipFile(io.BytesIO(data)).read("ppt/slides/slide%i.xml" % n)
+    return re.sub(r'(name|Id|embed)="[^"]*"', "", xml.decode())
+
+
+def serial(fig):
+    """ the pptx file of a figure, exported without asyncio """
+    buffer = io.BytesIO()
+    mplppt.savefig(buffer, fig=fig)
+    return buffer.getvalue()
+
+
+class StreamWriter(object):
+    """ a writer like asyncio.StreamWriter: write is synchronous, drain waits until
+    the (slow) reader is ready for more """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.chunks = []
+        self.drains = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+
+    async def drain(self):
+        self.drains += 1
+        await asyncio.sleep(self.delay)
+
+    def getvalue(self):
+        return b"".join(self.chunks)
+
+
+class AsyncFile(object):
+    """ a writer like an aiofiles file: write is a coroutine """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    async def write(self, data):
+        await asyncio.sleep(0)
+        return self.buffer.write(data)
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+
+###########
+## Tests ##
+###########
+
+
+def test_savefig_async_to_a_buffer():
+    fig = line_figure(0)
+    buffer = io.BytesIO()
+    group = asyncio.run(mplppt.savefig_async(buffer, fig=fig))
+    assert isinstance(group, mplppt.Group)
+    assert slide_xml(buffer.getvalue()) == slide_xml(serial(fig))
+
+
+@pytest.mark.parametrize("writer", [StreamWriter, AsyncFile])
+def test_savefig_async_to_an_async_writer(writer):
+    fig = line_figure(0)
+    writer = writer()
+    assert aio.is_async_writer(writer)
+    asyncio.run(mplppt.savefig_async(writer, fig=fig))
+    assert zipfile.ZipFile(io.BytesIO(writer.getvalue())).testzip() is None
+    assert slide_xml(writer.getvalue()) == slide_xml(serial(fig))
+
+
+def test_stream_writer_is_drained_after_every_chunk():
+    writer = StreamWriter()
+    asyncio.run(mplppt.savefig_async(writer, fig=line_figure(0)))
+    assert writer.drains == len(writer.chunks) > 1
+    assert all(len(chunk) >= aio.BUFFERSIZE for chunk in writer.chunks[:-1])
+
+
+def test_slow_writer_pauses_the_export(monkeypatch):
+    monkeypatch.setattr(aio, "BUFFERSIZE", 1 << 12)
+    monkeypatch.setattr(aio, "QUEUESIZE", 2)
+    put = aio._QueueFile._put
+    produced = []
+
+    def _put(self, chunk):
+        put(self, chunk)
+        produced.append(len(chunk))
+
+    ahead = []  # the number of chunks produced ahead of the writer at each write
+
+    class SlowWriter(StreamWriter):
+        def write(self, data):
+            StreamWriter.write(self, data)
+            ahead.append(len(produced) - len(self.chunks))
+
+    monkeypatch.setattr(aio._QueueFile, "_put", _put)
+    writer = SlowWriter(delay=0.005)
+    asyncio.run(mplppt.savefig_async(writer, fig=line_figure(0)))
+    assert len(writer.chunks) == len(produced) > 2 * aio.QUEUESIZE
+    # the export waits for the writer once the queue is full
+    assert max(ahead) <= aio.QUEUESIZE + 1
+    assert zipfile.ZipFile(io.BytesIO(writer.getvalue())).testzip() is None
+
+
+def test_failing_writer_stops_the_export():
+    class BrokenWriter(StreamWriter):
+        def write(self, data):
+            if self.chunks:
+                raise ConnectionResetError("the client went away")
+            StreamWriter.write(self, data)
+
+    writer = BrokenWriter()
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(mplppt.savefig_async(writer, fig=line_figure(0)))
+    assert len(writer.chunks) == 1
+
+
+def test_concurrent_exports_with_gather():
+    figures = [line_figure(i) for i in range(2 * aio.MAX_WORKERS + 1)]
+    buffers = [io.BytesIO() for _ in figures]
+    writers = [StreamWriter() for _ in figures]
+
+    async def export():
+        await asyncio.gather(
+            *[
+                mplppt.savefig_async(target, fig=fig)
+                for fig, buffer, writer in zip(figures, buffers, writers)
+                for target in (buffer, writer)
+            ]
+        )
+
+    asyncio.run(export())
+    for fig, buffer, writer in zip(figures, buffers, writers):
+        expected = slide_xml(serial(fig))
+        assert slide_xml(buffer.getvalue()) == expected
+        assert slide_xml(writer.getvalue()) == expected
+
+
+def test_presentation_save_async(tmp_path):
+    figures = [line_figure(i) for i in range(3)]
+    presentation = mplppt.Presentation()
+    for fig in figures:
+        presentation.add_slide(fig)
+    writer = StreamWriter()
+    filename = str(tmp_path / "slides.pptx")
+
+    async def save():
+        await asyncio.gather(
+            presentation.save_async(writer), presentation.save_async(filename)
+        )
+
+    asyncio.run(save())
+    with open(filename, "rb") as file:
+        saved = file.read()
+    for n, fig in enumerate(figures, 1):
+        expected = slide_xml(serial(fig))
+        assert slide_xml(writer.getvalue(), n) == expected
+        assert slide_xml(saved, n) == expected
@@ -0,0 +1,105 @@
+""" Tests of the batch conversion of bar charts and histograms """
+
+
+#############
+## Imports ##
+#############
+
+import numpy as np
+import pytest
+
+import mplppt
+from mplppt.shapes import Rectangle
+from mplppt.shapes import RectangleCollection
+from mplppt.utils.mpl import ConversionContext
+
+
+###############
+## Functions ##
+###############
+
+
+def collections(fig):
+    """ the rectangle collections of a converted figure """
+    group = mplppt.fig2group(fig=fig)
+    return [obj for obj in group.objects if isinstance(obj, RectangleCollection)]
+
+
+###########
+## Tests ##
+###########
+
+
+def test_collection_matches_single_rectangles(figure):
+    fig, ax = figure
+    container = ax.bar(
+        [1, 2, 3], [4, -2, 6], color=["C0", "C1", "C0"], edgecolor="k", linewidth=2
+    )
+    ax.set_ylim(-5, 10)
+    fig.canvas.draw()
+    context = ConversionContext.from_axes(ax)
+
+    collection = RectangleCollection.from_mpl(container.patches, context=context)
+    assert len(collection) == 3
+    for i, patch in enumerate(container.patches):
+        rect = Rectangle.from_mpl(patch, context=context)
+        np.testing.assert_allclose(
+            [collection.x[i], collection.y[i], collection.cx[i], collection.cy[i]],
+            [rect.x, rect.y, rect.cx, rect.cy],
+        )
+        assert collection.lw[i] == rect.lw
+        assert collection.palette[collection.ec[i]] == rect.ec
+        assert collection.palette[collection.fc[i]] == rect.fc
+    # the colors are converted once per unique color
+    assert len(collection.palette) == 3
+
+
+def test_bars_are_culled_and_clamped(figure):
+    fig, ax = figure
+    container = ax.bar([1, 2, 3, 5], [5, 5, 20, 5])
+    ax.set_xlim(1.2, 4)
+    ax.set_ylim(0, 10)
+    fig.canvas.draw()
+    context = ConversionContext.from_axes(ax)
+    left, right, top, bottom = context.area
+
+    collection = RectangleCollection.from_mpl(container.patches, context=context)
+    # bar 5 is completely outside, bar 1 partly and bar 3 is too high
+    assert len(collection) == 3
+    # the parts outside the plotting area are clamped to the middle of the margin
+    np.testing.assert_allclose(collection.x[0], 0.5 * left)
+    np.testing.assert_allclose(collection.y[2], 0.5 * top)
+    assert (collection.x + collection.cx).max() <= right
+    assert (collection.y + collection.cy).max() <= bottom
+
+
+def test_invisible_bars_are_skipped(figure):
+    fig, ax = figure
+    container = ax.bar([1, 2, 3], [1, 2, 3])
+    container.patches[1].set_visible(False)
+    fig.canvas.draw()
+    assert len(RectangleCollection.from_mpl(container.patches)) == 2
+    for patch in container.patches:
+        patch.set_visible(False)
+    assert RectangleCollection.from_mpl(container.patches) is None
+
+
+def test_fig2group_converts_one_collection_per_container(figure):
+    fig, ax = figure
+    ax.bar([1, 2, 3], [1, 2, 3])
+    ax.hist(np.random.RandomState(0).randn(1000), bins=20)
+    ax.set_xlim(-5, 5)
+    (bars, hist) = collections(fig)
+    assert (len(bars), len(hist)) == (3, 20)
+    # the bars are not converted one by one
+    names = [obj.name for obj in mplppt.fig2group(fig=fig).objects]
+    assert not [name for name in names if name.startswith("mplrect_")]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_bar_chart_exports(figure, export, compact):
+    fig, ax = figure
+    ax.bar(np.arange(100), np.arange(100) % 7)
+    zf = export(fig, compact=compact)
+    xml = zf.read("ppt/slides/slide1.xml").decode()
+    assert xml.count('name="mplrects_') == 100
@@ -0,0 +1,126 @@
+""" Tests of the cache of converted shapes """
+
+
+#############
+## Imports ##
+#############
+
+import gc
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from mplppt.cache import ShapeCache
+
+
+###############
+## Functions ##
+###############
+
+
+def plot(fig, ax):
+    """ plot a few different artists, return the line and the scatter plot """
+    x = np.linspace(0, 10, 200)
+    (line,) = ax.plot(x, np.sin(x))
+    ax.plot(x, np.cos(x), color="C2")
+    ax.bar([2, 4, 6], [0.5, -0.5, 0.8])
+    scatter = ax.scatter([1, 2, 3], [0.1, 0.2, 0.3])
+    ax.text(5, 0.5, "text")
+    return line, scatter
+
+
+###########
+## Tests ##
+###########
+
+
+def test_unchanged_figure_hits_the_cache(figure, slide_xml):
+    fig, ax = figure
+    plot(fig, ax)
+    cache = ShapeCache()
+    first = slide_xml(fig, cache=cache)
+    misses = cache.misses
+    assert len(cache) > 0 and cache.hits == 0
+    assert slide_xml(fig, cache=cache) == first
+    assert cache.misses == misses and cache.hits > 0
+    assert first == slide_xml(fig)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda line, scatter: line.set_ydata(np.zeros(200)),
+        lambda line, scatter: line.set_color("red"),
+        lambda line, scatter: line.set_linewidth(4),
+        lambda line, scatter: scatter.set_offsets([[1, 0.9], [2, 0.8], [3, 0.7]]),
+        # changed in place, without going through a setter
+        lambda line, scatter: scatter.get_offsets().__setitem__(0, (5, 0.5)),
+    ],
+)
+def test_cached_export_matches_uncached_export_after_a_change(
+    figure, slide_xml, mutate
+):
+    fig, ax = figure
+    line, scatter = plot(fig, ax)
+    cache = ShapeCache()
+    before = slide_xml(fig, cache=cache)
+    mutate(line, scatter)
+    after = slide_xml(fig, cache=cache)
+    assert after != before
+    assert after == slide_xml(fig)
+
+
+def test_changed_limits_invalidate_the_cache(figure, slide_xml):
+    fig, ax = figure
+    plot(fig, ax)
+    cache = ShapeCache()
+    slide_xml(fig, cache=cache)
+    ax.set_xlim(-5, 5)
+    assert slide_xml(fig, cache=cache) == slide_xml(fig)
+
+
+def test_property_change_drops_the_entry(figure, export):
+    fig, ax = figure
+    line, _ = plot(fig, ax)
+    cache = ShapeCache()
+    export(fig, cache=cache)
+    size = len(cache)
+    line.set(color="red")  # calls the pchanged callbacks of the line
+    assert len(cache) == size - 1
+    assert not line._callbacks.callbacks.get("pchanged")
+
+
+def test_cache_is_bounded(figure, export):
+    fig, ax = figure
+    for i in range(10):
+        ax.plot([0, 1], [i, i + 1])
+    cache = ShapeCache(maxsize=3)
+    export(fig, cache=cache)
+    assert len(cache) == 3
+    # the evicted artists are disconnected from the cache
+    connected = [line for line in ax.lines if line._callbacks.callbacks.get("pchanged")]
+    assert len(connected) <= 3
+
+
+def test_garbage_collected_artists_are_dropped(export):
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    plot(fig, fig.add_subplot(1, 1, 1))
+    cache = ShapeCache()
+    export(fig, cache=cache)
+    assert len(cache) > 0
+    del fig
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_clear(figure, export):
+    fig, ax = figure
+    line, _ = plot(fig, ax)
+    cache = ShapeCache()
+    export(fig, cache=cache)
+    cache.clear()
+    assert len(cache) == 0
+    assert not line._callbacks.callbacks.get("pchanged")
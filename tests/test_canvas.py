@@ -0,0 +1,77 @@
+""" Tests of the canvas around the plotting area """
+
+
+#############
+## Imports ##
+#############
+
+import numpy as np
+import pytest
+
+import mplppt
+from mplppt.utils.mpl import ConversionContext
+
+
+###############
+## Functions ##
+###############
+
+
+def ticklabels(fig, ax):
+    """ the tick labels of the ticks within the view limits of a converted figure
+
+    Returns:
+        xlabels: (x, y, cx, cy) arrays of the x tick labels
+        ylabels: (x, y, cx, cy) arrays of the y tick labels
+    """
+    group = mplppt.fig2group(fig=fig)
+    (labels,) = [obj for obj in group.objects if obj.name == "Canvas_ticklabels"]
+    columns = np.stack([labels.x, labels.y, labels.cx, labels.cy], axis=1)
+    nx = len(ax.xaxis.get_ticklabels())
+    xticks, yticks = ax.xaxis.get_ticklocs(), ax.yaxis.get_ticklocs()
+    xlim, ylim = sorted(ax.get_xlim()), sorted(ax.get_ylim())
+    xview = (xticks >= xlim[0]) & (xticks <= xlim[1])
+    yview = (yticks >= ylim[0]) & (yticks <= ylim[1])
+    return columns[:nx][xview].T, columns[nx:][yview].T
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize(
+    "ylim", [None, (1e-3, 1e3)], ids=["autoscaled", "below-zero-offset"]
+)
+def test_semilogy_ticklabels_next_to_the_plotting_area(figure, ylim):
+    fig, ax = figure
+    x = np.linspace(1, 10, 100)
+    ax.semilogy(x, np.exp(x))
+    if ylim is not None:
+        # an offset of 1% of the limits in data coordinates would end up below zero
+        ax.set_ylim(*ylim)
+    (x, y, cx, cy), (yx, yy, ycx, ycy) = ticklabels(fig, ax)
+    assert len(x) > 0 and len(yx) > 0
+    assert np.isfinite(np.concatenate([x, y, cx, cy, yx, yy, ycx, ycy])).all()
+
+    left, right, top, bottom = ConversionContext.from_axes(ax).area
+    width, height = fig.bbox.width, fig.bbox.height
+
+    # x tick labels: just below the plotting area
+    np.testing.assert_allclose(y, bottom + 0.01 * (bottom - top))
+    assert ((x + cx >= left) & (x <= right) & (y + cy <= height)).all()
+
+    # y tick labels: just left of the plotting area
+    np.testing.assert_allclose(yx + ycx, left - 0.01 * (right - left))
+    assert ((yy + ycy >= top) & (yy <= bottom) & (yx >= 0)).all()
+    assert (y <= height).all() and (x + cx <= width).all()
+
+
+def test_linear_ticklabels_unchanged(figure):
+    fig, ax = figure
+    ax.plot([0, 1], [-1, 1])
+    (x, y, cx, cy), (yx, yy, ycx, ycy) = ticklabels(fig, ax)
+    left, right, top, bottom = ConversionContext.from_axes(ax).area
+    # the offset in axes coordinates equals 1% of the limits on a linear axis
+    np.testing.assert_allclose(y, bottom + 0.01 * (bottom - top))
+    np.testing.assert_allclose(yx + ycx, left - 0.01 * (right - left))
@@ -0,0 +1,210 @@
+""" Tests of the columnar shape collections """
+
+
+#############
+## Imports ##
+#############
+
+import copy
+import pickle
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+
+import mplppt
+from mplppt.shapes import Image
+from mplppt.shapes.collection import Collection
+from mplppt.shapes.collection import MarkerCollection
+from mplppt.shapes.collection import RectangleCollection
+from mplppt.utils.colors import color2hex
+
+
+###############
+## Constants ##
+###############
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+
+###############
+## Functions ##
+###############
+
+
+def rectangles(n=3):
+    """ a rectangle collection with n rectangles in two colors """
+    collection = RectangleCollection(name="bars", capacity=2)
+    for i in range(n):
+        collection.append(
+            x=10 * i,
+            y=5,
+            cx=8,
+            cy=20 + i,
+            lw=1,
+            ec="000000",
+            fc=("ff0000", "00ff00")[i % 2],
+        )
+    return collection
+
+
+def markers(zf):
+    """ the location, size and fill (color, alpha) of the markers on the slide """
+    slide = ElementTree.fromstring(zf.read("ppt/slides/slide1.xml"))
+    result = []
+    for sp in slide.iter(P + "sp"):
+        if not next(sp.iter(P + "cNvPr")).get("name").startswith("mplmarkers_"):
+            continue
+        spPr = sp.find(P + "spPr")
+        off, ext = next(spPr.iter(A + "off")), next(spPr.iter(A + "ext"))
+        color = spPr.find(A + "solidFill").find(A + "srgbClr")
+        result.append(
+            (
+                int(off.get("x")),
+                int(off.get("y")),
+                int(ext.get("cx")),
+                int(ext.get("cy")),
+                color.get("val"),
+                int(color.find(A + "alpha").get("val")),
+            )
+        )
+    return result
+
+
+###########
+## Tests ##
+###########
+
+
+def test_collection_is_abstract():
+    with pytest.raises(TypeError):
+        Collection()
+
+
+def test_columns():
+    collection = rectangles(5)
+    assert len(collection) == 5
+    np.testing.assert_array_equal(collection.x, [0, 10, 20, 30, 40])
+    np.testing.assert_array_equal(collection.cy, [20, 21, 22, 23, 24])
+    assert collection.bbox == (0, 5, 48, 24)
+    with pytest.raises(AttributeError):
+        collection.nonexistent
+
+
+def test_uninitialized_collection_has_no_attributes():
+    collection = RectangleCollection.__new__(RectangleCollection)
+    for name in ("x", "_columns", "_size", "__deepcopy__"):
+        with pytest.raises(AttributeError):
+            getattr(collection, name)
+
+
+def test_palette_stores_unique_colors():
+    collection = rectangles(5)
+    assert collection.palette == ["000000", "ff0000", "00ff00"]
+    np.testing.assert_array_equal(collection.ec, [0, 0, 0, 0, 0])
+    np.testing.assert_array_equal(collection.fc, [1, 2, 1, 2, 1])
+
+
+def test_extend_equals_append():
+    appended = rectangles(5)
+    extended = RectangleCollection(name="bars", capacity=2)
+    extended.extend(
+        x=10 * np.arange(5),
+        y=5,
+        cx=8,
+        cy=20 + np.arange(5),
+        lw=1,
+        ec="000000",
+        fc=["ff0000", "00ff00"] * 2 + ["ff0000"],
+    )
+    extended.extend(x=[], y=[], cx=[], cy=[], lw=[], ec=[], fc=[])
+    assert len(extended) == 5
+    for field, _ in RectangleCollection._fields:
+        np.testing.assert_array_equal(
+            getattr(extended, field), getattr(appended, field)
+        )
+    assert extended.palette == appended.palette
+    assert extended.xml() == appended.xml()
+
+
+def test_rgba_colors_are_converted_once_per_unique_color():
+    collection = rectangles(0)
+    rgba = np.array([(1, 0, 0, 1), (0, 1, 0, 0.5)] * 3)
+    idxs = collection.color_indices(rgba)
+    assert len(collection.palette) == 2
+    colors = [collection.palette[i] for i in idxs]
+    assert colors == [("FF0000", 1.0), ("00FF00", 0.5)] * 3
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_iterxml_chunks(compact):
+    collection = rectangles(5)
+    chunks = list(collection.iterxml(compact=compact, chunksize=2))
+    assert len(chunks) == 3
+    assert "".join(chunks) == collection.xml(compact=compact)
+
+
+@pytest.mark.parametrize(
+    "clone", [copy.copy, copy.deepcopy, lambda c: pickle.loads(pickle.dumps(c))]
+)
+def test_copy_and_pickle(clone):
+    collection = rectangles(5)
+    cloned = clone(collection)
+    assert len(cloned) == 5
+    np.testing.assert_array_equal(cloned.x, collection.x)
+    assert cloned.palette == collection.palette
+    assert cloned.xml() == collection.xml()
+
+
+def test_scatter_plot_becomes_markers(figure, export):
+    fig, ax = figure
+    ax.scatter([1, 2, 3], [1, 2, 3], s=[20, 40, 80])
+    found = markers(export(fig))
+    assert len(found) == 3
+    x, y, cx, cy, colors, alphas = zip(*found)
+    assert cx == cy
+    # the marker size is an area: the diameter grows with its square root
+    np.testing.assert_allclose(np.array(cx[1:]) / cx[:-1], 2 ** 0.5, rtol=0.01)
+    centers = np.array([x, y]) + np.array(cx) / 2
+    assert (np.diff(centers[0]) > 0).all() and (np.diff(centers[1]) < 0).all()
+    assert set(colors) == {"1F77B4"} and set(alphas) == {100000}
+
+
+def test_scatter_plot_with_per_point_colors(figure, export):
+    fig, ax = figure
+    rgba = [(1, 0, 0, 1), (0, 1, 0, 0.5), (0, 0, 1, 1), (1, 0, 0, 1)]
+    ax.scatter([1, 2, 3, 4], [1, 2, 3, 4], c=rgba)
+    found = markers(export(fig))
+    fills = [(color, alpha) for *_, color, alpha in found]
+    assert fills == [
+        ("FF0000", 100000),
+        ("00FF00", 50000),
+        ("0000FF", 100000),
+        ("FF0000", 100000),
+    ]
+
+
+def test_scatter_plot_with_a_colormap(figure, export):
+    fig, ax = figure
+    scatter = ax.scatter([1, 2, 3], [1, 2, 3], c=[0, 1, 2], cmap="viridis")
+    colors = [color for *_, color, _ in markers(export(fig))]
+    rgba = scatter.get_cmap()(scatter.norm([0, 1, 2]))
+    assert colors == [color2hex(color)[0] for color in rgba]
+    assert colors[0] != colors[1] != colors[2]
+
+
+@pytest.mark.parametrize("max_markers, image", [(None, False), (5, False), (4, True)])
+def test_scatter_plot_above_max_markers_becomes_an_image(
+    figure, export, max_markers, image
+):
+    fig, ax = figure
+    ax.scatter(np.arange(5), np.arange(5))
+    group = mplppt.fig2group(fig=fig, max_markers=max_markers)
+    kinds = {type(obj) for obj in group.objects}
+    assert (Image in kinds) == image
+    assert (MarkerCollection in kinds) != image
+    zf = export(fig, max_markers=max_markers)
+    assert len(markers(zf)) == (0 if image else 5)
+    media = [name for name in zf.namelist() if name.startswith("ppt/media/")]
+    assert len(media) == (1 if image else 0)
@@ -0,0 +1,138 @@
+""" Tests of the compression policy of the written archives """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import sys
+import zipfile
+
+import numpy as np
+import pytest
+
+from mplppt import Group
+from mplppt import Package
+from mplppt import utils
+from mplppt.shapes import Image
+from mplppt.shapes import Line
+from mplppt.utils import compression as compression_module
+from mplppt.utils.compression import COMPRESSED_EXTENSIONS
+from mplppt.utils.compression import can_write_members
+from mplppt.utils.compression import compression_level
+from mplppt.utils.compression import part_compression
+
+
+###############
+## Functions ##
+###############
+
+
+def slide():
+    """ a slide with a long line and an image """
+    t = np.linspace(0, 10, 5000)
+    line = Line(shape=np.stack([40 * t, 100 + 50 * np.sin(t)], axis=1))
+    array = np.random.RandomState(0).randint(0, 256, (20, 30, 4), dtype=np.uint8)
+    image = Image(array, x=10, y=10, cx=100, cy=50)
+    return Group(objects=[line, image])
+
+
+def save(group, compression, max_workers=None):
+    """ save a slide into a pptx archive in memory """
+    package = Package()
+    package.add_slide(xml=group.iterxml(), rels=group.rels())
+    buffer = io.BytesIO()
+    package.save(buffer, compression=compression, max_workers=max_workers)
+    return zipfile.ZipFile(buffer)
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize(
+    "compression, level",
+    [("stored", None), ("fast", 1), ("small", 9), (None, None), (0, 0), (6, 6)],
+)
+def test_compression_level(compression, level):
+    assert compression_level(compression) == level
+
+
+@pytest.mark.parametrize("compression", ["fastest", -1, 10])
+def test_invalid_compression_raises(compression):
+    with pytest.raises(ValueError):
+        compression_level(compression)
+
+
+def test_part_compression():
+    assert part_compression("ppt/slides/slide1.xml", 1) == (zipfile.ZIP_DEFLATED, 1)
+    assert part_compression("ppt/media/image.PNG", 9) == (zipfile.ZIP_STORED, None)
+    assert part_compression("ppt/media/image.jpeg", 9) == (zipfile.ZIP_STORED, None)
+    assert part_compression("ppt/slides/slide1.xml", None) == (
+        zipfile.ZIP_STORED,
+        None,
+    )
+
+
+@pytest.mark.parametrize("compression", ["fast", "small", 0])
+@pytest.mark.parametrize("max_workers", [1, None])
+def test_xml_is_deflated_and_media_is_stored(compression, max_workers):
+    zf = save(slide(), compression, max_workers)
+    assert zf.testzip() is None
+    assert any(name.startswith("ppt/media/") for name in zf.namelist())
+    for info in zf.infolist():
+        if info.filename.lower().endswith(COMPRESSED_EXTENSIONS):
+            assert info.compress_type == zipfile.ZIP_STORED
+        else:
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+
+
+@pytest.mark.parametrize("compression", ["stored", None])
+def test_stored_archive(compression):
+    zf = save(slide(), compression)
+    assert zf.testzip() is None
+    assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_STORED}
+
+
+def test_levels_give_the_same_content():
+    group = slide()
+    archives = [save(group, compression) for compression in ("stored", "fast", "small")]
+    names = archives[0].namelist()
+    for zf in archives[1:]:
+        assert zf.namelist() == names
+        for name in names:
+            assert zf.read(name) == archives[0].read(name)
+    name = "ppt/slides/slide1.xml"
+    sizes = [zf.getinfo(name).compress_size for zf in archives]
+    assert sizes[0] > sizes[1] >= sizes[2]
+
+
+@pytest.mark.parametrize("compression", ["fast", "stored"])
+def test_fallback_without_zipfile_internals(monkeypatch, compression):
+    group = slide()
+    parallel = save(group, compression)
+    monkeypatch.setattr(compression_module, "can_write_members", lambda zf: False)
+    fallback = save(group, compression)
+    assert fallback.testzip() is None
+    assert fallback.namelist() == parallel.namelist()
+    for info in parallel.infolist():
+        assert fallback.getinfo(info.filename).compress_type == info.compress_type
+        assert fallback.read(info.filename) == parallel.read(info.filename)
+
+
+def test_can_write_members():
+    with zipfile.ZipFile(io.BytesIO(), "w") as zf:
+        supported = can_write_members(zf)
+    version = sys.version_info[:2]
+    assert supported == (
+        sys.implementation.name == "cpython" and (3, 6) <= version < (3, 14)
+    )
+
+
+def test_only_the_public_names_are_exported():
+    for name in compression_module.__all__:
+        assert getattr(utils, name) is getattr(compression_module, name)
+    for name in ("zlib", "sys", "deque", "ThreadPoolExecutor", "BUFFERSIZE"):
+        assert name not in vars(utils)
@@ -0,0 +1,126 @@
+""" Tests of the polyline decimation """
+
+
+#############
+## Imports ##
+#############
+
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+
+from mplppt.utils.decimation import decimate
+from mplppt.utils.decimation import DECIMATION_MODES
+
+
+###############
+## Constants ##
+###############
+
+MODES = [mode for mode in DECIMATION_MODES if mode is not None]
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_short_inputs_are_kept(mode, n):
+    shape = np.stack([np.arange(n), np.arange(n) ** 2], axis=1).astype(float)
+    decimated, dropped = decimate(shape, mode, tolerance=1.0)
+    assert dropped == 0
+    np.testing.assert_array_equal(decimated, shape)
+
+
+def test_no_decimation():
+    shape = np.zeros((10, 2))
+    decimated, dropped = decimate(shape, None)
+    assert dropped == 0
+    assert decimated.shape == (10, 2)
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        decimate(np.zeros((10, 2)), "fast")
+
+
+def test_lossless_drops_duplicates_and_collinear_points():
+    shape = np.array([[0, 0], [0, 0], [1, 1], [2, 2], [3, 0], [3, 0]], dtype=float)
+    decimated, dropped = decimate(shape, "lossless")
+    np.testing.assert_array_equal(decimated, [[0, 0], [2, 2], [3, 0]])
+    assert dropped == 3
+
+
+def test_lossless_keeps_reversals():
+    shape = np.array([[0, 0], [2, 0], [1, 0]], dtype=float)
+    decimated, dropped = decimate(shape, "lossless")
+    np.testing.assert_array_equal(decimated, shape)
+    assert dropped == 0
+
+
+@pytest.mark.parametrize("mode", ["minmax", "rdp"])
+def test_lossy_modes_keep_the_extremes(mode):
+    x = np.linspace(0, 10, 10001)
+    shape = np.stack([x, np.sin(x)], axis=1)
+    decimated, dropped = decimate(shape, mode, tolerance=0.1)
+    assert 0 < len(decimated) < len(shape) / 10
+    assert dropped == len(shape) - len(decimated)
+    np.testing.assert_array_equal(decimated[0], shape[0])
+    np.testing.assert_array_equal(decimated[-1], shape[-1])
+    assert decimated[:, 1].max() == pytest.approx(1.0, abs=0.1)
+    assert decimated[:, 1].min() == pytest.approx(-1.0, abs=0.1)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_nan_breaks_are_kept(mode):
+    x = np.linspace(0, 10, 1001)
+    shape = np.stack([x, np.zeros_like(x)], axis=1)
+    shape[500] = np.nan
+    with np.errstate(invalid="raise"):
+        decimated, dropped = decimate(shape, mode, tolerance=0.1)
+    gaps = np.flatnonzero(np.isnan(decimated).any(axis=1))
+    assert len(gaps) == 1
+    # the runs on both sides of the break are decimated separately
+    np.testing.assert_array_equal(decimated[gaps[0] - 1], shape[499])
+    np.testing.assert_array_equal(decimated[gaps[0] + 1], shape[501])
+    assert dropped == len(shape) - len(decimated)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_only_nan(mode):
+    shape = np.full((5, 2), np.nan)
+    decimated, dropped = decimate(shape, mode)
+    assert dropped == 0
+    assert np.isnan(decimated).all()
+
+
+@pytest.mark.parametrize("mode", DECIMATION_MODES)
+def test_savefig_line_with_nan_gaps(figure, slide_xml, mode):
+    fig, ax = figure
+    x = np.linspace(0, 10, 1000)
+    y = np.sin(x)
+    y[[100, 101, 500]] = np.nan  # three runs of finite points
+    y[-50:] = np.nan  # trailing gap
+    ax.plot(x, y)
+    ax.plot(x, np.full_like(x, np.nan))  # nothing to draw
+    ax.set_xlim(0, 10)
+    root = ElementTree.fromstring(slide_xml(fig, decimation=mode))
+
+    (path,) = [
+        path
+        for path in root.iter(A + "path")
+        if path.find(A + "moveTo") is not None and len(path) > 10
+    ]
+    assert len(path.findall(A + "moveTo")) == 3
+    assert path[0].tag == A + "moveTo"
+    points = np.array(
+        [(int(pt.get("x")), int(pt.get("y"))) for pt in path.iter(A + "pt")]
+    )
+    assert (points >= 0).all()
+    assert (points[:, 0] <= int(path.get("w"))).all()
+    assert (points[:, 1] <= int(path.get("h"))).all()
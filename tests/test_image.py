@@ -0,0 +1,93 @@
+""" Tests of the conversion of matplotlib images and meshes """
+
+
+#############
+## Imports ##
+#############
+
+import io
+
+import numpy as np
+import pytest
+from matplotlib.image import imread
+from matplotlib.colors import LogNorm
+from matplotlib.colors import Normalize
+
+from mplppt.shapes import Image
+from mplppt.shapes.image import Mesh
+from mplppt.utils.mpl import ConversionContext
+
+
+###############
+## Functions ##
+###############
+
+
+def decode(image):
+    """ decode the png of an image into an array of rgba bytes """
+    return np.round(imread(io.BytesIO(image.data), format="png") * 255).astype(int)
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize(
+    "norm", [Normalize(vmin=0, vmax=10), LogNorm(vmin=1, vmax=10)], ids=["lin", "log"]
+)
+def test_mesh_cells_are_colormapped(figure, norm):
+    fig, ax = figure
+    C = np.array([[1.0, 2.0, 3.0], [4.0, 6.0, 10.0]])
+    mesh = ax.pcolormesh(C, cmap="viridis", norm=norm)
+    image = Mesh.from_mpl(mesh)
+    assert type(image) is Mesh
+    expected = mesh.get_cmap()(norm(C), bytes=True).astype(int)
+    # the first row of the mesh is at the bottom of the axes, so at the bottom of the image
+    np.testing.assert_array_equal(decode(image), expected[::-1])
+
+
+def test_masked_cells_are_transparent(figure):
+    fig, ax = figure
+    C = np.ma.masked_array(np.arange(6.0).reshape(2, 3), mask=[[1, 0, 0], [0, 0, 1]])
+    image = Mesh.from_mpl(ax.pcolormesh(C))
+    alpha = decode(image)[::-1, :, 3]
+    np.testing.assert_array_equal(alpha, np.where(C.mask, 0, 255))
+
+
+def test_mesh_covers_its_cells_on_the_slide(figure):
+    fig, ax = figure
+    ax.pcolormesh(np.arange(4), np.arange(3), np.ones((2, 3)), shading="flat")
+    ax.set_xlim(-1, 4)
+    ax.set_ylim(-1, 3)
+    context = ConversionContext.from_axes(ax)
+    image = Mesh.from_mpl(ax.collections[0], context=context)
+    (x0, x1), (y0, y1) = context.transform(np.array([(0, 2), (3, 0)]))
+    np.testing.assert_allclose(
+        (image.x, image.y, image.cx, image.cy), (x0, y0, x1 - x0, y1 - y0)
+    )
+
+
+@pytest.mark.parametrize("shading", ["flat", "nearest"])
+def test_uniform_meshes_become_a_mesh_image(figure, shading):
+    fig, ax = figure
+    x, y = np.arange(3), np.arange(4)
+    if shading == "flat":
+        x, y = np.arange(4), np.arange(5)
+    image = Mesh.from_mpl(ax.pcolormesh(x, y, np.ones((4, 3)), shading=shading))
+    assert type(image) is Mesh
+    assert decode(image).shape == (4, 3, 4)
+
+
+def test_gouraud_shading_is_rendered_by_matplotlib(figure):
+    fig, ax = figure
+    mesh = ax.pcolormesh(np.arange(3), np.arange(4), np.ones((4, 3)), shading="gouraud")
+    image = Mesh.from_mpl(mesh)
+    assert type(image) is Image
+
+
+def test_non_uniform_meshes_are_rendered_by_matplotlib(figure):
+    fig, ax = figure
+    mesh = ax.pcolormesh([0, 1, 3, 7], [0, 1, 2], np.ones((2, 3)))
+    image = Mesh.from_mpl(mesh)
+    assert type(image) is Image
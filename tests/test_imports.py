@@ -0,0 +1,54 @@
+""" Tests of the lazy imports of mplppt """
+
+
+#############
+## Imports ##
+#############
+
+import sys
+import subprocess
+
+import pytest
+
+import mplppt
+
+
+###############
+## Functions ##
+###############
+
+
+def imported(statement):
+    """ the heavy dependencies imported by a statement in a fresh interpreter """
+    code = (
+        "import sys\n%s\n"
+        "print(' '.join(m for m in ('matplotlib', 'numpy', 'scipy') if m in sys.modules))"
+    ) % statement
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE
+    ).stdout
+    return set(output.decode().split())
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize(
+    "statement", ["import mplppt", "import mplppt.utils", "from mplppt import new"]
+)
+def test_import_does_not_import_the_heavy_dependencies(statement):
+    assert imported(statement) == set()
+
+
+def test_lazy_names_import_their_submodule():
+    assert "matplotlib" in imported("from mplppt import savefig")
+
+
+def test_new_is_the_function():
+    # the function is not shadowed by the submodule with the same name
+    assert callable(mplppt.new)
+    assert "new" not in mplppt._LAZY
+    assert "new" in mplppt.__all__
+    assert len(set(mplppt.__all__)) == len(mplppt.__all__)
@@ -0,0 +1,78 @@
+""" Tests of the deduplication of the media parts """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import re
+import zipfile
+
+import numpy as np
+
+from mplppt import Group
+from mplppt import Presentation
+from mplppt.shapes import Image
+
+
+###############
+## Functions ##
+###############
+
+
+def image(seed=0):
+    """ an image of random colors """
+    array = np.random.RandomState(seed).randint(0, 256, (20, 30, 4), dtype=np.uint8)
+    return Image(array, x=10, y=10, cx=100, cy=50)
+
+
+def save(presentation):
+    """ save a presentation into memory and return the pptx archive """
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return zipfile.ZipFile(buffer)
+
+
+def media(zf):
+    """ the names of the media parts of a pptx archive """
+    return [name for name in zf.namelist() if name.startswith("ppt/media/")]
+
+
+def targets(zf, n):
+    """ the media targets of the relationships of slide n """
+    rels = zf.read("ppt/slides/_rels/slide%i.xml.rels" % n).decode()
+    return re.findall(r'Target="../media/([^"]*)"', rels)
+
+
+###########
+## Tests ##
+###########
+
+
+def test_identical_images_share_a_target():
+    a, b, c = image(0), image(0), image(1)
+    assert a.target == b.target
+    assert a.target != c.target
+    assert a.id != b.id
+
+
+def test_identical_images_on_a_slide_are_stored_once():
+    presentation = Presentation()
+    presentation.add_slide(Group(objects=[image(0), image(0), image(1)]))
+    zf = save(presentation)
+    assert len(targets(zf, 1)) == 3
+    assert len(set(targets(zf, 1))) == 2
+    assert sorted(media(zf)) == sorted(
+        "ppt/media/" + target for target in set(targets(zf, 1))
+    )
+
+
+def test_identical_images_on_many_slides_are_stored_once():
+    presentation = Presentation()
+    for _ in range(3):
+        presentation.add_slide(Group(objects=[image(0)]))
+    zf = save(presentation)
+    assert targets(zf, 1) == targets(zf, 2) == targets(zf, 3)
+    assert media(zf) == ["ppt/media/" + targets(zf, 1)[0]]
+    assert zf.testzip() is None
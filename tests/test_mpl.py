@@ -0,0 +1,64 @@
+""" Tests of the matplotlib figure tools """
+
+
+#############
+## Imports ##
+#############
+
+import gc
+import weakref
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from mplppt.utils import mpl as mplutils
+from mplppt.utils.mpl import get_plotting_area
+
+
+###########
+## Tests ##
+###########
+
+
+def test_plotting_area_is_cached(figure):
+    fig, ax = figure
+    area = get_plotting_area(fig)
+    assert mplutils._plotting_areas[fig] == area
+    assert not fig.stale
+    assert get_plotting_area(fig) is area
+
+
+def test_plotting_area_is_invalidated_after_a_resize(figure):
+    fig, ax = figure
+    before = get_plotting_area(fig)
+    fig.set_size_inches(8, 6)
+    after = get_plotting_area(fig)
+    assert after != before
+    xmin, xmax, ymin, ymax = after
+    assert xmax > before[1] and ymax > before[3]
+
+
+def test_plotting_area_is_invalidated_after_a_layout_change(figure):
+    fig, ax = figure
+    before = get_plotting_area(fig)
+    ax.set_position([0.3, 0.3, 0.4, 0.4])
+    after = get_plotting_area(fig)
+    np.testing.assert_allclose(after, ax.bbox.extents[[0, 2, 1, 3]], atol=1)
+    assert after != before
+
+
+def test_plotting_area_entry_is_dropped_with_the_figure():
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    fig.add_subplot(1, 1, 1)
+    get_plotting_area(fig)
+    gc.collect()
+    size = len(mplutils._plotting_areas)
+    assert fig in mplutils._plotting_areas
+    ref = weakref.ref(fig)
+    del fig
+    gc.collect()
+    # the cache does not keep the figure alive
+    assert ref() is None
+    assert len(mplutils._plotting_areas) == size - 1
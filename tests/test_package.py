@@ -0,0 +1,111 @@
+""" Tests of the in-memory pptx package and the targets it's written to """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import time
+import zipfile
+import posixpath
+from xml.etree import ElementTree
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import mplppt
+
+
+###############
+## Constants ##
+###############
+
+CONTENT_TYPES = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+SLIDE_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+
+
+###############
+## Functions ##
+###############
+
+
+def check_package(zf):
+    """ check the structure of a pptx archive: all xml parts parse, all parts have a
+    content type and all internal relationships point to parts of the archive """
+    assert zf.testzip() is None
+    names = set(zf.namelist())
+    assert {"[Content_Types].xml", "_rels/.rels", "ppt/presentation.xml"} <= names
+
+    types = ElementTree.fromstring(zf.read("[Content_Types].xml"))
+    defaults = {t.get("Extension") for t in types.iter(CONTENT_TYPES + "Default")}
+    overrides = {t.get("PartName")[1:] for t in types.iter(CONTENT_TYPES + "Override")}
+    assert overrides <= names
+    for name in names:
+        assert name in overrides or name.rsplit(".", 1)[-1].lower() in defaults
+
+    for name in names:
+        if name.endswith((".xml", ".rels")):
+            ElementTree.fromstring(zf.read(name))
+        if not name.endswith(".rels"):
+            continue
+        folder = posixpath.dirname(posixpath.dirname(name))
+        for rel in ElementTree.fromstring(zf.read(name)):
+            if rel.get("TargetMode") == "External":
+                continue
+            target = posixpath.normpath(posixpath.join(folder, rel.get("Target")))
+            assert target.lstrip("/") in names, (name, rel.get("Target"))
+
+
+def image_figure():
+    """ a figure with a line and a scatter plot that is embedded as an image """
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.plot(np.sin(np.linspace(0, 10, 100)))
+    ax.scatter(np.arange(100), np.cos(np.arange(100)))
+    return fig
+
+
+###########
+## Tests ##
+###########
+
+
+def test_buffer_target_gets_a_valid_pptx():
+    buffer = io.BytesIO()
+    mplppt.savefig(buffer, fig=image_figure(), max_markers=10)
+    zf = zipfile.ZipFile(io.BytesIO(buffer.getvalue()))
+    check_package(zf)
+
+    types = ElementTree.fromstring(zf.read("[Content_Types].xml"))
+    slides = [
+        t.get("PartName")
+        for t in types.iter(CONTENT_TYPES + "Override")
+        if t.get("ContentType") == SLIDE_TYPE
+    ]
+    assert slides == ["/ppt/slides/slide1.xml"]
+    rels = ElementTree.fromstring(zf.read("ppt/slides/_rels/slide1.xml.rels"))
+    targets = [rel.get("Target") for rel in rels.iter(RELATIONSHIPS + "Relationship")]
+    assert any(target.startswith("../media/") for target in targets)
+
+
+def test_path_and_buffer_targets_get_the_same_bytes(tmp_path, monkeypatch):
+    # the modification times of the parts are part of the archive
+    monkeypatch.setattr(time, "time", lambda: 1.6e9)
+    group = mplppt.fig2group(fig=image_figure(), max_markers=10)
+    buffer = io.BytesIO()
+    group.save(buffer)
+    group.save(str(tmp_path / "slide"))  # the extension is added
+    group.save(tmp_path / "other.pptx")
+    assert (tmp_path / "slide.pptx").read_bytes() == buffer.getvalue()
+    assert (tmp_path / "other.pptx").read_bytes() == buffer.getvalue()
+
+
+def test_buffer_is_left_open():
+    buffer = io.BytesIO()
+    mplppt.fig2group(fig=image_figure()).save(buffer)
+    assert not buffer.closed
+    assert buffer.tell() == len(buffer.getvalue()) > 0
@@ -0,0 +1,93 @@
+""" Tests of the parallel conversion of many matplotlib figures """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import re
+import zipfile
+import functools
+
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import mplppt
+from mplppt.save import picklefig
+from mplppt.parallel import convert_figures
+
+
+###############
+## Functions ##
+###############
+
+
+def line_figure(i):
+    """ a figure with a single line and a title, different for each i """
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.plot([0, 1, 2], [i, -i, i])
+    ax.set_title("figure %i" % i)
+    return fig
+
+
+def broken_figure():
+    """ a figure function failing in the worker """
+    raise RuntimeError("broken figure")
+
+
+def slides(buffer):
+    """ the slide xml of a pptx file without the (random) names and ids """
+    zf = zipfile.ZipFile(buffer)
+    names = sorted(
+        (name for name in zf.namelist() if re.match(r"ppt/slides/slide\d+\.xml", name)),
+        key=lambda name: int(re.findall(r"\d+", name)[0]),
+    )
+    return [
+        re.sub(r'(name|Id|embed)="[^"]*"', "", zf.read(name).decode()) for name in names
+    ]
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_slides_are_in_the_order_of_the_figures(max_workers):
+    figures = [functools.partial(line_figure, i) for i in range(5)]
+    converted = convert_figures(figures, max_workers=max_workers)
+    titles = [set(re.findall(r"figure \d", raw.xml())) for raw in converted]
+    assert titles == [{"figure %i" % i} for i in range(5)]
+
+
+def test_parallel_export_matches_serial_export():
+    figures = [functools.partial(line_figure, i) for i in range(4)]
+    serial, parallel = io.BytesIO(), io.BytesIO()
+    mplppt.savefigs(serial, figures, max_workers=1)
+    mplppt.savefigs(parallel, figures, max_workers=2)
+    assert len(slides(serial)) == 4
+    assert slides(parallel) == slides(serial)
+
+
+def test_figures_are_accepted_in_any_form(tmp_path):
+    filename = str(tmp_path / "figure.pkl")
+    picklefig(filename, line_figure(1))
+    figures = [line_figure(0), filename, functools.partial(line_figure, 2)]
+    buffer = io.BytesIO()
+    mplppt.savefigs(buffer, figures, max_workers=2)
+    titles = [set(re.findall(r"figure \d", xml)) for xml in slides(buffer)]
+    assert titles == [{"figure 0"}, {"figure 1"}, {"figure 2"}]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_error_in_a_worker_is_raised(tmp_path, max_workers):
+    figures = [functools.partial(line_figure, 0), broken_figure]
+    filename = tmp_path / "slides.pptx"
+    with pytest.raises(RuntimeError, match="broken figure"):
+        mplppt.savefigs(str(filename), figures, max_workers=max_workers)
+    # nothing is written when a figure can't be converted
+    assert not filename.exists()
@@ -0,0 +1,168 @@
+""" Tests of the presentations with multiple slides """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import mplppt
+from mplppt.package import template_parts
+from mplppt.utils.constants import PIXELSPERINCH
+
+from test_package import CONTENT_TYPES
+from test_package import RELATIONSHIPS
+from test_package import SLIDE_TYPE
+from test_package import check_package
+
+
+###############
+## Constants ##
+###############
+
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+SLIDE_RELATIONSHIP = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+)
+
+
+###############
+## Functions ##
+###############
+
+
+def line_figure(i, figsize=(6, 4)):
+    """ a figure with a single line, different for each i """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    fig.add_subplot(1, 1, 1).plot([0, 1], [i, i + 1])
+    return fig
+
+
+def save(presentation):
+    """ save a presentation into memory and return the pptx archive """
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return zipfile.ZipFile(buffer)
+
+
+def slide_relationships(zf):
+    """ the slide relationships of the presentation part, by relationship id """
+    rels = ElementTree.fromstring(zf.read("ppt/_rels/presentation.xml.rels"))
+    return {
+        rel.get("Id"): rel.get("Target")
+        for rel in rels.iter(RELATIONSHIPS + "Relationship")
+        if rel.get("Type") == SLIDE_RELATIONSHIP
+    }
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.fixture(scope="module")
+def deck():
+    """ a saved presentation with three slides """
+    presentation = mplppt.Presentation()
+    for i in range(3):
+        presentation.add_slide(line_figure(i))
+    return save(presentation)
+
+
+def test_presentation_is_a_valid_pptx(deck):
+    check_package(deck)
+    slides = sorted(name for name in deck.namelist() if name.startswith("ppt/slides/"))
+    assert slides == [
+        "ppt/slides/_rels/slide1.xml.rels",
+        "ppt/slides/_rels/slide2.xml.rels",
+        "ppt/slides/_rels/slide3.xml.rels",
+        "ppt/slides/slide1.xml",
+        "ppt/slides/slide2.xml",
+        "ppt/slides/slide3.xml",
+    ]
+    assert b"<Slides>3</Slides>" in deck.read("docProps/app.xml")
+
+
+def test_slide_ids_reference_the_slides_in_order(deck):
+    presentation = ElementTree.fromstring(deck.read("ppt/presentation.xml"))
+    ids = [(sld.get("id"), sld.get(R + "id")) for sld in presentation.iter(P + "sldId")]
+    assert [id for id, _ in ids] == ["256", "257", "258"]
+    targets = slide_relationships(deck)
+    assert [targets[rid] for _, rid in ids] == [
+        "slides/slide1.xml",
+        "slides/slide2.xml",
+        "slides/slide3.xml",
+    ]
+
+
+def test_slide_relationship_ids_follow_the_template(deck):
+    template = ElementTree.fromstring(
+        template_parts()["ppt/_rels/presentation.xml.rels"]
+    )
+    used = {
+        rel.get("Id")
+        for rel in template.iter(RELATIONSHIPS + "Relationship")
+        if rel.get("Type") != SLIDE_RELATIONSHIP
+    }
+    assert used == {"rId1", "rId3", "rId4", "rId5", "rId6", "rId7"}
+    # the first slide keeps the relationship id of the template slide
+    assert sorted(slide_relationships(deck)) == ["rId2", "rId8", "rId9"]
+    rels = ElementTree.fromstring(deck.read("ppt/_rels/presentation.xml.rels"))
+    ids = [rel.get("Id") for rel in rels.iter(RELATIONSHIPS + "Relationship")]
+    assert len(ids) == len(set(ids)) == len(used) + 3
+
+
+def test_every_slide_has_a_content_type_override(deck):
+    types = ElementTree.fromstring(deck.read("[Content_Types].xml"))
+    slides = [
+        t.get("PartName")
+        for t in types.iter(CONTENT_TYPES + "Override")
+        if t.get("ContentType") == SLIDE_TYPE
+    ]
+    assert slides == [
+        "/ppt/slides/slide1.xml",
+        "/ppt/slides/slide2.xml",
+        "/ppt/slides/slide3.xml",
+    ]
+
+
+def test_slides_keep_their_order(deck, slide_xml):
+    for n in (1, 2, 3):
+        xml = deck.read("ppt/slides/slide%i.xml" % n).decode()
+        assert re.sub(r'(name|Id|embed)="[^"]*"', "", xml) == slide_xml(
+            line_figure(n - 1)
+        )
+
+
+def test_slidesize_is_taken_from_the_first_slide():
+    presentation = mplppt.Presentation()
+    presentation.add_slide(line_figure(0, figsize=(8, 5)))
+    assert presentation.slidesize == (8, 5)
+    size = ElementTree.fromstring(save(presentation).read("ppt/presentation.xml"))
+    size = next(size.iter(P + "sldSz"))
+    assert (size.get("cx"), size.get("cy")) == (
+        str(int(8 * PIXELSPERINCH)),
+        str(int(5 * PIXELSPERINCH)),
+    )
+
+
+@pytest.mark.parametrize("slidesize", [None, (6, 4)])
+def test_slidesize_mismatch_is_rejected(slidesize):
+    presentation = mplppt.Presentation(slidesize=slidesize)
+    presentation.add_slide(line_figure(0))
+    with pytest.raises(ValueError, match="slidesize"):
+        presentation.add_slide(line_figure(1, figsize=(8, 5)))
+    assert len(presentation) == 1
+    # a figure of the same size can still be added
+    presentation.add_slide(line_figure(2))
+    assert len(presentation) == 2
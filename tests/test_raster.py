@@ -0,0 +1,84 @@
+""" Tests of the hybrid vector/raster export mode """
+
+
+#############
+## Imports ##
+#############
+
+import io
+
+import numpy as np
+import pytest
+from matplotlib.image import imread
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import mplppt
+from mplppt.shapes import Image
+from mplppt.utils.mpl import ConversionContext
+
+
+###############
+## Functions ##
+###############
+
+
+def layers(group):
+    """ the rasterized layers of a converted figure """
+    return [obj for obj in group.objects if obj.name.startswith("mplraster_")]
+
+
+###########
+## Tests ##
+###########
+
+
+def test_one_layer_per_axes():
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    axs = fig.subplots(1, 2)
+    for ax in axs:
+        ax.plot(np.arange(10), rasterized=True)
+        ax.plot(np.arange(10)[::-1], rasterized=True)
+    group = mplppt.fig2group(fig=fig, rasterized=True)
+
+    images = layers(group)
+    assert len(images) == 2
+    assert all(isinstance(image, Image) for image in images)
+    # each layer covers the plotting area, but only contains the artists of its axes
+    xmin, xmax, ymin, ymax = ConversionContext.from_axes(axs[0]).area
+    for image, ax in zip(images, axs):
+        np.testing.assert_allclose(
+            [image.x, image.y, image.cx, image.cy],
+            [xmin, ymin, xmax - xmin, ymax - ymin],
+        )
+        alpha = imread(io.BytesIO(image.data))[:, :, 3]
+        columns = np.flatnonzero(alpha.any(axis=0)) + xmin
+        x0, _, x1, _ = ax.bbox.extents
+        assert columns.min() >= x0 - 2 and columns.max() <= x1 + 2
+    # the rasterized lines are not converted into vector shapes
+    assert not [obj for obj in group.objects if obj.name.startswith("mplline_")]
+
+
+def test_explicit_list_only_rasterizes_the_given_artists(figure):
+    fig, ax = figure
+    (raster,) = ax.plot(np.arange(10))
+    ax.plot(np.arange(10)[::-1])
+    group = mplppt.fig2group(fig=fig, rasterized=[raster])
+    assert len(layers(group)) == 1
+    assert len([obj for obj in group.objects if obj.name.startswith("mplline_")]) == 1
+
+
+def test_empty_list_rasterizes_nothing(figure):
+    fig, ax = figure
+    ax.plot(np.arange(10))
+    assert not layers(mplppt.fig2group(fig=fig, rasterized=[]))
+
+
+def test_artists_of_another_figure_raise(figure):
+    fig, ax = figure
+    ax.plot(np.arange(10))
+    other = Figure()
+    (line,) = other.add_subplot(1, 1, 1).plot(np.arange(10))
+    with pytest.raises(ValueError):
+        mplppt.fig2group(fig=fig, rasterized=[line])
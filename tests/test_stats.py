@@ -0,0 +1,111 @@
+""" Tests of the timings and counters of an export """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import json
+import zipfile
+
+import numpy as np
+import pytest
+
+import mplppt
+from mplppt.stats import NOSTATS
+
+
+###############
+## Functions ##
+###############
+
+
+def plot(ax):
+    """ a straight line of 1000 points, 3 square markers and a text """
+    ax.plot(np.arange(1000), np.zeros(1000))
+    ax.scatter([1, 2, 3], [0.1, 0.2, 0.3], marker="s")
+    ax.text(5, 0.1, "hello")
+
+
+def export(fig, **kwargs):
+    """ export a figure, return the stats and the pptx archive """
+    stats = mplppt.Stats()
+    buffer = io.BytesIO()
+    mplppt.savefig(buffer, fig=fig, stats=stats, axis=False, **kwargs)
+    return stats, zipfile.ZipFile(buffer)
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize(
+    "decimation, vertices, dropped", [(None, 1000, 0), ("lossless", 2, 998)]
+)
+def test_shapes_and_vertices(figure, decimation, vertices, dropped):
+    fig, ax = figure
+    plot(ax)
+    stats, _ = export(fig, decimation=decimation)
+    assert stats.shapes["Line"] == 1
+    assert stats.shapes["Marker"] == 3
+    assert stats.shapes["Text"] >= 1
+    assert "Image" not in stats.shapes and not stats.media
+    # a square marker has 5 vertices (it's closed)
+    assert stats.vertices == vertices + 3 * 5
+    assert stats.dropped == dropped
+
+
+def test_stages(figure):
+    fig, ax = figure
+    plot(ax)
+    stats, _ = export(fig)
+    expected = {"layout", "findobj", "lines", "markers", "text", "canvas"}
+    expected |= {"template", "xml", "package"}
+    assert expected <= set(stats.stages)
+    assert "rasterize" not in stats.stages and "media" not in stats.stages
+    assert all(duration >= 0 for duration in stats.stages.values())
+    # the slide xml is generated while the package is written
+    assert stats.stages["package"] >= stats.stages["xml"]
+
+
+def test_parts_match_the_archive(figure):
+    fig, ax = figure
+    plot(ax)
+    stats, zf = export(fig)
+    assert set(stats.parts) == set(zf.namelist())
+    for info in zf.infolist():
+        assert stats.parts[info.filename] == (info.file_size, info.compress_size)
+    assert stats.parts["ppt/slides/slide1.xml"][0] == len(
+        zf.read("ppt/slides/slide1.xml")
+    )
+
+
+def test_media_are_counted(figure):
+    fig, ax = figure
+    ax.scatter(np.arange(20), np.arange(20))
+    stats, zf = export(fig, max_markers=10)
+    assert stats.shapes["Image"] == 1 and "Marker" not in stats.shapes
+    # the time it took to encode the image, by media target
+    ((target, duration),) = stats.media.items()
+    assert "ppt/media/" + target in zf.namelist()
+    assert duration > 0
+
+
+def test_report(figure):
+    fig, ax = figure
+    plot(ax)
+    stats, _ = export(fig, decimation="lossless")
+    report = json.loads(json.dumps(stats.as_dict()))
+    assert report["vertices"] == 17 and report["dropped"] == 998
+    assert report["shapes"]["Marker"] == 3
+    assert "vertices: 17 (998 dropped)" in str(stats)
+
+
+def test_stats_are_not_collected_by_default(figure):
+    fig, ax = figure
+    plot(ax)
+    mplppt.savefig(io.BytesIO(), fig=fig)
+    assert not NOSTATS.stages and not NOSTATS.shapes and not NOSTATS.parts
+    assert NOSTATS.vertices == NOSTATS.dropped == 0
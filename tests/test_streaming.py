@@ -0,0 +1,107 @@
+""" Tests of streaming the slide xml into the pptx archive """
+
+
+#############
+## Imports ##
+#############
+
+import io
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+
+from mplppt.package import Package
+from mplppt.shapes.base import Group
+from mplppt.shapes.line import Line
+from mplppt.utils.paths import path2xml
+from mplppt.utils.paths import iterpath2xml
+
+
+###############
+## Functions ##
+###############
+
+
+def line(n, name="Line"):
+    """ a line with n points """
+    t = np.linspace(0, 10, n)
+    return Line(name=name, shape=np.stack([40 * t, 100 + 50 * np.sin(t)], axis=1))
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 7, 100, None])
+@pytest.mark.parametrize("compact", [False, True, 100])
+def test_iterpath2xml_chunks_join_to_path2xml(chunksize, compact):
+    shape = line(25).shape
+    chunks = list(iterpath2xml(shape, True, chunksize=chunksize, compact=compact))
+    assert "".join(chunks) == path2xml(shape, True, compact=compact)
+    if chunksize is not None:
+        assert len(chunks) == -(-25 // chunksize) + 1  # + the closing chunk
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_line_iterxml_is_streamed_in_chunks(compact):
+    obj = line(25000)
+    chunks = list(obj.iterxml(compact=compact))
+    assert len(chunks) > 3
+    assert "".join(chunks) == obj.xml(compact=compact)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_group_iterxml_joins_to_xml(compact):
+    group = Group(objects=[line(10, "a"), line(20000, "b"), line(5, "c")])
+    assert "".join(group.iterxml(compact=compact)) == group.xml(compact=compact)
+
+
+@pytest.mark.parametrize("compression", ["stored", "fast"])
+@pytest.mark.parametrize("max_workers", [1, None])
+def test_streamed_slide_is_valid(compression, max_workers):
+    group = Group(objects=[line(10, "a"), line(20000, "b")])
+
+    streamed, joined = Package(), Package()
+    streamed.add_slide(xml=group.iterxml(), rels=group.rels())
+    joined.add_slide(xml=group.xml(), rels=group.rels())
+    contents = []
+    for package in (streamed, joined):
+        buffer = io.BytesIO()
+        package.save(buffer, compression=compression, max_workers=max_workers)
+        with zipfile.ZipFile(buffer) as zf:
+            assert zf.testzip() is None
+            contents.append(zf.read("ppt/slides/slide1.xml"))
+
+    assert contents[0] == contents[1]
+    root = ElementTree.fromstring(contents[0])
+    ns = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+    assert len(root.findall(".//a:lnTo", ns)) == 9 + 19999
+
+
+@pytest.mark.parametrize("compression", ["stored", "fast"])
+@pytest.mark.parametrize("max_workers", [1, None])
+def test_large_streamed_slide_is_not_buffered(compression, max_workers):
+    # 4 MiB of xml that doesn't compress well
+    random = np.random.RandomState(0)
+    chunks = ["<!-- %s -->" % random.bytes(1 << 15).hex() for _ in range(64)]
+    buffer = io.BytesIO()
+    written = []  # the size of the archive whenever the next chunk is produced
+
+    def slide():
+        for chunk in chunks:
+            written.append(buffer.tell())
+            yield chunk
+
+    package = Package()
+    package.add_slide(xml=slide())
+    package.save(buffer, compression=compression, max_workers=max_workers)
+    with zipfile.ZipFile(buffer) as zf:
+        assert zf.testzip() is None
+        assert "".join(chunks) in zf.read("ppt/slides/slide1.xml").decode()
+        info = zf.getinfo("ppt/slides/slide1.xml")
+    # the slide is written while it's produced, not compressed in memory first
+    assert written[0] <= info.header_offset + 100
+    assert written[-1] - info.header_offset > 0.9 * info.compress_size
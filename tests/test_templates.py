@@ -0,0 +1,140 @@
+""" Tests of the compiled xml templates """
+
+
+#############
+## Imports ##
+#############
+
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+
+from mplppt import Group
+from mplppt.shapes import Line
+from mplppt.shapes import Text
+from mplppt.templates import Template
+from mplppt.templates import escape_xml
+from mplppt.templates.template import minify
+from mplppt.utils.paths import grid_size
+from mplppt.utils.paths import shape2emu
+from mplppt.utils.constants import PIXELSPERPOINT
+
+
+###############
+## Constants ##
+###############
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+}
+
+USER_TEXT = 'a <b> & "c"'
+
+
+###############
+## Functions ##
+###############
+
+
+def texts(xml):
+    """ the text runs of a slide """
+    return [t.text for t in ElementTree.fromstring(xml).iter("{%s}t" % NS["a"])]
+
+
+###########
+## Tests ##
+###########
+
+
+def test_escape_xml():
+    assert escape_xml(USER_TEXT) == "a &lt;b&gt; &amp; &quot;c&quot;"
+    assert escape_xml("&lt;") == "&amp;lt;"
+    assert escape_xml(12) == "12"
+
+
+def test_template_escapes_user_text():
+    template = Template('<a:t name="{name}" size="{size}">{text}</a:t>')
+    expected = '<a:t name="&lt;n&gt;" size="<1>">a &lt;b&gt; &amp; &quot;c&quot;</a:t>'
+    values = dict(name="<n>", size="<1>", text=USER_TEXT)
+    assert template.render(**values) == expected
+    assert "".join(template.iterrender(**values)) == expected
+    values.update(name=["<n>", "<n>"])
+    assert template.render_many(2, **values) == 2 * expected
+
+
+def test_streamed_values_are_not_escaped():
+    template = Template("<a:path>{path}</a:path>")
+    chunks = template.iterrender(path=iter(["<a:close/>", "<a:close/>"]))
+    assert "".join(chunks) == "<a:path><a:close/><a:close/></a:path>"
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_text_is_escaped_in_the_slide(figure, slide_xml, compact):
+    fig, ax = figure
+    ax.plot(np.arange(10))
+    ax.text(2, 5, USER_TEXT)
+    ax.text(4, 5, "x & y")
+    xml = slide_xml(fig, compact=compact)
+    assert USER_TEXT in texts(xml)
+    assert "x & y" in texts(xml)
+
+
+def test_text_shape_is_escaped():
+    group = Group(objects=[Text(text=USER_TEXT, cx=100, cy=20, font='<"font">')])
+    xml = "<p:spTree %s>%s</p:spTree>" % (
+        " ".join('xmlns:%s="%s"' % item for item in NS.items()),
+        group.xml(),
+    )
+    assert texts(xml) == [USER_TEXT]
+
+
+def test_minify_keeps_attributes():
+    source = (
+        '<!-- shape -->\n<p:sp>\n    <a:rPr dirty="0"/>\n    <a:extLst/>\n'
+        "    <a:prstGeom>\n        <a:avLst/>\n    </a:prstGeom>\n</p:sp>\n"
+    )
+    assert minify(source) == '<p:sp><a:rPr dirty="0"/><a:prstGeom/></p:sp>'
+
+
+@pytest.mark.parametrize("compact", [True, 100])
+def test_compact_slide_is_valid(figure, slide_xml, compact):
+    fig, ax = figure
+    ax.plot(np.arange(10))
+    ax.text(2, 5, "text")
+    pretty, minified = slide_xml(fig), slide_xml(fig, compact=compact)
+    assert len(minified) < len(pretty)
+    assert texts(minified) == texts(pretty)
+    # dirty="0" is not the default of the schema and is kept
+    assert minified.count('dirty="0"') == pretty.count('dirty="0"') > 0
+
+
+def test_compact_grid_rounds_the_path():
+    shape = np.array([[10.0, 20.0], [110.0, 70.0], [210.0, 20.0]])
+    line = Line(shape=shape)
+    root = ElementTree.fromstring(
+        "<p:spTree %s>%s</p:spTree>"
+        % (
+            " ".join('xmlns:%s="%s"' % item for item in NS.items()),
+            line.xml(compact=100),
+        )
+    )
+    (path,) = root.iter("{%s}path" % NS["a"])
+    points = [
+        (int(pt.get("x")), int(pt.get("y"))) for pt in path.iter("{%s}pt" % NS["a"])
+    ]
+    np.testing.assert_array_equal(points, shape2emu(shape - shape.min(0), grid=100))
+    assert int(path.get("w")) == int(200 * PIXELSPERPOINT / 100)
+    assert int(path.get("h")) == int(50 * PIXELSPERPOINT / 100)
+    # the offset and the extent of the shape stay in EMU
+    (ext,) = root.iter("{%s}ext" % NS["a"])
+    assert int(ext.get("cx")) == int(200 * PIXELSPERPOINT)
+
+
+@pytest.mark.parametrize("compact", [0, -100])
+def test_invalid_grid_raises(compact):
+    with pytest.raises(ValueError):
+        grid_size(compact)
+    with pytest.raises(ValueError):
+        Line().xml(compact=compact)
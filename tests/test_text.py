@@ -0,0 +1,77 @@
+""" Tests of the conversion of matplotlib texts """
+
+
+#############
+## Imports ##
+#############
+
+import numpy as np
+import pytest
+
+import mplppt
+from mplppt.cache import ShapeCache
+from mplppt.shapes import Text
+
+
+###############
+## Functions ##
+###############
+
+
+def texts(fig, **kwargs):
+    """ the converted texts of a figure (without the tick labels), by text """
+    group = mplppt.fig2group(fig=fig, **kwargs)
+    objs = [obj.obj if hasattr(obj, "obj") else obj for obj in group.objects]
+    return {obj.text: obj for obj in objs if isinstance(obj, Text)}
+
+
+###########
+## Tests ##
+###########
+
+
+@pytest.mark.parametrize("yscale", ["linear", "log"])
+def test_text_in_axes_coordinates(figure, yscale):
+    fig, ax = figure
+    ax.plot([1, 10], [1, 1000])
+    ax.set_yscale(yscale)
+    ax.set_xlim(0, 10)
+    ax.set_ylim(1, 1000)
+    center = (5, 1000 ** 0.5 if yscale == "log" else 500.5)
+    ax.text(*center, "data")
+    ax.text(0.5, 0.5, "axes", transform=ax.transAxes)
+    ax.annotate("fraction", xy=(0.5, 0.5), xycoords="axes fraction")
+    converted = texts(fig)
+    for name in ("axes", "fraction"):
+        # the texts only differ in height, which shifts their (centered) box a bit
+        np.testing.assert_allclose(
+            (converted[name].x, converted[name].y),
+            (converted["data"].x, converted["data"].y),
+            atol=1,
+        )
+
+
+def test_text_in_figure_coordinates(figure):
+    fig, ax = figure
+    ax.text(0.25, 0.75, "figure", transform=fig.transFigure)
+    # the same text at the same location, in data coordinates
+    fig.draw_without_rendering()
+    xy = fig.transFigure.transform((0.25, 0.75))
+    ax.text(*ax.transData.inverted().transform(xy), "data")
+    converted = texts(fig)
+    np.testing.assert_allclose(
+        (converted["figure"].x, converted["figure"].y + converted["figure"].cy),
+        (converted["data"].x, converted["data"].y + converted["data"].cy),
+        atol=1,
+    )
+
+
+def test_cached_text_follows_its_transform(figure):
+    fig, ax = figure
+    ax.plot([0, 1], [0, 1])
+    ax.text(0.5, 0.5, "axes", transform=ax.transAxes)
+    cache = ShapeCache()
+    texts(fig, cache=cache)
+    ax.set_position([0.5, 0.5, 0.4, 0.4])
+    cached, uncached = texts(fig, cache=cache)["axes"], texts(fig)["axes"]
+    assert (cached.x, cached.y) == (uncached.x, uncached.y)
@@ -0,0 +1,58 @@
+""" Tests of exporting figures from several threads at once """
+
+
+#############
+## Imports ##
+#############
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+###############
+## Functions ##
+###############
+
+
+def busy_figure(i):
+    """ a figure with lines, bars, markers, a mesh and texts, different for each i """
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    x = np.linspace(0, 10, 500)
+    ax.plot(x, np.sin(x + i), label="sin")
+    ax.bar([2, 4, 6], [0.5, -0.5, 0.8 - 0.1 * i])
+    ax.scatter([1, 2, 3], [0.1 * i, 0.2, 0.3], c=["red", "green", "blue"])
+    ax.pcolormesh([7, 8, 9], [-1, 0, 1], np.arange(4).reshape(2, 2) + i)
+    ax.text(5, 0.5, "figure %i" % i)
+    ax.set_title("title %i" % i)
+    ax.legend()
+    return fig
+
+
+###########
+## Tests ##
+###########
+
+
+def test_same_figure_from_many_threads(slide_xml):
+    fig = busy_figure(0)
+    serial = slide_xml(fig)
+    cwd = os.getcwd()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        threaded = list(executor.map(lambda _: slide_xml(fig), range(16)))
+    assert os.getcwd() == cwd
+    assert all(xml == serial for xml in threaded)
+
+
+def test_different_figures_from_many_threads(slide_xml):
+    figures = [busy_figure(i) for i in range(8)]
+    serial = [slide_xml(fig) for fig in figures]
+    assert len(set(serial)) == len(figures)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        threaded = list(executor.map(slide_xml, figures * 2))
+    assert threaded == serial * 2